@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_import_time.py
+Vrp.py / opti_vrp.py 의 import 시간이 정해진 예산 안에 있는지 확인하는 시작시간 벤치마크
+
+- 매 측정마다 새 파이썬 프로세스에서 `import <모듈>` 시간을 잰다 (최소값 사용)
+- import 직후 무거운 의존성(ortools, sentence_transformers, sklearn, langchain 등)이
+  sys.modules에 올라와 있으면 실패로 처리한다
+- 예산 초과/지연 로딩 실패 시 종료코드 1
+
+사용법: python benchmarks/bench_import_time.py [--budget 초] [--repeat 횟수]
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 기본 시간 예산 (초) : pandas + numpy import 비용만 허용
+DEFAULT_IMPORT_BUDGET = 1.5
+
+# import 시점에 로딩되면 안 되는 모듈들
+HEAVY_MODULES = [
+    'sentence_transformers', 'torch', 'ortools', 'sklearn',
+    'langchain_core', 'langchain_chroma', 'langchain_ollama',
+    'matplotlib', 'seaborn',
+]
+
+# (모듈명, 모듈이 있는 폴더 glob)
+TARGETS = [
+    ('Vrp', '*/Vrp.py'),
+    ('opti_vrp', '*/opti_vrp.py'),
+]
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+print(json.dumps({{'elapsed': elapsed, 'heavy': heavy}}))
+"""
+
+
+def measure_import(module, module_dir, repeat):
+    """새 프로세스에서 repeat번 import 하고 (최소 시간, 로딩된 무거운 모듈 목록) 반환"""
+    best = float('inf')
+    heavy = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=module_dir, capture_output=True, text=True, check=True
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        best = min(best, result['elapsed'])
+        heavy = result['heavy']
+    return best, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--budget', type=float, default=DEFAULT_IMPORT_BUDGET)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    failed = False
+    for module, pattern in TARGETS:
+        paths = glob.glob(os.path.join(ROOT, pattern))
+        if not paths:
+            print(f"⚠️ {pattern} 파일을 찾을 수 없음")
+            failed = True
+            continue
+
+        elapsed, heavy = measure_import(module, os.path.dirname(paths[0]), args.repeat)
+        ok = elapsed <= args.budget and not heavy
+        failed |= not ok
+
+        print(f"{'✅' if ok else '❌'} import {module}: {elapsed*1000:.0f}ms (예산 {args.budget*1000:.0f}ms)")
+        if heavy:
+            print(f"   import 시점에 로딩된 무거운 모듈: {', '.join(heavy)}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_order_ingest.py
+주문 데이터 적재(process_orders_data / fre.load_data 의 order_requirements) 벤치마크
+
+- --lines 줄짜리 합성 주문 테이블로 common.order_ingest 의 컬럼 단위 적재 시간을 잰다
+- 기존 groupby + iterrows 방식은 --legacy-lines 줄에서만 돌려 결과가 같은지 확인하고,
+  줄당 시간으로 --lines 크기 시간을 추정한다
+- 같은 데이터로 fre.optimize_parallel_production 스케줄러 시간도 함께 출력
+
+사용법: python benchmarks/bench_order_ingest.py [--lines 1000000] [--legacy-lines 20000]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from common.changeover_table import ChangeoverTable
+from common.cooking_times import COOKING_TIMES
+from common.order_ingest import build_order_requirements, build_orders_and_products
+
+
+def make_orders(n_lines, seed=0):
+    """주문당 1~6개 상품, 상품은 조리시간 레지스트리의 반찬명에서 무작위 선택"""
+    rng = np.random.default_rng(seed)
+    dish_names = np.array(list(COOKING_TIMES), dtype=object)
+    sizes = rng.integers(1, 7, size=n_lines // 3 + 1)
+    order_ids = np.repeat(np.arange(len(sizes)), sizes)[:n_lines]
+    rng.shuffle(order_ids)  # 주문 행이 섞여 들어오는 경우
+    dishes = dish_names[rng.integers(0, len(dish_names), size=n_lines)]
+    return pd.DataFrame({
+        '주문번호': order_ids + 100000,
+        '상품명': dishes,
+        '상품코드': ['C' + d[:4] for d in dishes],
+        '수량': rng.integers(1, 5, size=n_lines),
+        '주문일자': '2025-04-01',
+    })
+
+
+# 기존 방식 (비교용)
+# =====================================================================
+def legacy_process_orders_data(orders_df):
+    orders = {}
+    products_info = {}
+    for order_id, group in orders_df.groupby('주문번호'):
+        order_products = []
+        quantities = {}
+        product_codes = {}
+        for _, row in group.iterrows():
+            product_code = row['상품코드']
+            product_name = row['상품명']
+            quantity = row['수량']
+            order_products.append(product_name)
+            product_codes[product_name] = product_code
+            quantities[product_name] = quantity
+            if product_name not in products_info:
+                products_info[product_name] = {'code': None, 'order_ids': [], 'total_quantity': 0}
+            products_info[product_name]['code'] = product_code
+            products_info[product_name]['order_ids'].append(str(order_id))
+            products_info[product_name]['total_quantity'] += quantity
+        orders[str(order_id)] = {
+            'products': order_products,
+            'quantities': quantities,
+            'order_date': group.iloc[0]['주문일자'],
+            'product_codes': product_codes
+        }
+    return orders, products_info
+
+def legacy_order_requirements(orders_df):
+    order_requirements = defaultdict(list)
+    for _, row in orders_df.iterrows():
+        order_requirements[row['주문번호']].append(row['상품명'])
+    return order_requirements
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--lines', type=int, default=1_000_000)
+    parser.add_argument('--legacy-lines', type=int, default=20_000)
+    args = parser.parse_args()
+
+    # 1. 기존 방식과 결과 비교 (작은 데이터)
+    small = make_orders(args.legacy_lines, seed=1)
+    (legacy_orders, legacy_info), legacy_network = timed(legacy_process_orders_data, small)
+    legacy_requirements, legacy_fre = timed(legacy_order_requirements, small)
+    (orders, info), _ = timed(build_orders_and_products, small)
+    requirements, _ = timed(build_order_requirements, small)
+
+    same = (orders == legacy_orders and info == legacy_info
+            and list(info) == list(legacy_info) and requirements == legacy_requirements)
+    print(f"{'✅' if same else '❌'} {args.legacy_lines:,}줄 결과 일치")
+
+    # 2. 컬럼 단위 적재 (큰 데이터)
+    df = make_orders(args.lines)
+    (orders, info), t_network = timed(build_orders_and_products, df)
+    requirements, t_fre = timed(build_order_requirements, df)
+    scale = args.lines / args.legacy_lines
+
+    print(f"\n주문 {len(orders):,}개 / 상품 {len(info)}개 / {args.lines:,}줄")
+    print(f"process_orders_data : {t_network:6.2f}s  (iterrows 추정 {legacy_network * scale:7.1f}s)")
+    print(f"order_requirements  : {t_fre:6.2f}s  (iterrows 추정 {legacy_fre * scale:7.1f}s)")
+
+    # 3. 같은 데이터로 fre 스케줄러 시간
+    fre_dir = os.path.dirname(glob.glob(os.path.join(ROOT, '*', 'fre.py'))[0])
+    sys.path.insert(0, fre_dir)
+    import fre
+    product_quantities = df.groupby('상품명')['수량'].sum().to_dict()
+    frequency = defaultdict(int, df.drop_duplicates(['주문번호', '상품명'])['상품명'].value_counts().to_dict())
+    no_changeover = ChangeoverTable([], np.zeros((0, 0)))  # 전환시간 0 (적재 vs 스케줄러 비교용)
+    _, t_schedule = timed(fre.optimize_parallel_production, product_quantities, COOKING_TIMES,
+                          no_changeover, requirements, frequency)
+    print(f"fre 스케줄러        : {t_schedule:6.2f}s")
+
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
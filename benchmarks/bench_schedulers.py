@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_schedulers.py
+네 스케줄링 알고리즘을 같은 입력으로 돌려 makespan / 30분 단위 주문 완료 곡선 / 실행시간을 비교하는 벤치마크
+
+- vrp     : 지백 Vrp.solve_dish_production_vrp
+- asso    : 민서 asso.assign_parallel_by_workload + calc_line_times_with_changeover
+- network : 지안 preprocess_all_data + optimize_production_schedule
+- fre     : 향은 fre.optimize_parallel_production
+
+같은 입력 : 주문 테이블 하나 (--orders 파일 또는 합성 주문), 전환시간 매트릭스 하나
+(--changeover 파일 또는 base + U(0, 1) * additional 합성 매트릭스), 같은 조리시간 레지스트리, 같은 라인 수.
+알고리즘마다 결과 {라인: [상품, ...]} 를 공용 시뮬레이터(common.schedule_sim)로 다시 계산해서
+makespan 과 주문 완료 곡선을 같은 규칙으로 비교한다 (알고리즘이 직접 보고한 값도 함께 기록).
+
+- 실행시간 : --repeat 번 중 최소 wall time
+- 최대 메모리 : tracemalloc 을 켠 별도 실행의 peak (파이썬/NumPy 할당만, OR-Tools 내부 메모리는 제외)
+- 알고리즘 하나가 실패해도 (의존성 없음 등) 오류를 기록하고 나머지는 계속 실행
+
+사용법: python benchmarks/bench_schedulers.py [--orders 주문.xlsx | --synthetic-orders 800 --scale 10 --seed 0]
+        [--changeover changeover_matrix.csv] [--num-lines 8] [--algorithms vrp,asso,network,fre]
+        [--json report.json] [--csv report.csv]
+"""
+
+import argparse
+import contextlib
+import glob
+import importlib.util
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from common.changeover_store import load_changeover_matrix
+from common.cooking_times import COOKING_TIMES
+from common.order_completion import OrderIncidence
+from common.order_ingest import build_order_requirements
+from common.order_loader import load_orders as load_order_file
+from common.order_synth import generate_orders
+from common.schedule_sim import simulate_schedule
+
+# 주문 완료 곡선 간격 (분)
+DEFAULT_INTERVAL = 30
+
+# (알고리즘 이름, 모듈명, 파일 glob)
+MODULES = {
+    'vrp': ('Vrp', '*/Vrp.py'),
+    'asso': ('asso', '*/asso.py'),
+    'network': ('network', "*/0827_HT'network(2).py"),
+    'fre': ('fre', '*/fre.py'),
+}
+
+
+# 1. 입력 준비
+# =====================================================================
+def load_orders(args):
+    """--orders 파일 (xlsx / csv / parquet) 또는 합성 주문 (common.order_synth)"""
+    if args.orders is None:
+        return generate_orders(int(args.synthetic_orders * args.scale), seed=args.seed)
+    return load_order_file(args.orders)
+
+def synthetic_changeover(dish_names, base_time, additional_time, seed):
+    """전환시간 = base_time + U(0, 1) * additional_time (같은 반찬끼리는 0, 시드 고정)"""
+    rng = np.random.default_rng(seed)
+    values = base_time + rng.random((len(dish_names), len(dish_names))) * additional_time
+    np.fill_diagonal(values, 0)
+    return pd.DataFrame(values, index=dish_names, columns=dish_names)
+
+def load_changeover(args, dish_names):
+    """--changeover 파일 (csv / npy) 또는 합성 매트릭스 : 주문된 반찬 전체를 덮도록 재색인"""
+    if args.changeover is None:
+        return synthetic_changeover(dish_names, args.base_time, args.additional_time, args.seed)
+    changeover = load_changeover_matrix(args.changeover, mmap=False)
+    missing = [d for d in dish_names if d not in changeover.index]
+    if missing:
+        print(f"⚠️ 전환시간 매트릭스에 없는 반찬 {len(missing)}개는 기본 {args.base_time}분")
+    return changeover.reindex(index=dish_names, columns=dish_names, fill_value=args.base_time)
+
+def load_module(name):
+    """알고리즘 폴더를 sys.path 에 넣고 파일에서 모듈 로딩 (폴더/파일명이 패키지 이름으로 쓸 수 없어서)"""
+    module_name, pattern = MODULES[name]
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    paths = glob.glob(os.path.join(ROOT, pattern))
+    if not paths:
+        raise FileNotFoundError(f"{pattern} 파일을 찾을 수 없음")
+    module_dir = os.path.dirname(paths[0])
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+    spec = importlib.util.spec_from_file_location(module_name, paths[0])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
+
+
+# 2. 알고리즘 실행 : 각 함수는 ({라인: [상품, ...]}, 알고리즘이 보고한 makespan) 반환
+# =====================================================================
+def run_vrp(data, args):
+    Vrp = load_module('vrp')
+    manager, routing, solution = Vrp.solve_dish_production_vrp(
+        None, data['changeover'], data['orders_df'], num_lines=args.num_lines,
+        max_time=args.vrp_max_time, time_limit=args.vrp_time_limit
+    )
+    if not solution:
+        raise RuntimeError("VRP 해를 찾을 수 없음")
+    line_dishes, _, line_ends = Vrp.simulate_routes(
+        manager, routing, solution, data['dishes'], data['cooking_times'],
+        args.num_lines, Vrp.DEFAULT_TIME_RESOLUTION
+    )
+    reported = max((float(ends[-1]) for ends in line_ends if len(ends)), default=0.0)
+    return {f'line{k + 1}': dishes for k, dishes in enumerate(line_dishes)}, reported
+
+def run_asso(data, args):
+    asso = load_module('asso')
+    line_schedules, _, _ = asso.assign_parallel_by_workload(data['orders_df'], args.num_lines)
+    _, reported = asso.calc_line_times_with_changeover(line_schedules, data['dish_quantity'], data['changeover'])
+    return {f'line{k + 1}': dishes for k, dishes in line_schedules.items()}, reported
+
+def run_network(data, args):
+    network = load_module('network')
+    preprocessed_data = network.preprocess_all_data(data['orders_df'], changeover_matrix=data['changeover'])
+    result = network.optimize_production_schedule(preprocessed_data, args.num_lines)
+    line_schedules = result['analysis']['line_schedules']
+    reported = max((info['completion_time'] for schedule in line_schedules.values() for info in schedule.values()),
+                   default=0.0)
+    return result['optimized_solution'], reported
+
+def run_fre(data, args):
+    fre = load_module('fre')
+    lines, _, reported = fre.optimize_parallel_production(
+        data['dish_quantity'], COOKING_TIMES, data['changeover'], data['order_requirements'],
+        data['order_frequency'], num_lines=args.num_lines
+    )
+    return {f'line{k + 1}': [item[0] for item in line] for k, line in enumerate(lines)}, reported
+
+RUNNERS = {'vrp': run_vrp, 'asso': run_asso, 'network': run_network, 'fre': run_fre}
+
+
+# 3. 공용 평가 : 같은 시뮬레이터 / 조리시간 / 전환시간으로 makespan 과 주문 완료 곡선
+# =====================================================================
+def evaluate_schedule(schedule, data, interval=DEFAULT_INTERVAL):
+    """
+    makespan, 주문 완료시간 통계, interval 분 단위 누적 완료 주문 수
+
+    배치되지 않은 반찬이 든 주문은 완료되지 않은 것으로 센다 (VRP 가 시간 제약으로 반찬을 뺀 경우 등)
+    """
+    line_times = simulate_schedule(schedule, data['cooking_times'], data['changeover'])
+    product_times = {}
+    makespan = 0.0
+    for line_id, dishes in schedule.items():
+        _, ends = line_times[line_id]
+        product_times.update(zip(dishes, ends.tolist()))
+        if len(ends):
+            makespan = max(makespan, float(ends[-1]))
+
+    incidence = data['incidence']
+    completion = incidence.completion_times(incidence.product_time_vector(product_times, default=np.inf))
+    finished = np.sort(completion[np.isfinite(completion)])
+
+    time_points = np.arange(interval, max(makespan, interval) + interval, interval)
+    cumulative = np.searchsorted(finished, time_points, side='right')
+    return {
+        'makespan': makespan,
+        'unscheduled_dishes': len(set(data['dishes']) - set(product_times)),
+        'completed_orders': int(len(finished)),
+        'mean_order_completion': float(finished.mean()) if len(finished) else None,
+        'completion_curve': [{'minute': int(t), 'cumulative_orders': int(c)}
+                             for t, c in zip(time_points, cumulative)],
+    }
+
+
+# 4. 측정
+# =====================================================================
+def run_quietly(func, verbose, *args):
+    if verbose:
+        return func(*args)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+def measure(name, data, args):
+    """알고리즘 하나 : 최소 wall time, tracemalloc peak, 공용 평가 결과 (실패하면 status='error')"""
+    record = {'algorithm': name, 'status': 'ok'}
+    try:
+        schedule, reported = None, None
+        wall_times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            schedule, reported = run_quietly(RUNNERS[name], args.verbose, data, args)
+            wall_times.append(time.perf_counter() - start)
+        record['wall_time_s'] = min(wall_times)
+
+        record['peak_memory_mb'] = None
+        if not args.no_memory:
+            tracemalloc.start()
+            try:
+                run_quietly(RUNNERS[name], args.verbose, data, args)
+                record['peak_memory_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+            finally:
+                tracemalloc.stop()
+
+        record['reported_makespan'] = float(reported)
+        record.update(evaluate_schedule(schedule, data, args.interval))
+        record['schedule'] = schedule
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = f'{type(e).__name__}: {e}'
+    return record
+
+
+# 5. 리포트
+# =====================================================================
+def report_frame(records):
+    """알고리즘별 한 줄 요약 + 구간별 누적 완료 주문 수 열 (곡선이 먼저 끝난 알고리즘은 마지막 값 유지)"""
+    minutes = sorted({point['minute'] for r in records for point in r.get('completion_curve', [])})
+    rows = []
+    for r in records:
+        row = {key: r.get(key) for key in ('algorithm', 'status', 'error', 'wall_time_s', 'peak_memory_mb',
+                                           'makespan', 'reported_makespan', 'completed_orders',
+                                           'mean_order_completion', 'unscheduled_dishes')}
+        curve = {point['minute']: point['cumulative_orders'] for point in r.get('completion_curve', [])}
+        last = 0
+        for minute in minutes:
+            last = curve.get(minute, last)
+            row[f'orders_by_{minute}min'] = last if r['status'] == 'ok' else None
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+def print_summary(frame, n_orders):
+    print(f"\n=== 스케줄러 비교 (주문 {n_orders:,}개) ===")
+    for _, row in frame.iterrows():
+        if row['status'] != 'ok':
+            print(f"❌ {row['algorithm']:8s} {row['error']}")
+            continue
+        memory = '-' if pd.isna(row['peak_memory_mb']) else f"{row['peak_memory_mb']:.1f}MB"
+        print(f"✅ {row['algorithm']:8s} makespan {row['makespan']:7.1f}분 (자체 {row['reported_makespan']:7.1f}분) / "
+              f"완료 주문 {int(row['completed_orders']):,}개 / 평균 완료 {row['mean_order_completion']:6.1f}분 / "
+              f"{row['wall_time_s']:6.2f}s / {memory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--orders', help='주문 파일 (.xlsx / .csv / .parquet), 없으면 합성 주문')
+    parser.add_argument('--synthetic-orders', type=int, default=800, help='합성 주문 수 (현재 하루 물량 기준)')
+    parser.add_argument('--scale', type=float, default=1, help='합성 주문 수 배수 (1 ~ 100)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--changeover', help='전환시간 매트릭스 (.csv / .npy), 없으면 합성 매트릭스')
+    parser.add_argument('--base-time', type=float, default=2, help='합성 전환시간 기본 (분)')
+    parser.add_argument('--additional-time', type=float, default=2, help='합성 전환시간 최대 추가 (분)')
+    parser.add_argument('--num-lines', type=int, default=8)
+    parser.add_argument('--algorithms', default=','.join(RUNNERS))
+    parser.add_argument('--vrp-time-limit', type=float, default=60, help='VRP 탐색 시간 (초)')
+    parser.add_argument('--vrp-max-time', type=int, default=240, help='VRP 라인별 최대 시간 (분)')
+    parser.add_argument('--interval', type=int, default=DEFAULT_INTERVAL, help='주문 완료 곡선 간격 (분)')
+    parser.add_argument('--repeat', type=int, default=1, help='실행시간 측정 반복 수 (최솟값 사용)')
+    parser.add_argument('--no-memory', action='store_true', help='tracemalloc 측정 실행 생략')
+    parser.add_argument('--verbose', action='store_true', help='알고리즘 출력 그대로 표시')
+    parser.add_argument('--json', help='JSON 리포트 경로')
+    parser.add_argument('--csv', help='CSV 리포트 경로')
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.algorithms.split(',') if name.strip()]
+    unknown = [name for name in names if name not in RUNNERS]
+    if unknown:
+        parser.error(f"알 수 없는 알고리즘: {', '.join(unknown)}")
+
+    # 1. 모든 알고리즘이 공유하는 입력
+    orders_df = load_orders(args)
+    dish_quantity = orders_df.groupby('상품명')['수량'].sum().to_dict()
+    dishes = list(dish_quantity)
+    unique_pairs = orders_df.drop_duplicates(['주문번호', '상품명'])
+    data = {
+        'orders_df': orders_df,
+        'dishes': dishes,
+        'dish_quantity': dish_quantity,
+        'cooking_times': COOKING_TIMES.cooking_time_map(dish_quantity, warn=False),
+        'changeover': load_changeover(args, dishes),
+        'order_requirements': build_order_requirements(orders_df),
+        'order_frequency': defaultdict(int, unique_pairs['상품명'].value_counts().to_dict()),
+        'incidence': OrderIncidence.from_frame(orders_df),
+    }
+    print(f"주문 {len(data['incidence']):,}개 / 반찬 {len(dishes)}개 / {len(orders_df):,}줄 / 라인 {args.num_lines}개")
+
+    # 2. 알고리즘별 측정
+    records = []
+    for name in names:
+        print(f"⏳ {name} 실행 중...")
+        records.append(measure(name, data, args))
+
+    # 3. 리포트
+    frame = report_frame(records)
+    print_summary(frame, len(data['incidence']))
+
+    if args.json:
+        report = {
+            'inputs': {
+                'orders': args.orders or f'synthetic(orders={int(args.synthetic_orders * args.scale)}, seed={args.seed})',
+                'changeover': args.changeover or f'synthetic(base={args.base_time}, additional={args.additional_time}, seed={args.seed})',
+                'num_orders': len(data['incidence']),
+                'num_dishes': len(dishes),
+                'num_lines': args.num_lines,
+                'vrp_time_limit': args.vrp_time_limit,
+                'vrp_max_time': args.vrp_max_time,
+                'interval': args.interval,
+                'repeat': args.repeat,
+            },
+            'environment': {'python': platform.python_version(), 'platform': platform.platform(),
+                            'numpy': np.__version__, 'pandas': pd.__version__},
+            'results': records,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📁 JSON 리포트: {args.json}")
+    if args.csv:
+        frame.to_csv(args.csv, index=False, encoding='utf-8-sig')
+        print(f"📁 CSV 리포트: {args.csv}")
+
+    sys.exit(0 if all(r['status'] == 'ok' for r in records) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+네 가지 생산 최적화 알고리즘(지백/민서/지안/향은)이 함께 사용하는 공통 모듈
+
+각 알고리즘 폴더의 스크립트는 저장소 루트를 sys.path에 추가한 뒤
+`from common.<모듈> import ...` 형태로 가져다 쓴다.
+"""
@@ -0,0 +1,106 @@
+# 전환시간 매트릭스 바이너리 저장/로딩 (float32 .npy + 반찬명 sidecar .json)
+"""
+changeover_matrix.csv 를 매번 텍스트로 파싱하지 않도록
+
+- <이름>.npy        : float32 정방행렬 (np.load(mmap_mode='r')로 메모리 매핑)
+- <이름>.names.json : {"index": [...], "columns": [...], "source": {원본 CSV mtime / 크기}} 반찬명 목록
+
+두 파일로 저장하고 읽는다. 메모리 매핑이므로 여러 워커 프로세스가 같은 파일을
+열어도 페이지 캐시를 공유한다.
+
+사용법 (CSV -> 바이너리 변환): python -m common.changeover_store changeover_matrix.csv
+"""
+import json
+import os
+import sys
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# 1. 경로 관련 함수
+# =====================================================================
+# 1-1. 확장자를 뗀 기준 경로 : 'a/changeover_matrix.csv' -> 'a/changeover_matrix'
+def _base_path(path: str) -> str:
+    base, ext = os.path.splitext(path)
+    return base if ext in ('.csv', '.npy') else path
+
+# 1-2. (.npy 경로, .names.json 경로)
+def binary_paths(path: str) -> Tuple[str, str]:
+    base = _base_path(path)
+    return base + '.npy', base + '.names.json'
+
+# 1-3. 원본 CSV 키 : mtime(ns) + 크기 (바이너리가 이 CSV에서 만들어졌는지 확인용)
+def _source_key(path: str) -> dict:
+    stat = os.stat(path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+# 1-4. .csv 옆의 바이너리가 지금의 CSV와 같은지 (원본 키가 없는 예전 바이너리는 mtime 비교)
+def _binary_ready(path: str) -> bool:
+    npy_path, names_path = binary_paths(path)
+    if not (os.path.exists(npy_path) and os.path.exists(names_path)):
+        return False
+    if not os.path.exists(path):
+        return True
+    with open(names_path, encoding='utf-8') as f:
+        source = json.load(f).get('source')
+    if source is None:
+        return os.path.getmtime(npy_path) >= os.path.getmtime(path)
+    return source == _source_key(path)
+
+
+# 2. 저장 / 변환
+# =====================================================================
+# 2-1. DataFrame -> 바이너리 저장 (source_path : 변환한 원본 CSV, 주면 mtime / 크기를 함께 기록)
+def save_changeover_matrix(changeover_df: pd.DataFrame, path: str, source_path: Optional[str] = None) -> str:
+    npy_path, names_path = binary_paths(path)
+    os.makedirs(os.path.dirname(os.path.abspath(npy_path)), exist_ok=True)
+
+    np.save(npy_path, np.ascontiguousarray(changeover_df.to_numpy(dtype=np.float32)))
+    names = {'index': [str(x) for x in changeover_df.index],
+             'columns': [str(x) for x in changeover_df.columns]}
+    if source_path is not None:
+        names['source'] = _source_key(source_path)
+    with open(names_path, 'w', encoding='utf-8') as f:
+        json.dump(names, f, ensure_ascii=False)
+    return npy_path
+
+# 2-2. 기존 CSV -> 바이너리 변환
+def convert_csv_to_binary(csv_path: str, out_path: Optional[str] = None) -> str:
+    changeover_df = pd.read_csv(csv_path, index_col=0)
+    return save_changeover_matrix(changeover_df, out_path or csv_path, source_path=csv_path)
+
+
+# 3. 로딩
+# =====================================================================
+# 3-1. 바이너리 로딩 : 값은 메모리 매핑된 읽기 전용 배열
+def load_changeover_binary(path: str, mmap: bool = True) -> pd.DataFrame:
+    npy_path, names_path = binary_paths(path)
+    values = np.load(npy_path, mmap_mode='r' if mmap else None)
+    with open(names_path, encoding='utf-8') as f:
+        names = json.load(f)
+    return pd.DataFrame(values, index=names['index'], columns=names['columns'], copy=False)
+
+# 3-2. 확장자에 따라 로딩 : .csv 옆에 같은 CSV에서 만든 바이너리가 있으면 바이너리를, 없으면 CSV를 읽음
+# convert=True 면 CSV를 읽은 뒤 바이너리로 변환해 두고 그 바이너리를 돌려줌 (첫 실행과 이후 실행이 같은 float32 값)
+# 기본은 소스 폴더에 파일을 만들지 않음 : 변환은 python -m common.changeover_store 로
+def load_changeover_matrix(path: str, mmap: bool = True, convert: bool = False) -> pd.DataFrame:
+    if path.endswith('.npy'):
+        return load_changeover_binary(path, mmap)
+    if _binary_ready(path):
+        return load_changeover_binary(path, mmap)
+
+    changeover_df = pd.read_csv(path, index_col=0)
+    if convert:
+        try:
+            save_changeover_matrix(changeover_df, path, source_path=path)
+            return load_changeover_binary(path, mmap)
+        except OSError as e:
+            print(f"⚠️ 전환시간 바이너리 저장 실패 ({e}), CSV 사용")
+    return changeover_df
+
+
+if __name__ == "__main__":
+    for csv_file in sys.argv[1:]:
+        print(f"{csv_file} -> {convert_csv_to_binary(csv_file)}")
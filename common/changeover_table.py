@@ -0,0 +1,104 @@
+# 정수 id 기반 전환시간 테이블 (DataFrame .loc 조회 대체)
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class ChangeoverTable:
+    """
+    반찬명 -> 정수 id 매핑과 연속(C-order) float64 전환시간 배열을 묶은 테이블
+
+    values[i, j] 는 id i 반찬 다음에 id j 반찬을 만들 때의 전환시간(분)이다.
+    스케줄러 내부 루프에서는 반찬명을 한 번 ids()로 바꾼 뒤 row()/path()/cost()
+    로 배열 연산을 쓰고, 이름 기반 호출이 필요한 곳은 get()을 쓴다.
+    """
+
+    def __init__(self, names: Sequence[str], values: np.ndarray, default: float = 0.0):
+        self.names: List[str] = list(names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.default = float(default)
+
+        if self.values.shape != (len(self.names), len(self.names)):
+            raise ValueError(f"전환시간 배열 크기 {self.values.shape}가 반찬 수 {len(self.names)}와 맞지 않음")
+
+    # 1. 생성
+    # =====================================================================
+    @classmethod
+    def from_frame(cls, changeover_df: pd.DataFrame,
+                   extra_names: Optional[Iterable[str]] = None,
+                   default: float = 0.0) -> 'ChangeoverTable':
+        """
+        전환시간 DataFrame(index=이전 반찬, columns=다음 반찬)으로 테이블 생성
+
+        extra_names 중 매트릭스에 없는 반찬은 id를 새로 부여하고, 해당 행/열을
+        default 값으로 채운다 (기존 코드의 '없으면 기본 전환시간' 처리와 동일).
+        """
+        names = [str(x) for x in changeover_df.index]
+        known = set(names)
+        if extra_names is not None:
+            for name in extra_names:
+                if name not in known:
+                    known.add(name)
+                    names.append(name)
+
+        values = (changeover_df
+                  .reindex(index=names, columns=names, fill_value=default)
+                  .to_numpy(dtype=np.float64))
+        return cls(names, values, default)
+
+    @classmethod
+    def from_matrix(cls, changeover_matrix, default: float = 0.0) -> 'ChangeoverTable':
+        """ChangeoverTable이면 그대로, DataFrame이면 변환해서 반환"""
+        if isinstance(changeover_matrix, cls):
+            return changeover_matrix
+        return cls.from_frame(changeover_matrix, default=default)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    # 2. 반찬명 <-> id
+    # =====================================================================
+    def id(self, name: str) -> int:
+        return self.index[name]
+
+    def ids(self, names: Iterable[str]) -> np.ndarray:
+        """반찬명 목록 -> int id 배열 (없는 반찬이면 KeyError)"""
+        return np.fromiter((self.index[name] for name in names), dtype=np.intp)
+
+    def names_of(self, ids: Iterable[int]) -> List[str]:
+        return [self.names[i] for i in ids]
+
+    # 3. 전환시간 조회
+    # =====================================================================
+    def get(self, from_name: str, to_name: str, default: Optional[float] = None) -> float:
+        """이름 기반 스칼라 조회 (매트릭스에 없는 반찬이면 default)"""
+        i = self.index.get(from_name)
+        j = self.index.get(to_name)
+        if i is None or j is None:
+            return self.default if default is None else default
+        return float(self.values[i, j])
+
+    def row(self, from_id: int) -> np.ndarray:
+        """from_id 반찬 다음에 올 모든 반찬으로의 전환시간 (읽기 전용 뷰)"""
+        row = self.values[from_id]
+        row.flags.writeable = False
+        return row
+
+    def path(self, seq_ids) -> np.ndarray:
+        """생산순서 seq_ids 의 연속된 전환시간 배열 (길이 len(seq_ids) - 1)"""
+        seq_ids = np.asarray(seq_ids, dtype=np.intp)
+        return self.values[seq_ids[:-1], seq_ids[1:]]
+
+    def cost(self, seq_ids) -> float:
+        """생산순서 seq_ids 의 총 전환시간"""
+        if len(seq_ids) < 2:
+            return 0.0
+        return float(self.path(seq_ids).sum())
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.values, index=self.names, columns=self.names)
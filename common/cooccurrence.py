@@ -0,0 +1,317 @@
+# 상품 동시주문(co-occurrence) 통계 : 주문 x 상품 희소 행렬 기반
+"""
+주문 테이블 -> 주문 x 상품 incidence 행렬 X (scipy.sparse CSR, 값 = 주문 내 등장 횟수)
+동시주문 행렬 = X.T @ X (대각성분 0)
+
+basket 마다 상품 쌍을 이중 루프로 세지 않으므로, 한 달치 주문처럼 행이 많아도
+메모리는 0이 아닌 원소 수에 비례한다.
+
+CooccurrenceIndex 는 같은 통계를 주문 단위로 더하고 빼면서 유지하는 증분 인덱스로,
+디스크에 저장해두고 새로 들어온 주문만 반영할 때 쓴다.
+"""
+import json
+import os
+import sys
+import tempfile
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from common.order_loader import load_orders
+
+
+# 1. incidence 행렬
+# =====================================================================
+# 1-1. 주문 테이블 -> (X, 주문번호 목록, 상품 목록)
+def build_incidence_matrix(df: pd.DataFrame,
+                           dish_list: Optional[Sequence[str]] = None,
+                           order_column: str = '주문번호',
+                           dish_column: str = '상품명') -> Tuple[sp.csr_matrix, np.ndarray, List[str]]:
+    """
+    주문 x 상품 incidence 행렬 생성
+
+    dish_list 를 주면 그 순서대로 열을 만들고, 목록에 없는 상품 행은 무시한다.
+    없으면 상품명 정렬 순서를 쓴다. 같은 주문에 같은 상품이 여러 번 있으면 횟수만큼 더해진다.
+    주문번호나 상품명이 비어 있는 행은 무시한다 (groupby 와 동일).
+    """
+    order_codes, order_ids = pd.factorize(df[order_column])
+    if dish_list is None:
+        dish_list = sorted(df[dish_column].dropna().unique())
+    dish_list = list(dish_list)
+    dish_codes = pd.Categorical(df[dish_column], categories=dish_list).codes
+
+    known = (dish_codes >= 0) & (order_codes >= 0)
+    X = sp.csr_matrix(
+        (np.ones(known.sum(), dtype=np.int64), (order_codes[known], dish_codes[known])),
+        shape=(len(order_ids), len(dish_list))
+    )
+    X.sum_duplicates()
+    return X, np.asarray(order_ids), dish_list
+
+# 1-2. basket 목록 -> incidence 행렬 (asso.make_baskets_from_orders 결과용)
+def baskets_to_incidence(baskets: Sequence[Sequence[str]], dish_list: Sequence[str]) -> sp.csr_matrix:
+    idx = {dish: i for i, dish in enumerate(dish_list)}
+    rows, cols = [], []
+    for r, basket in enumerate(baskets):
+        for dish in basket:
+            c = idx.get(dish)
+            if c is not None:
+                rows.append(r)
+                cols.append(c)
+    X = sp.csr_matrix(
+        (np.ones(len(rows), dtype=np.int64), (rows, cols)),
+        shape=(len(baskets), len(dish_list))
+    )
+    X.sum_duplicates()
+    return X
+
+
+# 2. 동시주문 행렬
+# =====================================================================
+# 2-1. X.T @ X, 대각성분 제거
+def cooccurrence_from_incidence(X: sp.spmatrix) -> sp.csr_matrix:
+    co = (X.T @ X).tocsr()
+    co.setdiag(0)
+    co.eliminate_zeros()
+    return co
+
+# 2-2. 주문 테이블 -> 동시주문 행렬
+def build_cooccurrence(df: pd.DataFrame,
+                       dish_list: Optional[Sequence[str]] = None,
+                       order_column: str = '주문번호',
+                       dish_column: str = '상품명') -> Tuple[sp.csr_matrix, List[str]]:
+    X, _, dish_list = build_incidence_matrix(df, dish_list, order_column, dish_column)
+    return cooccurrence_from_incidence(X), dish_list
+
+# 2-3. 희소 행렬 -> DataFrame (sparse=True 면 pandas sparse 컬럼으로 유지)
+def cooccurrence_to_frame(co: sp.spmatrix, dish_list: Sequence[str], sparse: bool = False) -> pd.DataFrame:
+    if sparse:
+        return pd.DataFrame.sparse.from_spmatrix(co, index=list(dish_list), columns=list(dish_list))
+    return pd.DataFrame(co.toarray(), index=list(dish_list), columns=list(dish_list))
+
+
+# 3. 증분 동시주문 인덱스
+# =====================================================================
+# 3-0. 주문번호별 상품 리스트 (groupby().agg(list) 대신 정렬 후 분할)
+def _group_baskets(order_ids: pd.Series, dishes: pd.Series) -> Dict[str, List[str]]:
+    codes, uniques = pd.factorize(order_ids)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1]
+    groups = np.split(dishes.to_numpy(dtype=object)[order], bounds)
+    return {order_id: group.tolist() for order_id, group in zip(uniques.tolist(), groups)}
+
+class CooccurrenceIndex:
+    """
+    주문이 들어오는 대로 갱신하는 상품 동시주문 인덱스
+
+    - pair_counts       : {(상품A, 상품B): 동시주문 횟수}  (A < B)
+    - order_frequency   : {상품: 포함된 주문 수}
+    - total_connection  : {상품: 연결 강도 합}
+    - max_connection(p) : 상품 p 의 최대 연결 강도
+
+    add_orders(df) / remove_orders(ids) 는 해당 주문의 상품 쌍만 더하고 빼므로,
+    아침 계획 실행 때는 마지막 스냅샷(save) 이후 들어온 주문만 추가하면 된다.
+    주문번호는 문자열로 저장한다 (같은 주문이 다시 들어오면 상품을 이어붙임).
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self):
+        self.orders: Dict[str, List[str]] = {}
+        self.pair_counts: Dict[Tuple[str, str], int] = {}
+        self.order_frequency: Dict[str, int] = {}
+        self.total_connection: Dict[str, int] = {}
+        self._neighbors: Dict[str, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    # 3-1. 주문 추가 / 삭제
+    # -----------------------------------------------------------------
+    @classmethod
+    def from_orders(cls, df: pd.DataFrame, **kwargs) -> 'CooccurrenceIndex':
+        index = cls()
+        index.add_orders(df, **kwargs)
+        return index
+
+    def add_orders(self, df_batch: pd.DataFrame,
+                   order_column: str = '주문번호',
+                   dish_column: str = '상품명') -> int:
+        """주문 배치 추가, 추가(또는 갱신)된 주문 수 반환 (주문번호나 상품명이 비어 있는 행은 무시)"""
+        df_batch = df_batch[df_batch[order_column].notna() & df_batch[dish_column].notna()]
+        order_ids = df_batch[order_column].astype(str)
+        baskets = _group_baskets(order_ids, df_batch[dish_column])
+
+        # 이미 있는 주문번호 : 기존 상품을 빼고 이어붙인 상품으로 다시 더함
+        existing = [order_id for order_id in baskets if order_id in self.orders]
+        for order_id in existing:
+            previous = self.orders[order_id]
+            self._apply(previous, -1)
+            self.orders[order_id] = previous + baskets[order_id]
+            self._apply(self.orders[order_id], +1)
+
+        # 새 주문 : 배치 전체를 incidence 행렬로 만들어 X.T @ X 로 한 번에 더함
+        new_rows = ~order_ids.isin(existing) if existing else np.ones(len(df_batch), dtype=bool)
+        new_batch = df_batch[np.asarray(new_rows)]
+        if len(new_batch):
+            self._apply_batch(new_batch, order_column, dish_column, +1)
+            self.orders.update((order_id, products) for order_id, products in baskets.items()
+                               if order_id not in self.orders)
+        return len(baskets)
+
+    def remove_orders(self, order_ids: Iterable) -> int:
+        """주문 삭제 (없는 주문번호는 무시), 삭제된 주문 수 반환"""
+        removed = 0
+        for order_id in order_ids:
+            products = self.orders.pop(str(order_id), None)
+            if products is not None:
+                self._apply(products, -1)
+                removed += 1
+        return removed
+
+    def _apply_batch(self, df: pd.DataFrame, order_column: str, dish_column: str, sign: int) -> None:
+        X, _, dish_list = build_incidence_matrix(df, None, order_column, dish_column)
+        frequency = np.asarray((X > 0).sum(axis=0)).ravel()
+        for dish, count in zip(dish_list, frequency.tolist()):
+            self._bump(self.order_frequency, dish, sign * count)
+
+        pairs = sp.triu(X.T @ X, k=1).tocoo()
+        for i, j, w in zip(pairs.row.tolist(), pairs.col.tolist(), pairs.data.tolist()):
+            a, b = dish_list[i], dish_list[j]
+            weight = sign * w
+            self._bump(self.pair_counts, (a, b), weight)
+            self._bump(self.total_connection, a, weight)
+            self._bump(self.total_connection, b, weight)
+            self._bump(self._neighbors.setdefault(a, {}), b, weight)
+            self._bump(self._neighbors.setdefault(b, {}), a, weight)
+
+    def _apply(self, products: List[str], sign: int) -> None:
+        counts = Counter(products)
+        dishes = sorted(counts)
+        for dish in dishes:
+            self._bump(self.order_frequency, dish, sign)
+
+        for i, a in enumerate(dishes):
+            for b in dishes[i + 1:]:
+                weight = sign * counts[a] * counts[b]
+                self._bump(self.pair_counts, (a, b), weight)
+                self._bump(self.total_connection, a, weight)
+                self._bump(self.total_connection, b, weight)
+                self._bump(self._neighbors.setdefault(a, {}), b, weight)
+                self._bump(self._neighbors.setdefault(b, {}), a, weight)
+
+    @staticmethod
+    def _bump(counter: dict, key, delta: int) -> None:
+        value = counter.get(key, 0) + delta
+        if value:
+            counter[key] = value
+        else:
+            counter.pop(key, None)
+
+    # 3-2. 조회
+    # -----------------------------------------------------------------
+    @property
+    def products(self) -> List[str]:
+        return sorted(self.order_frequency)
+
+    def pair_count(self, a: str, b: str) -> int:
+        return self.pair_counts.get((a, b) if a < b else (b, a), 0)
+
+    def neighbors(self, product: str) -> Dict[str, int]:
+        """{이웃 상품: 동시주문 횟수}"""
+        return dict(self._neighbors.get(product, {}))
+
+    def max_connection(self, product: str) -> int:
+        return max(self._neighbors.get(product, {}).values(), default=0)
+
+    def max_connections(self) -> Dict[str, int]:
+        return {p: self.max_connection(p) for p in self.order_frequency}
+
+    def connection_stats(self, products: Optional[Iterable[str]] = None):
+        """
+        네트워크 모듈 build_product_connections 와 같은 형식의 통계
+
+        Returns:
+        --------
+        ({'상품A|상품B': weight}, {상품: 최대 연결}, {상품: 연결 합})
+        """
+        products = list(products) if products is not None else self.products
+        product_connections = {f"{a}|{b}": w for (a, b), w in self.pair_counts.items()}
+        product_max_connections = {p: self.max_connection(p) for p in products}
+        product_total_connections = {p: self.total_connection.get(p, 0) for p in products}
+        return product_connections, product_max_connections, product_total_connections
+
+    def to_sparse(self, dish_list: Optional[Sequence[str]] = None) -> Tuple[sp.csr_matrix, List[str]]:
+        """dish_list 순서의 대칭 동시주문 행렬 (대각성분 0)"""
+        dish_list = list(dish_list) if dish_list is not None else self.products
+        idx = {dish: i for i, dish in enumerate(dish_list)}
+        rows, cols, vals = [], [], []
+        for (a, b), w in self.pair_counts.items():
+            if a in idx and b in idx:
+                rows += [idx[a], idx[b]]
+                cols += [idx[b], idx[a]]
+                vals += [w, w]
+        co = sp.csr_matrix((np.array(vals, dtype=np.int64), (rows, cols)),
+                           shape=(len(dish_list), len(dish_list)))
+        return co, dish_list
+
+    def to_frame(self, dish_list: Optional[Sequence[str]] = None, sparse: bool = False) -> pd.DataFrame:
+        co, dish_list = self.to_sparse(dish_list)
+        return cooccurrence_to_frame(co, dish_list, sparse)
+
+    # 3-3. 저장 / 로딩 (JSON, 임시파일 저장 후 교체)
+    # -----------------------------------------------------------------
+    def save(self, path: str) -> None:
+        data = {
+            'version': self.FORMAT_VERSION,
+            'orders': self.orders,
+            'pairs': [[a, b, w] for (a, b), w in self.pair_counts.items()],
+            'order_frequency': self.order_frequency,
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> 'CooccurrenceIndex':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != cls.FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 동시주문 인덱스 버전: {data.get('version')}")
+
+        index = cls()
+        index.orders = data['orders']
+        index.order_frequency = data['order_frequency']
+        for a, b, w in data['pairs']:
+            index.pair_counts[(a, b)] = w
+            index._bump(index.total_connection, a, w)
+            index._bump(index.total_connection, b, w)
+            index._neighbors.setdefault(a, {})[b] = w
+            index._neighbors.setdefault(b, {})[a] = w
+        return index
+
+    @classmethod
+    def load_or_create(cls, path: str) -> 'CooccurrenceIndex':
+        return cls.load(path) if os.path.exists(path) else cls()
+
+
+if __name__ == "__main__":
+    # 사용법: python -m common.cooccurrence <인덱스.json> <새 주문파일.xlsx|.csv> ...
+    index_path, *order_files = sys.argv[1:]
+    index = CooccurrenceIndex.load_or_create(index_path)
+    for order_file in order_files:
+        batch = load_orders(order_file)
+        print(f"{order_file}: 주문 {index.add_orders(batch)}개 반영")
+    index.save(index_path)
+    print(f"{index_path}: 주문 {len(index)}개, 상품 {len(index.order_frequency)}개, 상품 쌍 {len(index.pair_counts)}개")
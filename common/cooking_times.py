@@ -0,0 +1,129 @@
+# 반찬별 기본 조리시간 레지스트리 (모듈 로딩 시 한 번만 생성, 읽기 전용)
+"""
+조리시간 = 기본 조리시간(반찬별) + 수량 * 개당 추가시간
+
+- 기본 데이터 : common/cooking_times.json ({"반찬명": 기본조리시간(분)})
+- 환경변수 DISH_COOKING_TIMES_PATH 로 다른 .json / .csv 파일 지정 가능
+- CSV 는 fre.py 의 cooking_times.csv 형식 (상품명, 조리시간(분) 컬럼)
+
+사용법:
+    from common.cooking_times import COOKING_TIMES
+    durations = COOKING_TIMES.cooking_times_for(dish_names, quantities)
+"""
+import json
+import os
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+
+# 설정 상수
+# =====================================================================
+DEFAULT_UNKNOWN_COOKING_TIME = 3   # 조리시간을 못찾을 시 기본값 (분)
+UNIT_TIME_PER_QUANTITY = 0.01      # 개당 추가 조리시간 (분)
+DEFAULT_COOKING_TIMES_PATH = os.environ.get(
+    'DISH_COOKING_TIMES_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cooking_times.json')
+)
+
+
+class CookingTimeRegistry(Mapping):
+    """
+    반찬명 -> 기본 조리시간(분) 읽기 전용 매핑
+
+    dict 처럼 registry[반찬명], registry.get(반찬명, 기본값) 으로 쓸 수 있고,
+    여러 반찬의 총 조리시간은 cooking_times_for()로 한 번에 계산한다.
+    """
+
+    __slots__ = ('_base_times', 'default_time', 'unit_time')
+
+    def __init__(self, base_times: Mapping,
+                 default_time: float = DEFAULT_UNKNOWN_COOKING_TIME,
+                 unit_time: float = UNIT_TIME_PER_QUANTITY):
+        object.__setattr__(self, '_base_times', MappingProxyType(dict(base_times)))
+        object.__setattr__(self, 'default_time', default_time)
+        object.__setattr__(self, 'unit_time', unit_time)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CookingTimeRegistry는 수정할 수 없음")
+
+    # 1. 생성
+    # =====================================================================
+    @classmethod
+    def from_json(cls, path: str, **kwargs) -> 'CookingTimeRegistry':
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f), **kwargs)
+
+    @classmethod
+    def from_csv(cls, path: str, name_column: str = '상품명',
+                 time_column: str = '조리시간(분)', **kwargs) -> 'CookingTimeRegistry':
+        df = pd.read_csv(path)
+        return cls(dict(zip(df[name_column], df[time_column])), **kwargs)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'CookingTimeRegistry':
+        """확장자(.json / .csv)에 따라 로딩"""
+        if path.endswith('.csv'):
+            return cls.from_csv(path, **kwargs)
+        return cls.from_json(path, **kwargs)
+
+    # 2. Mapping 인터페이스
+    # =====================================================================
+    def __getitem__(self, dish_name: str):
+        return self._base_times[dish_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._base_times)
+
+    def __len__(self) -> int:
+        return len(self._base_times)
+
+    def __repr__(self) -> str:
+        return f"<CookingTimeRegistry {len(self)}개 반찬>"
+
+    # 3. 조리시간 계산
+    # =====================================================================
+    def base_time(self, dish_name: str, warn: bool = True) -> float:
+        base_time = self._base_times.get(dish_name)
+        if base_time is None:
+            base_time = self.default_time
+            if warn:
+                print(f"⚠️ '{dish_name}' 조리시간을 찾을 수 없어 기본값 {base_time}분 사용")
+        return base_time
+
+    def cooking_time(self, dish_name: str, quantity: float = 1, warn: bool = True) -> float:
+        """반찬 하나의 총 조리시간 (기본시간 + 수량비례시간)"""
+        return self.base_time(dish_name, warn) + quantity * self.unit_time
+
+    def cooking_times_for(self, dish_names: Iterable[str], quantities=1,
+                          warn: bool = True) -> np.ndarray:
+        """
+        여러 반찬의 총 조리시간을 한 번에 계산
+
+        quantities 는 dish_names 와 같은 길이의 수량 배열 또는 스칼라.
+        조리시간을 못찾은 반찬은 default_time 으로 계산하고 (반찬당 한 번) 경고를 출력한다.
+        """
+        dish_names = list(dish_names)
+        base_times = np.array([self._base_times.get(d, np.nan) for d in dish_names], dtype=np.float64)
+
+        unknown = np.isnan(base_times)
+        if unknown.any():
+            base_times[unknown] = self.default_time
+            if warn:
+                for dish_name in dict.fromkeys(d for d, u in zip(dish_names, unknown) if u):
+                    print(f"⚠️ '{dish_name}' 조리시간을 찾을 수 없어 기본값 {self.default_time}분 사용")
+
+        return base_times + np.asarray(quantities, dtype=np.float64) * self.unit_time
+
+    def cooking_time_map(self, dish_quantity: Mapping, warn: bool = True) -> dict:
+        """{반찬명: 수량} -> {반찬명: 총 조리시간}"""
+        names = list(dish_quantity)
+        durations = self.cooking_times_for(names, [dish_quantity[d] for d in names], warn)
+        return dict(zip(names, durations.tolist()))
+
+
+# 모듈 레벨 기본 레지스트리
+COOKING_TIMES = CookingTimeRegistry.load(DEFAULT_COOKING_TIMES_PATH)
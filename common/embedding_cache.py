@@ -0,0 +1,137 @@
+# 반찬명 임베딩 디스크 캐시
+import os
+import hashlib
+import tempfile
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# 설정 상수
+# =====================================================================
+DEFAULT_MODEL_REVISION = 'main'
+DEFAULT_EMBEDDING_CACHE_DIR = os.environ.get(
+    'DISH_EMBEDDING_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'dish_embeddings')
+)
+
+
+# 1. 캐시 키 관련 함수
+# =====================================================================
+# 1-1. 반찬명 정규화 : NFC 정규화 + 앞뒤 공백 제거 + 연속 공백 하나로
+def normalize_dish_name(dish_name: str) -> str:
+    return ' '.join(unicodedata.normalize('NFC', str(dish_name)).split())
+
+# 1-2. 모델명/리비전별 캐시 파일 경로
+def get_cache_path(cache_dir: str, model_name: str,
+                   model_revision: Optional[str] = None) -> str:
+    revision = model_revision or DEFAULT_MODEL_REVISION
+    key = hashlib.sha1(f"{model_name}@{revision}".encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{key}.npz")
+
+
+# 2. 캐시 클래스
+# =====================================================================
+class EmbeddingCache:
+    """
+    (모델명, 모델 리비전, 정규화된 반찬명) -> 임베딩 벡터를 저장하는 .npz 캐시
+
+    모델 하나당 파일 하나를 쓰며, 파일 안에는 정규화된 반찬명 배열(names)과
+    같은 순서의 임베딩 행렬(embeddings)이 들어있다.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str,
+                 model_revision: Optional[str] = None):
+        self.path = get_cache_path(cache_dir, model_name, model_revision)
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._dirty = False
+
+        if os.path.exists(self.path):
+            with np.load(self.path, allow_pickle=False) as data:
+                for name, vector in zip(data['names'].tolist(), data['embeddings']):
+                    self._vectors[name] = vector
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def __contains__(self, dish_name: str) -> bool:
+        return normalize_dish_name(dish_name) in self._vectors
+
+    def missing(self, dish_names: List[str]) -> List[str]:
+        """캐시에 없는 반찬명 목록 (입력 순서 유지, 중복 제거)"""
+        seen = set()
+        result = []
+        for dish in dish_names:
+            key = normalize_dish_name(dish)
+            if key not in self._vectors and key not in seen:
+                seen.add(key)
+                result.append(dish)
+        return result
+
+    def add(self, dish_names: List[str], embeddings: np.ndarray) -> None:
+        for dish, vector in zip(dish_names, embeddings):
+            self._vectors[normalize_dish_name(dish)] = np.asarray(vector, dtype=np.float32)
+        self._dirty = True
+
+    def get(self, dish_names: List[str]) -> np.ndarray:
+        """dish_names 순서대로 임베딩 행렬 반환 (모두 캐시에 있어야 함)"""
+        return np.stack([self._vectors[normalize_dish_name(d)] for d in dish_names])
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        names = list(self._vectors.keys())
+        embeddings = np.stack([self._vectors[n] for n in names])
+
+        # 다른 프로세스가 읽는 도중 파일이 깨지지 않도록 임시파일 저장 후 교체
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.npz')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, names=np.array(names, dtype=np.str_), embeddings=embeddings)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._dirty = False
+
+
+# 3. 캐시를 거친 임베딩 함수
+# =====================================================================
+def encode_with_cache(dish_names: List[str],
+                      model_name: str,
+                      model_revision: Optional[str] = None,
+                      cache_dir: Optional[str] = DEFAULT_EMBEDDING_CACHE_DIR,
+                      show_progress_bar: bool = True) -> Tuple[np.ndarray, Optional[object]]:
+    """
+    처음 보는 반찬명만 인코딩하고 나머지는 캐시에서 읽어 임베딩 행렬 반환
+
+    캐시에 모든 반찬이 있으면 SentenceTransformer 모델을 생성하지 않으며,
+    이 경우 반환되는 model은 None이다. cache_dir=None이면 캐시를 사용하지 않는다.
+
+    Returns:
+    --------
+    (embeddings, model) : dish_names 순서의 임베딩 행렬, 생성된 모델(또는 None)
+    """
+    if cache_dir is None:
+        model = _load_model(model_name, model_revision)
+        return model.encode(dish_names, show_progress_bar=show_progress_bar), model
+
+    cache = EmbeddingCache(cache_dir, model_name, model_revision)
+    missing = cache.missing(dish_names)
+
+    model = None
+    if missing:
+        print(f"캐시에 없는 반찬 {len(missing)}개 임베딩 생성 (캐시 {len(cache)}개)")
+        model = _load_model(model_name, model_revision)
+        cache.add(missing, model.encode(missing, show_progress_bar=show_progress_bar))
+        cache.save()
+
+    return cache.get(dish_names), model
+
+def _load_model(model_name: str, model_revision: Optional[str]):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name, revision=model_revision)
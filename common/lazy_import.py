@@ -0,0 +1,42 @@
+# 무거운 의존성(ortools, sentence_transformers, sklearn, langchain 등) 지연 로딩
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    속성에 처음 접근할 때 실제 모듈을 import 하는 프록시 모듈
+
+    모듈 최상단에서 `pywrapcp = lazy_import('ortools.constraint_solver.pywrapcp')`
+    처럼 선언해두면, 기존 코드(`pywrapcp.RoutingModel(...)`)는 그대로 두고도
+    해당 함수가 실제로 호출될 때까지 import 비용을 미룰 수 있다.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """이미 import된 모듈이면 그대로, 아니면 LazyModule 프록시를 반환"""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
@@ -0,0 +1,137 @@
+# 생산 라인 구성 : 라인 수, 라인별 속도 배수, 가동 시간대, 허용 반찬 카테고리 (네 알고리즘 공통)
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# (가동 시작 분, 가동 종료 분) : 종료가 None 이면 제한 없음
+Window = Tuple[float, Optional[float]]
+
+
+class LineConfig:
+    """
+    생산 라인 구성
+
+    - speeds[i]     : 라인 i 속도 배수 (1.0 = 기준, 2.0 = 조리시간 절반). 전환시간은 그대로
+    - windows[i]    : 라인 i 가동 시간대 (시작 분, 종료 분). 스케줄은 시작 분부터 누적되고,
+                      종료 분을 넘긴 라인에는 다른 라인이 남아 있는 한 새 반찬을 배정하지 않는다
+    - categories[i] : 라인 i 에서 만들 수 있는 반찬 카테고리 집합 (None 이면 전체 허용)
+    - dish_categories : {반찬명: 카테고리}. 카테고리가 없는 반찬은 제한 없는 라인에만 배정
+
+    라인 번호는 0부터 시작하고, 라인을 이름으로 쓰는 스케줄러는 names() 순서로 대응시킨다.
+    기본값 LineConfig(n) 은 기존 동작과 같은 동일 라인 n 개다.
+    """
+
+    def __init__(self, num_lines: int = 8,
+                 speeds: Optional[Sequence[float]] = None,
+                 windows: Optional[Sequence[Window]] = None,
+                 categories: Optional[Sequence[Optional[Iterable[str]]]] = None,
+                 dish_categories: Optional[Mapping[str, str]] = None):
+        self.num_lines = int(num_lines)
+        self.speeds: List[float] = [1.0] * self.num_lines if speeds is None else [float(s) for s in speeds]
+        self.windows: List[Window] = [(0, None)] * self.num_lines if windows is None else [tuple(w) for w in windows]
+        self.categories: List[Optional[frozenset]] = (
+            [None] * self.num_lines if categories is None
+            else [None if c is None else frozenset(c) for c in categories]
+        )
+        self.dish_categories: Dict[str, str] = dict(dish_categories or {})
+
+        if self.num_lines < 1:
+            raise ValueError(f"라인 수는 1 이상이어야 합니다: {self.num_lines}")
+        for name, values in (('speeds', self.speeds), ('windows', self.windows), ('categories', self.categories)):
+            if len(values) != self.num_lines:
+                raise ValueError(f"{name} 길이 {len(values)}가 라인 수 {self.num_lines}와 맞지 않음")
+        for i, speed in enumerate(self.speeds):
+            if speed <= 0:
+                raise ValueError(f"라인 {i + 1} 속도 배수는 0보다 커야 합니다: {speed}")
+        for i, (start, end) in enumerate(self.windows):
+            if end is not None and end <= start:
+                raise ValueError(f"라인 {i + 1} 가동 시간대 ({start}, {end})의 종료가 시작보다 빠름")
+
+    # 1. 생성
+    # =====================================================================
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'LineConfig':
+        """
+        JSON 등에서 읽은 설정으로 생성
+
+        {'lines': [{'speed': 1.2, 'window': [0, 240], 'categories': ['무침', '볶음']}, ...],
+         'dish_categories': {'콩나물무침': '무침', ...}}
+        (lines 대신 'num_lines': n 만 주면 동일 라인 n 개)
+        """
+        lines = data.get('lines')
+        if lines is None:
+            return cls(data.get('num_lines', 8), dish_categories=data.get('dish_categories'))
+        return cls(
+            len(lines),
+            speeds=[line.get('speed', 1.0) for line in lines],
+            windows=[tuple(line.get('window', (0, None))) for line in lines],
+            categories=[line.get('categories') for line in lines],
+            dish_categories=data.get('dish_categories'),
+        )
+
+    def add_line(self, speed: float = 1.0, window: Window = (0, None),
+                 categories: Optional[Iterable[str]] = None) -> 'LineConfig':
+        """라인 하나를 뒤에 추가한 새 설정 (증설 시나리오 비교용, 자신은 그대로)"""
+        return LineConfig(self.num_lines + 1, self.speeds + [speed], self.windows + [window],
+                          self.categories + [categories], self.dish_categories)
+
+    def __len__(self) -> int:
+        return self.num_lines
+
+    def names(self, prefix: str = 'line') -> List[str]:
+        """라인 이름 목록 (prefix1, prefix2, ...)"""
+        return [f'{prefix}{i + 1}' for i in range(self.num_lines)]
+
+    @property
+    def is_uniform(self) -> bool:
+        """속도 1, 시간대/카테고리 제한 없는 동일 라인들인지"""
+        return (all(s == 1.0 for s in self.speeds)
+                and all(w == (0, None) for w in self.windows)
+                and all(c is None for c in self.categories))
+
+    # 2. 시간
+    # =====================================================================
+    @property
+    def starts(self) -> List[float]:
+        return [start for start, _ in self.windows]
+
+    def start(self, line: int) -> float:
+        return self.windows[line][0]
+
+    def end(self, line: int) -> Optional[float]:
+        return self.windows[line][1]
+
+    def is_open(self, line: int, current_time: float) -> bool:
+        """current_time 에 아직 가동 시간대 안인지"""
+        end = self.windows[line][1]
+        return end is None or current_time < end
+
+    def cooking_time(self, line: int, minutes: float) -> float:
+        """기준 조리시간 -> 라인 i 에서의 조리시간"""
+        return minutes / self.speeds[line]
+
+    # 3. 카테고리
+    # =====================================================================
+    def allows(self, line: int, dish: str) -> bool:
+        allowed = self.categories[line]
+        return allowed is None or self.dish_categories.get(dish) in allowed
+
+    def allowed_lines(self, dish: str) -> List[int]:
+        return [i for i in range(self.num_lines) if self.allows(i, dish)]
+
+    def blocked_mask(self, dish: str) -> int:
+        """반찬을 만들 수 없는 라인들의 비트마스크 (라인 i -> 비트 i)"""
+        mask = 0
+        for i in range(self.num_lines):
+            if not self.allows(i, dish):
+                mask |= 1 << i
+        return mask
+
+    def check_dishes(self, dishes: Iterable[str]) -> None:
+        """어느 라인에서도 만들 수 없는 반찬이 있으면 ValueError"""
+        missing = [dish for dish in dishes if not self.allowed_lines(dish)]
+        if missing:
+            raise ValueError(f"배정 가능한 라인이 없는 반찬 {len(missing)}개: {missing[:5]}")
+
+
+def as_line_config(line_config: Optional[LineConfig], num_lines: int) -> LineConfig:
+    """line_config 가 없으면 기존 num_lines 인자로 동일 라인 설정 생성"""
+    return line_config if line_config is not None else LineConfig(num_lines)
@@ -0,0 +1,287 @@
+# 라인 내 생산순서 최적화 (비대칭 전환시간, 시작/끝이 열린 경로)
+"""
+라인 하나의 상품 순서를 총 전환시간이 최소가 되도록 정한다.
+
+- 전환시간은 방향이 있다 (A -> B 와 B -> A 가 다름). 첫 상품 앞, 마지막 상품 뒤에는 전환시간이 없다.
+- 경로 앞뒤에 비용 0 의 가상 노드를 붙여 [D, s0, ..., s(n-1), D] 로 다루므로
+  모든 이동이 양 끝 예외 없이 같은 식으로 계산된다.
+- 이동 한 번의 비용 변화(delta)는 바뀐 간선 몇 개 + (2-opt 는 정/역방향 누적합 차이)로
+  O(1) 에 계산되고, 이웃 전체의 delta 는 numpy 브로드캐스팅으로 한 번에 구한다.
+
+생성 : nearest_neighbor (모든 시작 상품에서 시도) / held_karp (짧은 라인 정확해)
+개선 : 2-opt (구간 뒤집기), or-opt (1~3개 구간 옮기기), 3-opt (인접 두 구간 맞바꾸기)
+"""
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from common.changeover_table import ChangeoverTable
+
+DEFAULT_EXACT_LIMIT = 10        # 이 상품 수 이하면 Held-Karp 정확해
+DEFAULT_MOVES = ('2opt', 'oropt', '3opt')
+OR_OPT_MAX_SEGMENT = 3
+_EPS = 1e-9
+
+
+# 1. 비용 행렬 / 경로 비용
+# =====================================================================
+def local_matrix(changeover: ChangeoverTable, products: Sequence[str],
+                 default: Optional[float] = None) -> np.ndarray:
+    """
+    라인 상품들끼리의 전환시간 n x n 행렬 (matrix[i, j] = products[i] -> products[j])
+
+    테이블에 없는 상품의 행/열은 default (주지 않으면 테이블 기본값)
+    """
+    default = changeover.default if default is None else default
+    ids = np.array([changeover.index.get(p, -1) for p in products], dtype=np.intp)
+    known = ids >= 0
+    matrix = np.full((len(products), len(products)), default, dtype=np.float64)
+    if known.any():
+        matrix[np.ix_(known, known)] = changeover.values[np.ix_(ids[known], ids[known])]
+    return matrix
+
+def path_cost(matrix: np.ndarray, seq: Sequence[int]) -> float:
+    """순서 seq(행렬 인덱스)의 총 전환시간"""
+    seq = np.asarray(seq, dtype=np.intp)
+    if len(seq) < 2:
+        return 0.0
+    return float(matrix[seq[:-1], seq[1:]].sum())
+
+def _with_dummy(matrix: np.ndarray) -> np.ndarray:
+    """마지막 행/열에 비용 0 가상 노드를 붙인 (n+1) x (n+1) 행렬"""
+    n = len(matrix)
+    padded = np.zeros((n + 1, n + 1), dtype=np.float64)
+    padded[:n, :n] = matrix
+    return padded
+
+
+# 2. 초기해 생성
+# =====================================================================
+def nearest_neighbor(matrix: np.ndarray, start: Optional[int] = None) -> List[int]:
+    """
+    가장 가까운 다음 상품을 차례로 붙이는 순서
+
+    start 가 없으면 모든 상품을 시작점으로 시도해 총 전환시간이 가장 작은 순서를 반환
+    """
+    n = len(matrix)
+    if n == 0:
+        return []
+    starts = range(n) if start is None else [start]
+    best_seq, best_cost = None, float('inf')
+    for s in starts:
+        visited = np.zeros(n, dtype=bool)
+        visited[s] = True
+        seq = [s]
+        cost = 0.0
+        for _ in range(n - 1):
+            row = np.where(visited, np.inf, matrix[seq[-1]])
+            nxt = int(row.argmin())
+            cost += row[nxt]
+            visited[nxt] = True
+            seq.append(nxt)
+        if cost < best_cost:
+            best_seq, best_cost = seq, cost
+    return best_seq
+
+def held_karp(matrix: np.ndarray) -> List[int]:
+    """
+    총 전환시간 최소 순서 (정확해, 시작/끝 자유)
+
+    O(2^n * n^2) 이므로 상품 10~12개 정도까지만 사용
+    """
+    n = len(matrix)
+    if n <= 1:
+        return list(range(n))
+    full = (1 << n) - 1
+    # cost[mask, j] : mask 상품들을 모두 거쳐 j 에서 끝나는 최소 비용
+    cost = np.full((1 << n, n), np.inf)
+    parent = np.full((1 << n, n), -1, dtype=np.intp)
+    for j in range(n):
+        cost[1 << j, j] = 0.0
+    bits = 1 << np.arange(n)
+    all_masks = np.arange(1 << n)
+    size = ((all_masks[:, None] >> np.arange(n)) & 1).sum(axis=1)
+    # 상품 수가 같은 부분집합끼리 한 번에 확장 (k 를 고정하면 mask -> mask | k 가 일대일)
+    for layer in range(1, n):
+        masks = all_masks[size == layer]
+        step = cost[masks][:, :, None] + matrix[None, :, :]          # (mask, 직전 j, 다음 k)
+        prev = step.argmin(axis=1)
+        best = np.take_along_axis(step, prev[:, None, :], axis=1)[:, 0, :]
+        for k in range(n):
+            free = (masks & bits[k]) == 0
+            new_masks = masks[free] | bits[k]
+            candidate = best[free, k]
+            better = candidate < cost[new_masks, k]
+            cost[new_masks[better], k] = candidate[better]
+            parent[new_masks[better], k] = prev[free, k][better]
+    # 역추적
+    j = int(cost[full].argmin())
+    mask = full
+    seq = []
+    while j >= 0:
+        seq.append(j)
+        prev_j = int(parent[mask, j])
+        mask ^= 1 << j
+        j = prev_j
+    return seq[::-1]
+
+
+# 3. 지역 개선 (best-improvement)
+# =====================================================================
+def _best_two_opt(m: np.ndarray, t: np.ndarray):
+    """구간 t[i..j] 뒤집기 (1 <= i < j <= n)"""
+    n = len(t) - 2
+    if n < 2:
+        return 0.0, None
+    fwd = np.concatenate(([0.0], np.cumsum(m[t[:-1], t[1:]])))   # fwd[k] = t[0..k] 정방향 비용
+    bwd = np.concatenate(([0.0], np.cumsum(m[t[1:], t[:-1]])))   # 역방향 비용
+    i = np.arange(1, n + 1)[:, None]
+    j = np.arange(1, n + 1)[None, :]
+    delta = (m[t[i - 1], t[j]] + m[t[i], t[j + 1]] - m[t[i - 1], t[i]] - m[t[j], t[j + 1]]
+             + (bwd[j] - bwd[i]) - (fwd[j] - fwd[i]))
+    delta = np.where(j > i, delta, np.inf)
+    k = int(delta.argmin())
+    bi, bj = divmod(k, n)
+    return float(delta.flat[k]), ('2opt', bi + 1, bj + 1)
+
+def _best_or_opt(m: np.ndarray, t: np.ndarray):
+    """구간 t[i..i+L-1] (L <= 3) 을 간선 (t[p], t[p+1]) 사이로 옮기기 (방향 유지)"""
+    n = len(t) - 2
+    best = (0.0, None)
+    p = np.arange(0, n + 1)[None, :]
+    for length in range(1, min(OR_OPT_MAX_SEGMENT, n - 1) + 1):
+        i = np.arange(1, n - length + 2)[:, None]
+        a, b = t[i], t[i + length - 1]
+        before, after = t[i - 1], t[i + length]
+        removal = m[before, after] - m[before, a] - m[b, after]
+        insertion = m[t[p], a] + m[b, t[p + 1]] - m[t[p], t[p + 1]]
+        delta = removal + insertion
+        delta = np.where((p >= i - 1) & (p <= i + length - 1), np.inf, delta)
+        k = int(delta.argmin())
+        if delta.flat[k] < best[0]:
+            bi, bp = divmod(k, n + 1)
+            best = (float(delta.flat[k]), ('oropt', bi + 1, length, bp))
+    return best
+
+def _best_three_opt(m: np.ndarray, t: np.ndarray, max_cells: int = 2_000_000):
+    """A B C D -> A C B D (B = t[i:j], C = t[j:k], 1 <= i < j < k <= n+1)"""
+    n = len(t) - 2
+    if n < 2:
+        return 0.0, None
+    edge = m[t[:-1], t[1:]]                                  # edge[q] = t[q] -> t[q+1]
+    j = np.arange(1, n + 2)
+    k = np.arange(1, n + 2)
+    # (j, k) 에만 의존하는 항 : 새 간선 C 끝 -> D 처음, 끊기는 간선 B|C, C|D
+    jk = m[t[j - 1][:, None], t[k][None, :]] - edge[j - 1][:, None] - edge[k - 1][None, :]
+    jk = np.where(k[None, :] > j[:, None], jk, np.inf)
+
+    best = (0.0, None)
+    chunk = max(1, max_cells // ((n + 1) * (n + 1)))
+    for lo in range(1, n, chunk):
+        i = np.arange(lo, min(n, lo + chunk))
+        # 새 간선 A 끝 -> C 처음, C 끝 -> B 처음 / 끊기는 간선 A|B
+        ij = m[t[i - 1][:, None], t[j][None, :]] - edge[i - 1][:, None]
+        ik = m[t[k - 1][None, :], t[i][:, None]]
+        delta = ij[:, :, None] + ik[:, None, :]
+        delta += jk
+        delta[j[None, :] <= i[:, None]] = np.inf
+        idx = int(delta.argmin())
+        if delta.flat[idx] < best[0]:
+            bi, rest = divmod(idx, (n + 1) * (n + 1))
+            bj, bk = divmod(rest, n + 1)
+            best = (float(delta.flat[idx]), ('3opt', int(i[bi]), bj + 1, bk + 1))
+    return best
+
+def _apply(t: np.ndarray, move) -> np.ndarray:
+    kind = move[0]
+    if kind == '2opt':
+        _, i, j = move
+        return np.concatenate((t[:i], t[i:j + 1][::-1], t[j + 1:]))
+    if kind == 'oropt':
+        _, i, length, p = move
+        segment = t[i:i + length]
+        rest = np.concatenate((t[:i], t[i + length:]))
+        insert_at = p + 1 if p < i else p + 1 - length
+        return np.concatenate((rest[:insert_at], segment, rest[insert_at:]))
+    _, i, j, k = move
+    return np.concatenate((t[:i], t[j:k], t[i:j], t[k:]))
+
+_NEIGHBORHOODS = {'2opt': _best_two_opt, 'oropt': _best_or_opt, '3opt': _best_three_opt}
+
+def improve(matrix: np.ndarray, seq: Sequence[int],
+            moves: Iterable[str] = DEFAULT_MOVES, max_passes: int = 1000) -> List[int]:
+    """
+    seq 를 주어진 이웃(2opt / oropt / 3opt) 중 가장 좋은 이동으로 반복 개선
+
+    O(n^2) 이웃(2opt, oropt)에서 더 이상 개선이 없을 때만 O(n^3) 이웃(3opt)을 탐색한다.
+    비용이 줄어드는 이동이 없을 때까지 (또는 max_passes 번) 반복하므로 결과는 seq 보다 나쁘지 않다.
+    """
+    n = len(seq)
+    if n < 2:
+        return list(seq)
+    m = _with_dummy(matrix)
+    t = np.concatenate(([n], np.asarray(seq, dtype=np.intp), [n]))
+    moves = tuple(moves)
+    stages = [[_NEIGHBORHOODS[name] for name in moves if name != '3opt']]
+    if '3opt' in moves:
+        stages.append([_best_three_opt])
+    for _ in range(max_passes):
+        for searches in stages:
+            best_delta, best_move = 0.0, None
+            for search in searches:
+                delta, move = search(m, t)
+                if move is not None and delta < best_delta:
+                    best_delta, best_move = delta, move
+            if best_move is not None and best_delta < -_EPS:
+                t = _apply(t, best_move)
+                break
+        else:
+            break
+    return t[1:-1].tolist()
+
+
+# 4. 통합 진입점
+# =====================================================================
+def optimize_sequence(matrix: np.ndarray, seq: Optional[Sequence[int]] = None,
+                      exact_limit: int = DEFAULT_EXACT_LIMIT,
+                      moves: Iterable[str] = DEFAULT_MOVES) -> Tuple[List[int], float]:
+    """
+    전환시간 행렬 matrix 에 대해 총 전환시간이 작은 순서와 그 비용
+
+    - 상품 수 <= exact_limit : Held-Karp 정확해
+    - 그보다 많으면 : 현재 순서 seq 와 nearest-neighbor 순서를 각각 지역 개선해 더 나은 쪽
+    결과는 항상 입력 순서 seq 보다 나쁘지 않다.
+    """
+    n = len(matrix)
+    seq = list(range(n)) if seq is None else list(seq)
+    if n <= 1:
+        return seq, 0.0
+    best_seq, best_cost = seq, path_cost(matrix, seq)
+
+    if n <= exact_limit:
+        candidates = [held_karp(matrix)]
+    else:
+        moves = tuple(moves)
+        candidates = [improve(matrix, seq, moves), improve(matrix, nearest_neighbor(matrix), moves)]
+    for candidate in candidates:
+        cost = path_cost(matrix, candidate)
+        if cost < best_cost - _EPS:
+            best_seq, best_cost = candidate, cost
+    return best_seq, best_cost
+
+def sequence_products(changeover, products: Sequence[str], default: Optional[float] = None,
+                      exact_limit: int = DEFAULT_EXACT_LIMIT,
+                      moves: Iterable[str] = DEFAULT_MOVES) -> List[str]:
+    """
+    상품명 목록을 총 전환시간이 작은 순서로 재배열
+
+    changeover : ChangeoverTable 또는 전환시간 DataFrame
+    default    : 매트릭스에 없는 상품의 전환시간 (주지 않으면 테이블 기본값)
+    """
+    products = list(products)
+    if len(products) <= 1:
+        return products
+    table = ChangeoverTable.from_matrix(changeover, default=0.0 if default is None else default)
+    matrix = local_matrix(table, products, default)
+    seq, _ = optimize_sequence(matrix, exact_limit=exact_limit, moves=moves)
+    return [products[i] for i in seq]
@@ -0,0 +1,98 @@
+# 라인별 생산 순서 : 상품 id 리스트 기반 가변 해 (deepcopy 없이 이동/되돌리기)
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# (원래 라인, 원래 위치, 옮긴 라인, 옮긴 위치)
+Move = Tuple[Hashable, int, Hashable, int]
+
+
+class LineSolution:
+    """
+    {라인: [상품명, ...]} 해를 상품 id 리스트로 바꿔 들고 있는 가변 해
+
+    - products / index : 상품 id -> 상품명, 상품명 -> 상품 id
+    - apply_move 는 상품 하나를 옮기고 되돌리기용 Move 를 돌려주며, undo_move(move) 로 원상복구
+      (라인 두 개의 list pop/insert 만 하므로 후보를 평가할 때 해 전체를 복사하지 않는다)
+    - line() 이 돌려주는 리스트는 내부 상태이므로 읽기만 할 것
+    """
+
+    def __init__(self, products: Sequence[str], lines: Mapping[Hashable, List[int]]):
+        self.products: List[str] = list(products)
+        self.index: Dict[str, int] = {p: i for i, p in enumerate(self.products)}
+        self._lines: Dict[Hashable, List[int]] = {line_id: list(ids) for line_id, ids in lines.items()}
+
+    # 1. 생성 / 변환
+    # =====================================================================
+    @classmethod
+    def from_dict(cls, solution: Mapping[Hashable, Iterable[str]],
+                  products: Optional[Sequence[str]] = None) -> 'LineSolution':
+        """
+        {라인: [상품명, ...]} 에서 생성
+
+        products 를 주면 그 순서대로 id를 먼저 부여하고, 해에만 있는 상품은 뒤에 추가한다.
+        """
+        names = list(products) if products is not None else []
+        index = {p: i for i, p in enumerate(names)}
+        lines = {}
+        for line_id, l_products in solution.items():
+            ids = []
+            for product in l_products:
+                if product not in index:
+                    index[product] = len(names)
+                    names.append(product)
+                ids.append(index[product])
+            lines[line_id] = ids
+        return cls(names, lines)
+
+    def to_dict(self) -> Dict[Hashable, List[str]]:
+        """{라인: [상품명, ...]} (라인 순서 유지)"""
+        return {line_id: self.line_products(line_id) for line_id in self._lines}
+
+    # 2. 조회
+    # =====================================================================
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __contains__(self, line_id: Hashable) -> bool:
+        return line_id in self._lines
+
+    def line_ids(self) -> List[Hashable]:
+        return list(self._lines)
+
+    def lines(self) -> Dict[Hashable, List[int]]:
+        return self._lines
+
+    def line(self, line_id: Hashable) -> List[int]:
+        return self._lines[line_id]
+
+    def line_products(self, line_id: Hashable) -> List[str]:
+        return [self.products[p] for p in self._lines[line_id]]
+
+    def ids(self, products: Iterable[str]) -> List[int]:
+        """상품명 목록 -> id 목록 (없는 상품이면 KeyError)"""
+        return [self.index[p] for p in products]
+
+    # 3. 변경 / 되돌리기
+    # =====================================================================
+    def apply_move(self, source_line: Hashable, product_idx: int, target_line: Hashable,
+                   target_position: Optional[int] = None) -> Move:
+        """
+        source_line 의 product_idx 번째 상품을 target_line 의 target_position 에 삽입
+        (위치 지정되지 않으면 끝, 라인 길이보다 크면 끝으로 맞춤)
+        """
+        product = self._lines[source_line].pop(product_idx)
+        target = self._lines[target_line]
+        if target_position is None or target_position > len(target):
+            target_position = len(target)
+        target.insert(target_position, product)
+        return (source_line, product_idx, target_line, target_position)
+
+    def undo_move(self, move: Move) -> None:
+        source_line, product_idx, target_line, target_position = move
+        product = self._lines[target_line].pop(target_position)
+        self._lines[source_line].insert(product_idx, product)
+
+    def set_line(self, line_id: Hashable, ids: List[int]) -> List[int]:
+        """라인 순서를 ids 로 바꾸고 이전 순서를 반환 (되돌릴 때 다시 set_line)"""
+        previous = self._lines[line_id]
+        self._lines[line_id] = list(ids)
+        return previous
@@ -0,0 +1,285 @@
+# 지역 최적화용 증분 목적함수 평가 (상품 한 개 이동 / 라인 순서 변경)
+"""
+calculate_objective_function 은 후보 이동 하나마다 solution 전체를 deepcopy 한 뒤
+모든 라인 스케줄, 모든 주문 완료시간, 완료간격 분산을 처음부터 다시 계산한다.
+
+MoveEvaluator 는 현재 해(LineSolution, 상품 id 리스트)와 스케줄 상태를 들고 있다가
+후보를 제자리에서 적용 -> 바뀐 부분만 다시 계산 -> 되돌리기 로 평가한다.
+
+- 라인별 누적 완료시간 (prefix) : 상품을 빼거나 넣은 위치 이후 구간만 다시 누적
+- 상품별 완료시간 벡터           : 다시 누적한 구간의 상품만 갱신
+- 주문별 완료시간 (상품 완료시간의 최댓값) : 완료시간이 바뀐 상품이 들어 있는 주문만
+                                          상품 -> 주문 CSR 로 찾아 다시 계산
+
+목적함수 값은 네트워크 모듈 calculate_objective_function 과 같다
+(0.4 * 최대 주문 완료시간 + 0.6 * 주문 완료시간 간격의 분산).
+line_config(LineConfig)를 주면 solution 라인 순서대로 라인 속도와 가동 시작 시각을 반영한다.
+"""
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from common.changeover_table import ChangeoverTable
+from common.line_config import LineConfig
+from common.line_solution import LineSolution, Move
+from common.order_completion import OrderIncidence
+from common.order_ingest import group_rows
+
+# calculate_objective_function 의 가중치
+MAX_COMPLETION_WEIGHT = 0.4
+INTERVAL_VARIANCE_WEIGHT = 0.6
+
+
+def objective_from_order_times(order_times: np.ndarray) -> float:
+    """주문 완료시간 배열 -> 목적함수 (주문이 없으면 inf)"""
+    if len(order_times) == 0:
+        return float('inf')
+    max_order_completion = order_times.max()
+    # 정렬된 완료시간의 연속 간격 분산 (calculate_completion_interval_variance)
+    intervals = np.diff(np.sort(order_times))
+    interval_variance = np.var(intervals) if len(intervals) > 1 else 0
+    return (MAX_COMPLETION_WEIGHT * max_order_completion +
+            INTERVAL_VARIANCE_WEIGHT * interval_variance)
+
+
+def _segment_positions(indptr: np.ndarray, rows: np.ndarray):
+    """
+    CSR 행 rows 의 구간 [indptr[r], indptr[r+1]) 을 이어 붙인 위치 배열
+
+    Returns: (positions, 행별 시작 오프셋, 비어 있지 않은 행 여부)
+    """
+    lengths = indptr[rows + 1] - indptr[rows]
+    seg_starts = np.zeros(len(rows), dtype=np.intp)
+    np.cumsum(lengths[:-1], out=seg_starts[1:])
+    positions = np.arange(lengths.sum(), dtype=np.intp) + np.repeat(indptr[rows] - seg_starts, lengths)
+    return positions, seg_starts, lengths > 0
+
+
+class MoveEvaluator:
+    """
+    현재 해(state: LineSolution)의 스케줄 상태와 증분 평가
+
+    - evaluate_move / evaluate_line : 목적함수만 계산 (state 에 적용했다가 되돌림)
+    - apply_move / set_line         : state 와 스케줄 상태를 함께 갱신
+    - 최종 해는 state.to_dict() 로 {라인: [상품명, ...]} 를 얻는다
+
+    상품 완료시간 규칙은 calculate_order_and_line_completion_times 와 같다
+    (라인 안에서는 마지막 위치, 여러 라인에 있으면 앞 라인 기준, 배치되지 않은 상품은 0).
+    """
+
+    def __init__(self, orders: Mapping[Any, Any], solution: Dict[Hashable, List[str]],
+                 cooking_times: Mapping[str, float], changeover_matrix,
+                 default_changeover: float = 4, default_cooking_time: float = 3,
+                 line_config: Optional[LineConfig] = None,
+                 incidence: Optional[OrderIncidence] = None):
+        if line_config is not None and len(line_config) != len(solution):
+            raise ValueError(f"라인 구성 {len(line_config)}개와 해의 라인 {len(solution)}개가 맞지 않음")
+        # 주문 -> 상품 incidence (같은 orders 로 여러 번 평가기를 만들 때는 만들어 둔 것을 넘겨 재사용)
+        self.incidence = OrderIncidence.from_baskets(orders) if incidence is None else incidence
+
+        # 1. 상품 id : 주문에 나온 상품(incidence 열 순서) 다음에 라인에만 있는 상품
+        self.state = LineSolution.from_dict(solution, products=self.incidence.products)
+        self.products = self.state.products
+        self.product_index = self.state.index
+        n = len(self.products)
+
+        # 2. 조리시간 / 전환시간 (상품 id 기준 리스트, 매트릭스에 없는 상품은 기본 전환시간)
+        self._cook = [cooking_times.get(p, default_cooking_time) for p in self.products]
+        table = ChangeoverTable.from_matrix(changeover_matrix, default=default_changeover)
+        table_ids = np.array([table.index.get(p, len(table)) for p in self.products], dtype=np.intp)
+        padded = np.full((len(table) + 1, len(table) + 1), table.default, dtype=np.float64)
+        padded[:-1, :-1] = table.values
+        self._changeover = padded[np.ix_(table_ids, table_ids)].tolist()
+
+        # 라인별 조리시간 (속도 1 인 라인은 같은 리스트 공유) / 라인 가동 시작 시각
+        speeds = [1.0] * len(solution) if line_config is None else line_config.speeds
+        starts = [0.0] * len(solution) if line_config is None else line_config.starts
+        self._line_cook: Dict[Hashable, List[float]] = {
+            line_id: self._cook if speed == 1.0 else [c / speed for c in self._cook]
+            for line_id, speed in zip(solution, speeds)
+        }
+        self._line_start: Dict[Hashable, float] = {line_id: float(start) for line_id, start in zip(solution, starts)}
+
+        # 3. 상품 -> 주문 CSR (incidence 전치)
+        entry_orders = np.repeat(np.arange(len(self.incidence), dtype=np.intp),
+                                 np.diff(self.incidence.indptr))
+        entry_order, self._product_orders_ptr = group_rows(self.incidence.indices, n)
+        self._product_orders = entry_orders[entry_order]
+        self._n_order_products = len(self.incidence.products)
+
+        # 4. 현재 상태
+        lines = self.state.lines()
+        self._line_times: Dict[Hashable, List[float]] = {
+            line_id: self._accumulate(line_id, ids, 0, self._line_start[line_id]) for line_id, ids in lines.items()
+        }
+        self._unique = self._lines_unique(lines)
+        self._product_times = self._all_product_times(lines, self._line_times)
+        self._order_times = self.incidence.completion_times(self._product_times[:self._n_order_products])
+        self._objective = objective_from_order_times(self._order_times)
+
+    # 1. 내부 계산
+    # =====================================================================
+    def _accumulate(self, line_id: Hashable, ids: List[int], start: int, prev_time: float) -> List[float]:
+        """line_id 라인 ids[start:] 의 완료시간 (calculate_line_schedule 과 같은 순서로 누적)"""
+        cook, changeover = self._line_cook[line_id], self._changeover
+        times = []
+        current_time = prev_time
+        for i in range(start, len(ids)):
+            if i > 0:
+                current_time += changeover[ids[i - 1]][ids[i]]
+            current_time += cook[ids[i]]
+            times.append(current_time)
+        return times
+
+    @staticmethod
+    def _lines_unique(lines: Mapping[Hashable, List[int]]) -> bool:
+        total = sum(len(ids) for ids in lines.values())
+        return len({p for ids in lines.values() for p in ids}) == total
+
+    def _all_product_times(self, lines, line_times) -> np.ndarray:
+        """상품별 완료시간 전체 계산 (중복 배치 규칙 포함)"""
+        product_times = np.zeros(len(self.products), dtype=np.float64)
+        seen = set()
+        for line_id, ids in lines.items():
+            line_completion = dict(zip(ids, line_times[line_id]))  # 라인 안에서는 마지막 위치
+            for p, t in line_completion.items():
+                if p not in seen:                                    # 앞 라인 우선
+                    seen.add(p)
+                    product_times[p] = t
+        return product_times
+
+    def _candidate(self, starts: Dict[Hashable, int], same_products: bool):
+        """
+        state 에 이미 적용된 변경(starts = {라인: 처음 바뀐 위치})에 대한
+        (라인 완료시간, 바뀐 상품 id, 그 완료시간, 주문 완료시간 배열, 목적함수)
+
+        same_products : 바뀐 라인들의 상품 구성이 그대로인지 (이동 / 순서 변경)
+        """
+        lines = self.state.lines()
+        line_times = {}
+        for line_id, start in starts.items():
+            old_times = self._line_times[line_id]
+            prev_time = old_times[start - 1] if start > 0 else self._line_start[line_id]
+            line_times[line_id] = old_times[:start] + self._accumulate(line_id, lines[line_id], start, prev_time)
+
+        # 바뀐 상품 완료시간
+        # 상품이 한 라인에만 있고 상품 구성이 그대로면, 바뀐 위치 이후 상품만 갱신
+        if self._unique and same_products:
+            updates = {}
+            for line_id, start in starts.items():
+                for p, t in zip(lines[line_id][start:], line_times[line_id][start:]):
+                    updates[p] = t
+            changed = np.fromiter(updates.keys(), dtype=np.intp, count=len(updates))
+            changed_times = np.fromiter(updates.values(), dtype=np.float64, count=len(updates))
+        else:
+            all_times = dict(self._line_times)
+            all_times.update(line_times)
+            product_times = self._all_product_times(lines, all_times)
+            changed = np.flatnonzero(product_times != self._product_times)
+            changed_times = product_times[changed]
+
+        keep = changed_times != self._product_times[changed]
+        changed, changed_times = changed[keep], changed_times[keep]
+
+        # 주문 완료시간 갱신 : 완료시간이 늘어난 상품은 max 로 바로 반영하고,
+        # 줄어든 상품은 그 상품이 최댓값이었던 주문만 다시 계산
+        old_times = self._product_times[changed]
+        product_times = self._product_times.copy()
+        product_times[changed] = changed_times
+        order_times = self._order_times.copy()
+
+        decreased = changed_times < old_times
+        positions, _, _ = _segment_positions(self._product_orders_ptr, changed[decreased])
+        dec_orders = self._product_orders[positions]
+        dec_old = np.repeat(old_times[decreased], np.diff(self._product_orders_ptr)[changed[decreased]])
+        recompute_mask = np.zeros(len(order_times), dtype=bool)
+        recompute_mask[dec_orders[order_times[dec_orders] == dec_old]] = True
+        recompute = np.flatnonzero(recompute_mask)
+
+        increased = ~decreased
+        positions, _, _ = _segment_positions(self._product_orders_ptr, changed[increased])
+        inc_times = np.repeat(changed_times[increased], np.diff(self._product_orders_ptr)[changed[increased]])
+        np.maximum.at(order_times, self._product_orders[positions], inc_times)
+
+        order_times[recompute] = self._order_max(recompute, product_times)
+        return line_times, changed, changed_times, order_times, objective_from_order_times(order_times)
+
+    def _order_max(self, order_ids: np.ndarray, product_times: np.ndarray) -> np.ndarray:
+        """order_ids 주문들의 완료시간 (상품 완료시간 최댓값, 상품 없는 주문은 0)"""
+        result = np.zeros(len(order_ids), dtype=np.float64)
+        positions, seg_starts, nonempty = _segment_positions(self.incidence.indptr, order_ids)
+        if nonempty.any():
+            result[nonempty] = np.maximum.reduceat(product_times[self.incidence.indices[positions]],
+                                                   seg_starts[nonempty])
+        return result
+
+    def _commit(self, candidate) -> float:
+        line_times, changed, changed_times, order_times, objective = candidate
+        self._line_times.update(line_times)
+        self._product_times[changed] = changed_times
+        self._order_times = order_times
+        self._objective = objective
+        return objective
+
+    @staticmethod
+    def _move_starts(move: Move) -> Dict[Hashable, int]:
+        source_line, product_idx, target_line, target_position = move
+        if source_line == target_line:
+            return {source_line: min(product_idx, target_position)}
+        return {source_line: product_idx, target_line: target_position}
+
+    def _replace_line(self, line_id: Hashable, products: Sequence[str]):
+        """라인 순서를 바꾸고 (처음 바뀐 위치, 상품 구성 동일 여부, 이전 순서) 반환"""
+        ids = self.state.ids(products)
+        previous = self.state.set_line(line_id, ids)
+        start = 0
+        while start < min(len(ids), len(previous)) and ids[start] == previous[start]:
+            start += 1
+        return {line_id: start}, sorted(ids) == sorted(previous), previous
+
+    # 2. 평가 (해를 바꾸지 않음)
+    # =====================================================================
+    def objective(self) -> float:
+        """현재 해의 목적함수"""
+        return self._objective
+
+    def evaluate_move(self, source_line: Hashable, product_idx: int, target_line: Hashable,
+                      target_position: Optional[int] = None) -> float:
+        """source_line 의 product_idx 번째 상품을 target_line 의 target_position 에 넣었을 때 목적함수"""
+        if product_idx >= len(self.state.line(source_line)):
+            return float('inf')
+        move = self.state.apply_move(source_line, product_idx, target_line, target_position)
+        try:
+            return self._candidate(self._move_starts(move), same_products=True)[-1]
+        finally:
+            self.state.undo_move(move)
+
+    def evaluate_line(self, line_id: Hashable, products: Sequence[str]) -> float:
+        """line_id 라인의 상품 순서를 products 로 바꿨을 때 목적함수"""
+        starts, same_products, previous = self._replace_line(line_id, products)
+        try:
+            return self._candidate(starts, same_products)[-1]
+        finally:
+            self.state.set_line(line_id, previous)
+
+    def line_completion_times(self) -> Dict[Hashable, float]:
+        """라인별 마지막 상품 완료시간 (빈 라인은 0)"""
+        return {line_id: times[-1] if times else 0 for line_id, times in self._line_times.items()}
+
+    def order_completion_times(self) -> Dict[Any, float]:
+        return dict(zip(self.incidence.order_ids, self._order_times.tolist()))
+
+    # 3. 적용 (해와 상태 갱신)
+    # =====================================================================
+    def apply_move(self, source_line: Hashable, product_idx: int, target_line: Hashable,
+                   target_position: Optional[int] = None) -> float:
+        """상품 이동을 state 에 반영하고 새 목적함수 반환"""
+        move = self.state.apply_move(source_line, product_idx, target_line, target_position)
+        return self._commit(self._candidate(self._move_starts(move), same_products=True))
+
+    def set_line(self, line_id: Hashable, products: Sequence[str]) -> float:
+        """line_id 라인의 상품 순서를 products 로 바꾸고 새 목적함수 반환"""
+        starts, same_products, _ = self._replace_line(line_id, products)
+        objective = self._commit(self._candidate(starts, same_products))
+        self._unique = self._lines_unique(self.state.lines())
+        return objective
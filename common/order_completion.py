@@ -0,0 +1,95 @@
+# 주문 완료시간 계산 : 주문 -> 상품 CSR incidence + 구간별 최대값
+"""
+주문 완료시간 = 그 주문에 포함된 상품들의 완료시간 중 최댓값
+
+상품별 완료시간 벡터 product_times 와 주문별 상품 id 목록(CSR: indptr, indices)이 있으면
+np.maximum.reduceat(product_times[indices], indptr[:-1]) 한 번으로 모든 주문의
+완료시간이 나온다 (주문 라인 수에 비례).
+어느 라인에도 배치되지 않은 상품의 완료시간은 0, 상품이 없는 주문의 완료시간도 0이다.
+"""
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from common.order_ingest import group_rows
+
+
+class OrderIncidence:
+    """
+    주문 -> 상품 CSR incidence
+
+    - order_ids : 주문번호 목록 (행 순서)
+    - products  : 상품명 목록 (열 순서), product_index 로 상품명 -> 열 번호
+    - 주문 k 의 상품 열 번호 : indices[indptr[k]:indptr[k+1]]
+    """
+
+    def __init__(self, order_ids: Sequence, products: Sequence[str],
+                 indptr: np.ndarray, indices: np.ndarray):
+        self.order_ids = list(order_ids)
+        self.products = list(products)
+        self.product_index: Dict[str, int] = {p: i for i, p in enumerate(self.products)}
+        self.indptr = np.asarray(indptr, dtype=np.intp)
+        self.indices = np.asarray(indices, dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.order_ids)
+
+    # 1. 생성
+    # =====================================================================
+    @classmethod
+    def from_frame(cls, orders_df: pd.DataFrame,
+                   order_column: str = '주문번호',
+                   dish_column: str = '상품명') -> 'OrderIncidence':
+        """주문 테이블에서 생성 (주문번호는 처음 등장한 순서, df['주문번호'].unique() 와 동일)"""
+        order_codes, order_ids = pd.factorize(orders_df[order_column])
+        product_codes, products = pd.factorize(orders_df[dish_column])
+        valid = (order_codes >= 0) & (product_codes >= 0)
+        order_codes, product_codes = order_codes[valid], product_codes[valid]
+        row_order, indptr = group_rows(order_codes, len(order_ids))
+        return cls(order_ids.tolist(), products.tolist(), indptr, product_codes[row_order])
+
+    @classmethod
+    def from_baskets(cls, baskets: Mapping[Any, Any]) -> 'OrderIncidence':
+        """
+        {주문번호: [상품명, ...]} 또는 {주문번호: {'products': [...]}} 딕셔너리에서 생성
+        (fre.py order_requirements / 네트워크 모듈 orders)
+        """
+        order_ids = list(baskets.keys())
+        product_index: Dict[str, int] = {}
+        indices: List[int] = []
+        indptr = np.zeros(len(order_ids) + 1, dtype=np.intp)
+        for k, order in enumerate(baskets.values()):
+            items = order['products'] if isinstance(order, Mapping) else order
+            for product in items:
+                indices.append(product_index.setdefault(product, len(product_index)))
+            indptr[k + 1] = len(indices)
+        return cls(order_ids, list(product_index), indptr, np.array(indices, dtype=np.intp))
+
+    # 2. 완료시간 계산
+    # =====================================================================
+    def product_time_vector(self, product_times: Mapping[str, float], default: float = 0.0) -> np.ndarray:
+        """{상품명: 완료시간} -> 열 순서 완료시간 벡터 (없는 상품은 default)"""
+        return np.array([product_times.get(p, default) for p in self.products], dtype=np.float64)
+
+    def completion_times(self, product_times) -> np.ndarray:
+        """
+        주문별 완료시간 배열 (order_ids 순서)
+
+        product_times 는 열 순서 벡터 또는 {상품명: 완료시간} 딕셔너리
+        """
+        if isinstance(product_times, Mapping):
+            product_times = self.product_time_vector(product_times)
+        values = np.asarray(product_times, dtype=np.float64)[self.indices]
+
+        result = np.zeros(len(self.order_ids), dtype=np.float64)
+        starts = self.indptr[:-1]
+        nonempty = starts < self.indptr[1:]
+        if nonempty.any():
+            result[nonempty] = np.maximum.reduceat(values, starts[nonempty])
+        return result
+
+    def completion_map(self, product_times) -> Dict[Any, float]:
+        """{주문번호: 완료시간}"""
+        return dict(zip(self.order_ids, self.completion_times(product_times).tolist()))
+
@@ -0,0 +1,122 @@
+# 주문 데이터 컬럼 단위 적재 (iterrows 대체)
+"""
+주문 테이블(주문번호, 상품명, 수량, 상품코드, 주문일자)을 정렬 + 분할 몇 번으로
+각 알고리즘이 쓰는 딕셔너리 구조로 바꾼다.
+
+- build_orders_and_products : 네트워크 모듈 process_orders_data 의 (orders, products_info)
+- build_order_requirements  : fre.py load_data 의 order_requirements
+"""
+import gc
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# 1. 공통 : 키별 행 묶기
+# =====================================================================
+# 1-1. 키 코드(0..n-1) 기준 안정 정렬 후 구간 경계 반환
+def group_rows(codes: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns:
+    --------
+    (order, bounds) : order 는 codes 안정 정렬 순서, 그룹 g 의 행은 order[bounds[g]:bounds[g+1]]
+    """
+    order = np.argsort(codes, kind='stable')
+    bounds = np.zeros(n_groups + 1, dtype=np.intp)
+    np.cumsum(np.bincount(codes, minlength=n_groups), out=bounds[1:])
+    return order, bounds
+
+# 1-2. 주문 수십만 개 분량의 dict/list 를 만드는 동안 순환 GC 일시 정지
+#      (새 컨테이너가 계속 생겨 세대별 GC가 반복 실행되는 비용이 생성 시간보다 큼)
+@contextmanager
+def _gc_paused():
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+# 1-3. 정렬된 값 배열을 그룹별 리스트로 분할
+def split_groups(sorted_values: np.ndarray, bounds: np.ndarray) -> List[list]:
+    values = sorted_values.tolist()
+    starts = bounds.tolist()
+    with _gc_paused():
+        return [values[start:end] for start, end in zip(starts[:-1], starts[1:])]
+
+
+# 2. 네트워크 모듈용 : orders / products_info
+# =====================================================================
+def build_orders_and_products(orders_df: pd.DataFrame) -> Tuple[Dict[str, dict], Dict[str, dict]]:
+    """
+    process_orders_data 와 같은 구조를 컬럼 연산으로 생성
+
+    - orders        : {str(주문번호): {'products', 'quantities', 'order_date', 'product_codes'}}
+                      주문번호 오름차순, 주문 안의 상품은 원래 행 순서
+    - products_info : {상품명: {'code', 'order_ids', 'total_quantity'}}
+                      주문번호 순으로 처음 등장한 순서, code 는 마지막 행 값
+    """
+    # 주문번호 오름차순 + 주문 안에서는 원래 행 순서 (groupby('주문번호') 순회 순서와 동일)
+    order_codes, order_keys = pd.factorize(orders_df['주문번호'], sort=True)
+    valid = order_codes >= 0
+    df = orders_df[valid]
+    order_codes = order_codes[valid]
+    row_order, bounds = group_rows(order_codes, len(order_keys))
+
+    names = df['상품명'].to_numpy(dtype=object)[row_order]
+    quantities = df['수량'].to_numpy()[row_order]
+    product_codes = df['상품코드'].to_numpy(dtype=object)[row_order]
+    order_dates = df['주문일자'].to_numpy(dtype=object)[row_order]
+    order_ids = np.array([str(k) for k in order_keys.tolist()], dtype=object)
+
+    # orders
+    names_list = names.tolist()
+    quantities_list = quantities.tolist()
+    codes_list = product_codes.tolist()
+    dates_list = order_dates.tolist()
+    starts = bounds.tolist()
+    orders = {}
+    with _gc_paused():
+        for order_id, start, end in zip(order_ids.tolist(), starts[:-1], starts[1:]):
+            products = names_list[start:end]
+            orders[order_id] = {
+                'products': products,
+                'quantities': dict(zip(products, quantities_list[start:end])),
+                'order_date': dates_list[start],
+                'product_codes': dict(zip(products, codes_list[start:end])),
+            }
+
+    # products_info
+    product_index, product_names = pd.factorize(names)
+    product_rows, product_bounds = group_rows(product_index, len(product_names))
+    row_order_ids = order_ids[order_codes[row_order]]
+    order_id_lists = split_groups(row_order_ids[product_rows], product_bounds)
+    last_rows = product_rows[product_bounds[1:] - 1].tolist()
+    total_quantities = (pd.Series(quantities).groupby(product_index).sum()
+                        .reindex(range(len(product_names))).tolist())
+
+    products_info = {}
+    for p, product_name in enumerate(product_names.tolist()):
+        products_info[product_name] = {
+            'code': codes_list[last_rows[p]],
+            'order_ids': order_id_lists[p],
+            'total_quantity': total_quantities[p],
+        }
+    return orders, products_info
+
+
+# 3. fre.py 용 : order_requirements
+# =====================================================================
+def build_order_requirements(orders_df: pd.DataFrame,
+                             order_column: str = '주문번호',
+                             dish_column: str = '상품명') -> defaultdict:
+    """{주문번호: [상품명, ...]} (주문번호는 처음 등장한 순서, 상품은 행 순서)"""
+    order_codes, order_keys = pd.factorize(orders_df[order_column])
+    valid = order_codes >= 0
+    row_order, bounds = group_rows(order_codes[valid], len(order_keys))
+    names = orders_df[dish_column].to_numpy(dtype=object)[valid][row_order]
+    return defaultdict(list, zip(order_keys.tolist(), split_groups(names, bounds)))
@@ -0,0 +1,145 @@
+# 주문 파일 로딩 (.xlsx / .csv / .parquet) + 엑셀 -> Parquet 캐시
+"""
+주문 엑셀을 매번 openpyxl 로 파싱하지 않도록
+
+- <이름>.xlsx         : 원본 주문 엑셀
+- <이름>.xlsx.parquet : ORDER_COLUMNS 만 담은 캐시 (스키마 메타데이터에 원본 mtime / 크기 기록)
+
+처음 읽을 때 엑셀을 Parquet 로 변환해 두고, 원본 mtime / 크기가 기록과 같으면 다음부터는
+Parquet 만 읽는다 (같은 날 재실행 시 엑셀 파싱 생략). .csv / .parquet 은 그대로 읽는다.
+
+- 컬럼 : ORDER_COLUMNS 중 파일에 있는 것만 읽음
+- 문자열 컬럼(상품명, 상품코드, 주문일자)은 category 로 읽음 (반복되는 반찬명을 코드로 저장)
+- pyarrow 가 없으면 캐시 없이 엑셀을 그대로 읽음
+
+사용법 (엑셀 -> Parquet 변환): python -m common.order_loader 주문.xlsx ...
+"""
+import json
+import os
+import sys
+from typing import Optional, Sequence
+
+import pandas as pd
+
+# 스케줄러들이 쓰는 주문 컬럼 (common.order_ingest 기준)
+ORDER_COLUMNS = ('주문번호', '상품명', '상품코드', '수량', '주문일자')
+# category 로 읽을 컬럼
+CATEGORY_COLUMNS = ('상품명', '상품코드', '주문일자')
+# 캐시 유효성 판단용 메타데이터 키
+SOURCE_METADATA_KEY = b'order_loader.source'
+
+
+# 1. 경로 / 캐시 키
+# =====================================================================
+# 1-1. 캐시 경로 : 'a/orders.xlsx' -> 'a/orders.xlsx.parquet' (같은 이름의 다른 Parquet 과 겹치지 않게)
+def cache_path(path: str) -> str:
+    return path + '.parquet'
+
+# 1-2. 원본 파일 키 : mtime(ns) + 크기
+def _source_key(path: str) -> dict:
+    stat = os.stat(path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+# 1-3. 캐시가 원본과 같은 파일에서 만들어졌는지
+def _cache_ready(path: str, parquet_path: str) -> bool:
+    if not os.path.exists(parquet_path):
+        return False
+    try:
+        import pyarrow.parquet as pq
+        metadata = pq.read_schema(parquet_path).metadata or {}
+    except Exception:  # pyarrow 없음 / 깨진 파일
+        return False
+    recorded = metadata.get(SOURCE_METADATA_KEY)
+    return recorded is not None and json.loads(recorded) == _source_key(path)
+
+
+# 2. 형식별 읽기
+# =====================================================================
+def _as_categories(df: pd.DataFrame) -> pd.DataFrame:
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    return df
+
+def _read_excel(path: str, columns: Sequence[str]) -> pd.DataFrame:
+    return pd.read_excel(path, usecols=lambda c: c in columns)
+
+def _read_csv(path: str, columns: Sequence[str], categorical: bool) -> pd.DataFrame:
+    dtype = {c: 'category' for c in CATEGORY_COLUMNS} if categorical else None
+    return pd.read_csv(path, usecols=lambda c: c in columns, dtype=dtype)
+
+def _read_parquet(path: str, columns: Sequence[str]) -> pd.DataFrame:
+    import pyarrow.parquet as pq
+    available = set(pq.read_schema(path).names)
+    return pd.read_parquet(path, columns=[c for c in columns if c in available])
+
+
+# 3. 엑셀 -> Parquet 변환
+# =====================================================================
+def save_order_cache(orders_df: pd.DataFrame, source_path: str, out_path: Optional[str] = None) -> str:
+    """주문 DataFrame 을 원본 파일 키와 함께 Parquet 로 저장"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet_path = out_path or cache_path(source_path)
+    table = pa.Table.from_pandas(orders_df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SOURCE_METADATA_KEY] = json.dumps(_source_key(source_path)).encode()
+    pq.write_table(table.replace_schema_metadata(metadata), parquet_path)
+    return parquet_path
+
+def convert_excel_to_parquet(xlsx_path: str, out_path: Optional[str] = None) -> str:
+    orders_df = _as_categories(_read_excel(xlsx_path, ORDER_COLUMNS))
+    return save_order_cache(orders_df, xlsx_path, out_path)
+
+
+# 4. 로딩
+# =====================================================================
+def load_orders(path: str, columns: Sequence[str] = ORDER_COLUMNS,
+                categorical: bool = True, cache: bool = True) -> pd.DataFrame:
+    """
+    확장자에 따라 주문 파일 로딩
+
+    Parameters:
+    -----------
+    path : str - 주문 파일 (.xlsx / .xls / .csv / .parquet)
+    columns : list - 읽을 컬럼 (파일에 없는 컬럼은 건너뜀)
+    categorical : bool - 상품명 / 상품코드 / 주문일자를 category 로 읽을지
+    cache : bool - 엑셀이면 옆의 Parquet 캐시를 쓰고, 없거나 원본이 바뀌었으면 만들어 둘지
+                   (columns 가 ORDER_COLUMNS 밖의 컬럼을 요구하면 캐시 없이 엑셀을 읽음)
+
+    Returns:
+    --------
+    pd.DataFrame : 주문 테이블 (columns 순서)
+    """
+    columns = list(dict.fromkeys(columns))
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        orders_df = _read_csv(path, columns, categorical)
+    elif ext == '.parquet':
+        orders_df = _read_parquet(path, columns)
+    elif not (cache and set(columns) <= set(ORDER_COLUMNS)):
+        orders_df = _read_excel(path, columns)
+    elif _cache_ready(path, cache_path(path)):
+        orders_df = _read_parquet(cache_path(path), columns)
+    else:
+        orders_df = _as_categories(_read_excel(path, ORDER_COLUMNS))
+        try:
+            save_order_cache(orders_df, path)
+        except (ImportError, OSError) as e:
+            print(f"⚠️ 주문 Parquet 캐시 저장 실패 ({e}), 엑셀 사용")
+
+    selected = [c for c in columns if c in orders_df.columns]
+    if list(orders_df.columns) != selected:
+        orders_df = orders_df[selected].copy()
+    if categorical:
+        return _as_categories(orders_df)
+    for column in CATEGORY_COLUMNS:
+        if column in orders_df.columns and isinstance(orders_df[column].dtype, pd.CategoricalDtype):
+            orders_df[column] = orders_df[column].astype(orders_df[column].cat.categories.dtype)
+    return orders_df
+
+
+if __name__ == "__main__":
+    for xlsx_file in sys.argv[1:]:
+        print(f"{xlsx_file} -> {convert_excel_to_parquet(xlsx_file)}")
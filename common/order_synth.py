@@ -0,0 +1,200 @@
+# 합성 주문 데이터 생성 : 고객 데이터 없이 스케줄러 규모 테스트용 (시드 고정, 결정적)
+"""
+주문 엑셀(주문번호, 상품명, 상품코드, 수량, 주문일자)과 같은 컬럼의 DataFrame 을 만든다.
+상품명은 조리시간 레지스트리(common/cooking_times.json, get_dish_cooking_times)의 반찬명만 쓰므로
+모든 알고리즘에서 조리시간이 그대로 조회된다.
+
+- 카탈로그   : 레지스트리 반찬 중 catalog_size 개 (시드로 선택)
+- 인기도     : 순위 r 의 반찬 가중치 r^(-popularity_skew) (Zipf 형태)
+- 장바구니   : basket_sizes = {상품 수: 확률} 분포에서 주문별 상품 수
+- 동시구매   : 카탈로그를 num_clusters 개 군집으로 나누고, 주문마다 군집 하나를 고른 뒤
+               각 상품을 co_purchase 확률로 그 군집에서, 나머지는 카탈로그 전체에서 인기도 비례로 뽑음
+               (co_purchase 가 클수록 같은 주문에 함께 나오는 반찬 조합이 뚜렷해짐)
+- 한 주문 안에서 중복된 반찬은 전체 카탈로그에서 다시 뽑는다
+
+모든 추출은 numpy 배열 연산이라 수백만 줄(현재 물량의 100배)도 수 초 안에 만든다.
+
+사용법:
+    from common.order_synth import generate_orders
+    orders_df = generate_orders(num_orders=50000, seed=0)
+
+    python common/order_synth.py --orders 800 --scale 100 --out orders_100x.parquet
+"""
+import argparse
+import os
+import sys
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.cooking_times import COOKING_TIMES
+
+# 주문당 상품 수 분포 기본값 {상품 수: 확률}
+DEFAULT_BASKET_SIZES = {1: 0.15, 2: 0.25, 3: 0.25, 4: 0.15, 5: 0.1, 6: 0.1}
+# 중복 반찬을 다시 뽑는 최대 횟수 (남은 중복은 제거)
+MAX_RESAMPLE_ROUNDS = 20
+
+
+# 1. 카탈로그 / 분포 준비
+# =====================================================================
+def _popularity_cdf(weights: np.ndarray) -> np.ndarray:
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+def _cluster_cdf(weights: np.ndarray, cluster_of: np.ndarray, num_clusters: int):
+    """
+    군집별 인기도 누적분포를 [c, c+1) 구간에 이어 붙인 배열
+
+    군집 c 안에서 뽑을 때 c + U(0, 1) 을 searchsorted 하면 군집 c 의 반찬 위치가 나온다
+    Returns: (members : 군집 순서로 정렬한 반찬 위치, cdf, ends : 군집별 마지막 위치)
+    """
+    members = np.argsort(cluster_of, kind='stable')
+    sorted_clusters = cluster_of[members]
+    sorted_weights = weights[members]
+    totals = np.bincount(sorted_clusters, weights=sorted_weights, minlength=num_clusters)
+    counts = np.bincount(sorted_clusters, minlength=num_clusters)
+    earlier = np.repeat(np.cumsum(totals) - totals, counts)  # 앞 군집들의 가중치 합
+    cdf = sorted_clusters + (np.cumsum(sorted_weights) - earlier) / totals[sorted_clusters]
+    ends = np.cumsum(counts) - 1
+    cdf[ends] = np.arange(num_clusters) + 1.0  # 군집 끝은 정확히 c+1
+    return members, cdf, ends
+
+def _draw(cdf: np.ndarray, u: np.ndarray) -> np.ndarray:
+    return np.minimum(np.searchsorted(cdf, u, side='right'), len(cdf) - 1)
+
+
+# 2. 생성
+# =====================================================================
+def generate_orders(num_orders: int,
+                    catalog_size: Optional[int] = None,
+                    basket_sizes: Optional[Mapping[int, float]] = None,
+                    num_clusters: int = 8,
+                    co_purchase: float = 0.6,
+                    popularity_skew: float = 1.0,
+                    max_quantity: int = 4,
+                    num_days: int = 1,
+                    start_date: str = '2025-04-01',
+                    start_order_id: int = 100000,
+                    seed: int = 0,
+                    dish_names: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    합성 주문 테이블 (같은 인자, 같은 seed 면 항상 같은 결과)
+
+    Parameters:
+    -----------
+    num_orders : int - 주문 수
+    catalog_size : int - 사용할 반찬 수 (기본 : 레지스트리 전체)
+    basket_sizes : dict - {주문당 상품 수: 확률} (기본 DEFAULT_BASKET_SIZES, 합이 1이 아니면 정규화)
+    num_clusters : int - 동시구매 군집 수
+    co_purchase : float - 주문 상품을 그 주문의 군집에서 뽑을 확률 (0 이면 군집 구조 없음)
+    popularity_skew : float - 인기도 Zipf 지수 (0 이면 균등)
+    max_quantity : int - 주문 줄당 최대 수량 (수량은 1부터 기하분포, max_quantity 에서 자름)
+    num_days : int - 주문일자 수 (주문번호 순서대로 날짜를 고르게 나눔)
+    start_date : str - 첫 주문일자
+    start_order_id : int - 첫 주문번호
+    seed : int - 난수 시드
+    dish_names : list - 반찬명 목록 (기본 : 조리시간 레지스트리의 반찬명)
+
+    Returns:
+    --------
+    pd.DataFrame : 주문번호, 상품명, 상품코드, 수량, 주문일자 (주문번호 순)
+    """
+    names = np.array(list(COOKING_TIMES) if dish_names is None else list(dish_names), dtype=object)
+    catalog_size = len(names) if catalog_size is None else int(catalog_size)
+    if not 1 <= catalog_size <= len(names):
+        raise ValueError(f"catalog_size 는 1 ~ {len(names)} 이어야 합니다 (조리시간이 있는 반찬 수): {catalog_size}")
+    if not 0 <= co_purchase <= 1:
+        raise ValueError(f"co_purchase 는 0 ~ 1 이어야 합니다: {co_purchase}")
+    num_clusters = max(1, min(int(num_clusters), catalog_size))
+    basket_sizes = DEFAULT_BASKET_SIZES if basket_sizes is None else basket_sizes
+    sizes = np.array(list(basket_sizes.keys()), dtype=np.intp)
+    probs = np.array(list(basket_sizes.values()), dtype=np.float64)
+    if len(sizes) == 0 or (sizes < 1).any() or (probs < 0).any() or probs.sum() <= 0:
+        raise ValueError(f"basket_sizes 는 {{1 이상 상품 수: 0 이상 확률}} 이어야 합니다: {dict(basket_sizes)}")
+
+    rng = np.random.default_rng(seed)
+
+    # 1) 카탈로그 : 반찬 선택, 인기도, 군집
+    catalog = np.sort(rng.choice(len(names), size=catalog_size, replace=False))
+    weights = np.empty(catalog_size)
+    weights[rng.permutation(catalog_size)] = np.arange(1, catalog_size + 1, dtype=np.float64) ** -popularity_skew
+    cluster_of = rng.permutation(np.arange(catalog_size) % num_clusters)
+    global_cdf = _popularity_cdf(weights)
+    members, cluster_cdf, cluster_ends = _cluster_cdf(weights, cluster_of, num_clusters)
+    cluster_weights = np.bincount(cluster_of, weights=weights, minlength=num_clusters)
+
+    # 2) 주문별 상품 수 / 군집
+    basket = np.minimum(rng.choice(sizes, size=num_orders, p=probs / probs.sum()), catalog_size)
+    order_cluster = rng.choice(num_clusters, size=num_orders, p=cluster_weights / cluster_weights.sum())
+    line_order = np.repeat(np.arange(num_orders, dtype=np.intp), basket)
+    n_lines = len(line_order)
+
+    # 3) 주문 줄별 반찬 : co_purchase 확률로 주문 군집에서, 나머지는 전체에서
+    from_cluster = rng.random(n_lines) < co_purchase
+    dish = _draw(global_cdf, rng.random(n_lines))
+    clustered = np.flatnonzero(from_cluster)
+    home = order_cluster[line_order[clustered]]
+    # c + U(0, 1) 이 반올림으로 c+1 이 되어도 군집 c 안에 머물도록 군집 끝에서 자름
+    position = np.minimum(_draw(cluster_cdf, home + rng.random(len(clustered))), cluster_ends[home])
+    dish[clustered] = members[position]
+
+    # 4) 한 주문 안의 중복 반찬 다시 뽑기 (남으면 제거)
+    keep = np.ones(n_lines, dtype=bool)
+    for resample_round in range(MAX_RESAMPLE_ROUNDS + 1):
+        keys = line_order * catalog_size + dish
+        order = np.argsort(keys, kind='stable')
+        duplicated = np.zeros(n_lines, dtype=bool)
+        duplicated[order[1:]] = keys[order[1:]] == keys[order[:-1]]
+        if not duplicated.any():
+            break
+        if resample_round == MAX_RESAMPLE_ROUNDS:
+            keep = ~duplicated
+            break
+        redraw = np.flatnonzero(duplicated)
+        dish[redraw] = _draw(global_cdf, rng.random(len(redraw)))
+
+    # 5) 수량 / 주문일자
+    quantity = np.minimum(rng.geometric(0.6, size=n_lines), max_quantity)
+    day = line_order * max(1, int(num_days)) // max(1, num_orders)
+    dates = pd.date_range(start_date, periods=max(1, int(num_days))).strftime('%Y-%m-%d').to_numpy()
+
+    name_index = catalog[dish[keep]]
+    return pd.DataFrame({
+        '주문번호': line_order[keep] + start_order_id,
+        '상품명': names[name_index],
+        '상품코드': np.char.add('BC', np.char.zfill(name_index.astype(str), 5)).astype(object),
+        '수량': quantity[keep],
+        '주문일자': dates[day[keep]],
+    })
+
+
+# 3. 파일로 저장 (규모 테스트용 입력 파일)
+# =====================================================================
+def main():
+    parser = argparse.ArgumentParser(description='합성 주문 데이터 생성 (.csv / .parquet / .xlsx)')
+    parser.add_argument('--orders', type=int, default=800, help='기준 주문 수 (현재 하루 물량)')
+    parser.add_argument('--scale', type=float, default=1, help='기준 주문 수 배수 (예: 100)')
+    parser.add_argument('--catalog-size', type=int)
+    parser.add_argument('--clusters', type=int, default=8)
+    parser.add_argument('--co-purchase', type=float, default=0.6)
+    parser.add_argument('--days', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', required=True)
+    args = parser.parse_args()
+
+    orders_df = generate_orders(int(args.orders * args.scale), catalog_size=args.catalog_size,
+                                num_clusters=args.clusters, co_purchase=args.co_purchase,
+                                num_days=args.days, seed=args.seed)
+    if args.out.endswith('.parquet'):
+        orders_df.to_parquet(args.out, index=False)
+    elif args.out.endswith('.xlsx'):
+        orders_df.to_excel(args.out, index=False)
+    else:
+        orders_df.to_csv(args.out, index=False, encoding='utf-8-sig')
+    print(f"{args.out} : 주문 {orders_df['주문번호'].nunique():,}개 / {len(orders_df):,}줄 / 반찬 {orders_df['상품명'].nunique()}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# 상품 동시주문 네트워크 : CSR 인접 리스트
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+
+class ProductGraph:
+    """
+    상품 간 동시주문 횟수를 가중치로 하는 무방향 그래프 (CSR 형식)
+
+    노드 i 의 이웃은 indices[indptr[i]:indptr[i+1]], 가중치는 같은 구간의 weights.
+    이웃 순서는 간선이 입력된 순서를 따른다 (기존 'A|B' 딕셔너리를 훑던 순서와 동일).
+    같은 상품끼리의 간선('A|A', 한 주문에 같은 상품이 두 번 있을 때)은 한 번만 센다.
+    degree / weighted_degree / max_weight 는 생성할 때 한 번에 계산해 둔다.
+    """
+
+    def __init__(self, products: List[str], edges: List[Tuple[str, str, int]]):
+        self.products = list(products)
+        self.index: Dict[str, int] = {p: i for i, p in enumerate(self.products)}
+        for a, b, _ in edges:
+            for p in (a, b):
+                if p not in self.index:
+                    self.index[p] = len(self.products)
+                    self.products.append(p)
+        n = len(self.products)
+
+        # 간선 k -> (a->b) 2k, (b->a) 2k+1 로 펼친 뒤 출발 노드 기준 안정 정렬
+        src = np.empty(2 * len(edges), dtype=np.intp)
+        dst = np.empty(2 * len(edges), dtype=np.intp)
+        w = np.empty(2 * len(edges), dtype=np.int64)
+        if edges:
+            a_ids = np.fromiter((self.index[a] for a, _, _ in edges), dtype=np.intp, count=len(edges))
+            b_ids = np.fromiter((self.index[b] for _, b, _ in edges), dtype=np.intp, count=len(edges))
+            weights = np.fromiter((c for _, _, c in edges), dtype=np.int64, count=len(edges))
+            src[0::2], src[1::2] = a_ids, b_ids
+            dst[0::2], dst[1::2] = b_ids, a_ids
+            w[0::2] = w[1::2] = weights
+            # 자기 자신 간선은 역방향(b->a)을 빼서 한 번만 (기존 루프의 연결 합과 동일)
+            keep = np.ones(2 * len(edges), dtype=bool)
+            keep[1::2] = a_ids != b_ids
+            src, dst, w = src[keep], dst[keep], w[keep]
+
+        order = np.argsort(src, kind='stable')
+        self.indices = dst[order]
+        self.weights = w[order]
+        self.indptr = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(np.bincount(src, minlength=n), out=self.indptr[1:])
+
+        # 노드별 차수 / 가중 차수 / 최대 간선 가중치
+        self.degree = np.diff(self.indptr)
+        self.weighted_degree = np.bincount(src, weights=w, minlength=n).astype(np.int64)
+        self.max_weight = np.zeros(n, dtype=np.int64)
+        np.maximum.at(self.max_weight, src, w)
+
+    # 1. 생성
+    # =====================================================================
+    @classmethod
+    def from_connections(cls, product_connections: Mapping,
+                         products: Optional[Iterable[str]] = None) -> 'ProductGraph':
+        """
+        {'상품A|상품B': weight} 또는 {(상품A, 상품B): weight} 딕셔너리로 그래프 생성
+
+        products 를 주면 그 순서대로 노드 id를 먼저 부여한다 (간선이 없는 상품 포함).
+        """
+        edges = []
+        for key, weight in product_connections.items():
+            a, b = key.split('|') if isinstance(key, str) else key
+            edges.append((a, b, weight))
+        return cls(list(products) if products is not None else [], edges)
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def __contains__(self, product: str) -> bool:
+        return product in self.index
+
+    # 2. 조회 : O(차수)
+    # =====================================================================
+    def neighbor_ids(self, node: int) -> np.ndarray:
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def neighbors(self, product: str) -> List[str]:
+        node = self.index.get(product)
+        if node is None:
+            return []
+        return [self.products[i] for i in self.neighbor_ids(node)]
+
+    def neighbor_weights(self, product: str) -> Dict[str, int]:
+        node = self.index.get(product)
+        if node is None:
+            return {}
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return {self.products[i]: int(c) for i, c in zip(self.indices[start:end], self.weights[start:end])}
+
+    def max_connections(self) -> Dict[str, int]:
+        return dict(zip(self.products, self.max_weight.tolist()))
+
+    def total_connections(self) -> Dict[str, int]:
+        return dict(zip(self.products, self.weighted_degree.tolist()))
+
+
+def as_product_graph(product_connections: Union[ProductGraph, Mapping]) -> ProductGraph:
+    """ProductGraph면 그대로, 연결 딕셔너리면 그래프로 변환"""
+    if isinstance(product_connections, ProductGraph):
+        return product_connections
+    return ProductGraph.from_connections(product_connections)
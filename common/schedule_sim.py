@@ -0,0 +1,152 @@
+# 라인 스케줄 시뮬레이터 : 라인별 상품 순서 -> 상품별 시작/종료시간 (네 알고리즘 공통)
+"""
+규칙 (main._build_start_end_minutes, 네트워크 모듈 calculate_line_schedule,
+fre.optimize_parallel_production, Vrp.print_solution 과 동일)
+
+- 첫 상품    : start = 0,                       end = start + 조리시간
+- 이후 상품  : start = 이전 end + 전환시간(이전 -> 현재), end = start + 조리시간
+
+모든 라인을 이어 붙여 한 번에 계산한다.
+- seq / indptr : 이어 붙인 상품 id 배열과 라인 경계 (라인 k 는 seq[indptr[k]:indptr[k+1]])
+- accumulate   : 위치별 전환시간/조리시간 배열을 받는 핵심 루프 (simulate, simulate_schedule 공용)
+- numba 가 있으면 JIT 루프, 없으면 [전환, 조리, 전환, 조리, ...] 를 라인별 행으로 펼친 뒤
+  np.cumsum(axis=1) 한 번으로 계산 (행 방향 누적은 순차 덧셈이라 파이썬 루프와 값이 같다)
+"""
+from typing import Dict, Hashable, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from common.changeover_table import ChangeoverTable
+
+try:
+    import numba
+except ImportError:  # numba 가 없으면 numpy 경로만 사용
+    numba = None
+
+
+# 1. 라인 순서 묶기
+# =====================================================================
+def pack_lines(lines: Sequence[Sequence[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """라인별 id 목록 -> (seq, indptr)"""
+    indptr = np.zeros(len(lines) + 1, dtype=np.intp)
+    np.cumsum([len(line) for line in lines], out=indptr[1:])
+    seq = np.fromiter((p for line in lines for p in line), dtype=np.intp, count=int(indptr[-1]))
+    return seq, indptr
+
+
+# 2. 시뮬레이션
+# =====================================================================
+def _accumulate_loop(changes, cooks, indptr, offsets, starts, ends):
+    for line in range(len(indptr) - 1):
+        current_time = offsets[line]
+        for k in range(indptr[line], indptr[line + 1]):
+            if k > indptr[line]:
+                current_time += changes[k]
+            starts[k] = current_time
+            current_time += cooks[k]
+            ends[k] = current_time
+
+_accumulate_jit = numba.njit(cache=True)(_accumulate_loop) if numba is not None else None
+
+def _accumulate_numpy(changes, cooks, indptr, offsets, starts, ends):
+    if len(cooks) == 0:
+        return
+    lengths = np.diff(indptr)
+    line_of = np.repeat(np.arange(len(lengths)), lengths)
+    position = np.arange(len(cooks)) - indptr[line_of]
+    # 행 = 라인, 열 2p = p번째 상품 앞 전환시간 (첫 상품은 라인 시작시각), 열 2p+1 = p번째 상품 조리시간
+    steps = np.zeros((len(lengths), 2 * int(lengths.max())), dtype=np.float64)
+    steps[line_of, 2 * position] = np.where(position == 0, offsets[line_of], changes)
+    steps[line_of, 2 * position + 1] = cooks
+    cumulative = np.cumsum(steps, axis=1)
+    starts[:] = cumulative[line_of, 2 * position]
+    ends[:] = cumulative[line_of, 2 * position + 1]
+
+def accumulate(changes: np.ndarray, cooks: np.ndarray, indptr: np.ndarray,
+               offsets: Optional[Sequence[float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    위치별 값으로 (starts, ends) 계산
+
+    changes[k] : k번째 상품 앞 전환시간 (라인 첫 상품 값은 무시)
+    cooks[k]   : k번째 상품 조리시간
+    offsets[i] : 라인 i 첫 상품 시작시각 (가동 시작, 주지 않으면 0)
+    """
+    changes = np.asarray(changes, dtype=np.float64)
+    cooks = np.asarray(cooks, dtype=np.float64)
+    indptr = np.asarray(indptr, dtype=np.intp)
+    offsets = np.zeros(len(indptr) - 1) if offsets is None else np.asarray(offsets, dtype=np.float64)
+    starts = np.zeros(len(cooks), dtype=np.float64)
+    ends = np.zeros(len(cooks), dtype=np.float64)
+    if _accumulate_jit is not None:
+        _accumulate_jit(changes, cooks, indptr, offsets, starts, ends)
+    else:
+        _accumulate_numpy(changes, cooks, indptr, offsets, starts, ends)
+    return starts, ends
+
+def simulate(seq: np.ndarray, indptr: np.ndarray, cooking: np.ndarray,
+             changeover: np.ndarray, offsets: Optional[Sequence[float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (starts, ends) : seq 와 같은 길이의 시작/종료시간 배열
+
+    cooking[p]       : 상품 p 의 조리시간
+    changeover[p, q] : 상품 p 다음 q 를 만들 때 전환시간
+    """
+    seq = np.asarray(seq, dtype=np.intp)
+    changes = np.zeros(len(seq), dtype=np.float64)
+    if len(seq) > 1:
+        changes[1:] = np.asarray(changeover, dtype=np.float64)[seq[:-1], seq[1:]]
+    return accumulate(changes, np.asarray(cooking, dtype=np.float64)[seq], indptr, offsets)
+
+def simulate_lines(lines: Sequence[Sequence[int]], cooking: np.ndarray, changeover: np.ndarray,
+                   offsets: Optional[Sequence[float]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """라인별 id 목록 -> (starts, ends, indptr)"""
+    seq, indptr = pack_lines(lines)
+    starts, ends = simulate(seq, indptr, cooking, changeover, offsets)
+    return starts, ends, indptr
+
+def line_end_times(ends: np.ndarray, indptr: np.ndarray) -> np.ndarray:
+    """라인별 마지막 상품 종료시간 (빈 라인은 0)"""
+    result = np.zeros(len(indptr) - 1, dtype=np.float64)
+    nonempty = indptr[1:] > indptr[:-1]
+    result[nonempty] = ends[indptr[1:][nonempty] - 1]
+    return result
+
+
+# 3. 상품명 스케줄용
+# =====================================================================
+def simulate_schedule(line_schedules: Mapping[Hashable, Sequence[str]],
+                      cooking_times: Mapping[str, float], changeover,
+                      default_changeover: Optional[float] = None,
+                      default_cooking_time: float = 3,
+                      speeds: Optional[Sequence[float]] = None,
+                      offsets: Optional[Sequence[float]] = None) -> Dict[Hashable, Tuple[np.ndarray, np.ndarray]]:
+    """
+    {라인: [상품명, ...]} -> {라인: (시작시간 배열, 종료시간 배열)}
+
+    changeover          : ChangeoverTable 또는 전환시간 DataFrame
+    default_changeover  : 매트릭스에 없는 상품의 전환시간 (주지 않으면 테이블 기본값)
+    default_cooking_time: cooking_times 에 없는 상품의 조리시간
+    speeds / offsets    : line_schedules 순서의 라인별 속도 배수 / 가동 시작시각 (LineConfig.speeds, starts)
+    """
+    table = ChangeoverTable.from_matrix(changeover, default=0.0 if default_changeover is None else default_changeover)
+    default = table.default if default_changeover is None else default_changeover
+
+    names = [p for seq in line_schedules.values() for p in seq]
+    indptr = np.zeros(len(line_schedules) + 1, dtype=np.intp)
+    np.cumsum([len(seq) for seq in line_schedules.values()], out=indptr[1:])
+
+    # 연속한 두 상품의 전환시간만 조회 (테이블에 없는 상품이 끼면 default)
+    ids = np.fromiter((table.index.get(p, -1) for p in names), dtype=np.intp, count=len(names))
+    changes = np.zeros(len(names), dtype=np.float64)
+    if len(names) > 1:
+        prev_ids, next_ids = ids[:-1], ids[1:]
+        known = (prev_ids >= 0) & (next_ids >= 0)
+        changes[1:] = default
+        changes[1:][known] = table.values[prev_ids[known], next_ids[known]]
+    cooks = np.fromiter((cooking_times.get(p, default_cooking_time) for p in names), dtype=np.float64, count=len(names))
+    if speeds is not None:
+        cooks /= np.repeat(np.asarray(speeds, dtype=np.float64), np.diff(indptr))
+
+    starts, ends = accumulate(changes, cooks, indptr, offsets)
+    return {line_id: (starts[indptr[k]:indptr[k + 1]], ends[indptr[k]:indptr[k + 1]])
+            for k, line_id in enumerate(line_schedules)}
@@ -0,0 +1,560 @@
+# 반찬 생산 VRP 모델 구성 및 탐색 공통 함수 (Vrp.py / opti_vrp.py 공용)
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from common.lazy_import import lazy_import
+from common.line_config import LineConfig
+
+routing_enums_pb2 = lazy_import('ortools.constraint_solver.routing_enums_pb2')
+pywrapcp = lazy_import('ortools.constraint_solver.pywrapcp')
+
+
+# 설정 상수
+# =====================================================================
+DROP_PENALTY = 1000000
+
+DEFAULT_FIRST_SOLUTION_STRATEGY = 'PARALLEL_CHEAPEST_INSERTION'
+DEFAULT_LOCAL_SEARCH_METAHEURISTIC = 'GUIDED_LOCAL_SEARCH'
+
+# 병렬 탐색 시 워커별로 나눠줄 (초기해 전략, 메타휴리스틱) 조합
+# 워커 수가 조합 수보다 많으면 조합을 다시 돌면서 반찬 노드 순서를 섞는 시드를 바꿔 다양성 확보
+DEFAULT_PORTFOLIO = [
+    ('PARALLEL_CHEAPEST_INSERTION', 'GUIDED_LOCAL_SEARCH'),
+    ('PATH_CHEAPEST_ARC', 'GUIDED_LOCAL_SEARCH'),
+    ('LOCAL_CHEAPEST_INSERTION', 'GUIDED_LOCAL_SEARCH'),
+    ('SAVINGS', 'GUIDED_LOCAL_SEARCH'),
+    ('PARALLEL_CHEAPEST_INSERTION', 'TABU_SEARCH'),
+    ('PATH_CHEAPEST_ARC', 'SIMULATED_ANNEALING'),
+    ('GLOBAL_CHEAPEST_ARC', 'TABU_SEARCH'),
+    ('CHRISTOFIDES', 'SIMULATED_ANNEALING'),
+]
+
+
+## 1. 모델 구성 ##
+# =====================================================================
+# 1-1. 라우팅 모델 생성 : 노드 0 ~ num_lines-1 은 라인별 depot, 이후는 반찬
+# cooking_vector 가 (라인 수 x 노드 수) 행렬이면 라인별 조리시간 (속도가 다른 라인)
+# line_starts : 라인별 가동 시작 (없으면 0), node_lines : {반찬 노드: 허용 라인 목록}
+def build_routing_model(distance_matrix: np.ndarray,
+                        cooking_vector: np.ndarray,
+                        num_lines: int,
+                        line_capacity: Sequence[int],
+                        line_starts: Optional[Sequence[int]] = None,
+                        node_lines: Optional[Dict[int, List[int]]] = None) -> Tuple[Any, Any]:
+
+    num_nodes = len(distance_matrix)
+    depots = list(range(num_lines))
+
+    manager = pywrapcp.RoutingIndexManager(num_nodes, num_lines, depots, depots)
+    routing = pywrapcp.RoutingModel(manager)
+
+    # 전환시간 : 노드 기준 정수 행렬을 그대로 등록 (탐색 중 파이썬 콜백 호출 없음)
+    transit_callback_index = routing.RegisterTransitMatrix(np.asarray(distance_matrix).tolist())
+    routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
+
+    # 시간 제약 : 노드별 시간 소모량 벡터 (depot은 0, 반찬은 조리시간)
+    cooking_vector = np.asarray(cooking_vector)
+    if cooking_vector.ndim == 1:
+        time_callback_index = routing.RegisterUnaryTransitVector(cooking_vector.tolist())
+        routing.AddDimensionWithVehicleCapacity(
+            time_callback_index,
+            0,  # slack
+            [int(c) for c in line_capacity],  # 각 라인의 최대 시간
+            line_starts is None,  # 가동 시작이 없으면 start cumul을 0으로 고정
+            'Time'
+        )
+    else:
+        # 라인별 조리시간 벡터를 라인마다 따로 등록
+        time_callback_indices = [routing.RegisterUnaryTransitVector(row.tolist()) for row in cooking_vector]
+        routing.AddDimensionWithVehicleTransitAndCapacity(
+            time_callback_indices,
+            0,
+            [int(c) for c in line_capacity],
+            line_starts is None,
+            'Time'
+        )
+    time_dimension = routing.GetDimensionOrDie('Time')
+    if line_starts is not None:
+        for line in range(num_lines):
+            time_dimension.CumulVar(routing.Start(line)).SetValue(int(line_starts[line]))
+
+    # 모든 반찬이 정확히 한 번씩 방문되도록 제약 (미방문 시 큰 페널티)
+    for node in range(num_lines, num_nodes):
+        routing.AddDisjunction([manager.NodeToIndex(node)], DROP_PENALTY)
+
+    # 카테고리 제한이 있는 반찬은 허용 라인에서만 (-1 : 미방문)
+    for node, lines in (node_lines or {}).items():
+        routing.VehicleVar(manager.NodeToIndex(node)).SetValues([-1] + list(lines))
+
+    # 목적함수 설정 (Makespan 최소화) : 최대 완료시간 + 개별 라인 완료시간
+    end_time_vars = [time_dimension.CumulVar(routing.End(line)) for line in range(num_lines)]
+    routing.AddVariableMinimizedByFinalizer(routing.solver().Max(end_time_vars))
+    for var in end_time_vars:
+        routing.AddVariableMinimizedByFinalizer(var)
+
+    return manager, routing
+
+# 1-2. 탐색 파라미터 생성 : 전략 이름은 routing_enums_pb2 의 enum 이름 문자열
+def make_search_parameters(time_limit: float,
+                           first_solution_strategy: str = DEFAULT_FIRST_SOLUTION_STRATEGY,
+                           local_search_metaheuristic: str = DEFAULT_LOCAL_SEARCH_METAHEURISTIC) -> Any:
+
+    search_parameters = pywrapcp.DefaultRoutingSearchParameters()
+    search_parameters.first_solution_strategy = getattr(
+        routing_enums_pb2.FirstSolutionStrategy, first_solution_strategy
+    )
+    search_parameters.local_search_metaheuristic = getattr(
+        routing_enums_pb2.LocalSearchMetaheuristic, local_search_metaheuristic
+    )
+    search_parameters.time_limit.FromMilliseconds(max(1, int(time_limit * 1000)))
+    return search_parameters
+
+# 1-3. 라인 구성(LineConfig) -> 모델 입력 (모두 솔버 단위 정수)
+def line_model_inputs(line_config: LineConfig,
+                      ordered_dishes: List[str],
+                      cooking_times: Dict[str, float],
+                      max_time: float,
+                      time_resolution: int) -> Tuple[np.ndarray, List[int], Optional[List[int]], Optional[Dict[int, List[int]]]]:
+    """
+    (cooking_vector, line_capacity, line_starts, node_lines)
+
+    - cooking_vector : 라인 속도가 모두 1이면 노드별 벡터, 아니면 (라인 수 x 노드 수) 행렬
+    - line_capacity  : 라인별 종료 한계 (가동 종료, 없으면 가동 시작 + max_time)
+    - line_starts    : 라인별 가동 시작 (모두 0이면 None)
+    - node_lines     : {반찬 노드: 허용 라인 목록} (제한 없는 반찬은 빠짐, 하나도 없으면 None)
+    """
+    line_config.check_dishes(ordered_dishes)
+    num_lines = line_config.num_lines
+    minutes = np.array([cooking_times[dish] for dish in ordered_dishes], dtype=np.float64)
+    speeds = np.asarray(line_config.speeds, dtype=np.float64)
+
+    if np.all(speeds == 1.0):
+        cooking_vector = np.zeros(num_lines + len(ordered_dishes), dtype=int)
+        cooking_vector[num_lines:] = np.rint(minutes * time_resolution)
+    else:
+        cooking_vector = np.zeros((num_lines, num_lines + len(ordered_dishes)), dtype=int)
+        cooking_vector[:, num_lines:] = np.rint(minutes[None, :] / speeds[:, None] * time_resolution)
+
+    line_capacity = [int((end if end is not None else start + max_time) * time_resolution)
+                     for start, end in line_config.windows]
+    line_starts = None
+    if any(start != 0 for start in line_config.starts):
+        line_starts = [int(round(start * time_resolution)) for start in line_config.starts]
+
+    node_lines = {}
+    for k, dish in enumerate(ordered_dishes):
+        allowed = line_config.allowed_lines(dish)
+        if len(allowed) < num_lines:
+            node_lines[num_lines + k] = allowed
+    return cooking_vector, line_capacity, line_starts, node_lines or None
+
+
+## 2. 해(route) 변환/평가 ##
+# =====================================================================
+# 2-1. 솔루션에서 라인별 반찬 노드 순서 추출 (depot 제외)
+def extract_routes(manager: Any, routing: Any, solution: Any) -> List[List[int]]:
+    routes = []
+    for line_id in range(routing.vehicles()):
+        route = []
+        index = solution.Value(routing.NextVar(routing.Start(line_id)))
+        while not routing.IsEnd(index):
+            route.append(manager.IndexToNode(index))
+            index = solution.Value(routing.NextVar(index))
+        routes.append(route)
+    return routes
+
+# 2-2. 라인별 노드 순서를 현재 모델의 Assignment로 복원
+# 아직 탐색하지 않은 모델에만 사용 (탐색이 끝난 모델은 OR-Tools가 "Model already closed"로 거부 -> restore_routes)
+def routes_to_assignment(manager: Any, routing: Any, routes: List[List[int]],
+                         search_parameters: Any) -> Optional[Any]:
+    routing.CloseModelWithParameters(search_parameters)
+    index_routes = [[manager.NodeToIndex(node) for node in route] for route in routes]
+    return routing.ReadAssignmentFromRoutes(index_routes, True)
+
+# 2-3. {라인: [반찬명, ...]} 형태의 기존 스케줄을 라인별 노드 순서로 변환
+def schedule_to_routes(schedule: Dict[Any, List[str]],
+                       ordered_dishes: List[str],
+                       num_lines: int) -> List[List[int]]:
+    """
+    asso.assign_parallel_by_workload, fre.optimize_parallel_production,
+    네트워크 알고리즘의 local_optimization 결과처럼 라인별 반찬 리스트를 노드 순서로 변환
+
+    - 라인은 dict의 순서대로 0번 라인부터 대응 (라인 수가 num_lines보다 많으면 ValueError)
+    - 주문에 없는 반찬과 중복 배정된 반찬은 건너뜀 (빠진 반찬은 탐색 중 삽입됨)
+    """
+    if len(schedule) > num_lines:
+        raise ValueError(f"초기 스케줄의 라인 수({len(schedule)})가 생산라인 수({num_lines})보다 많습니다")
+
+    dish_to_node = {dish: num_lines + i for i, dish in enumerate(ordered_dishes)}
+    seen = set()
+    routes = []
+    for dishes in schedule.values():
+        route = []
+        for dish in dishes:
+            node = dish_to_node.get(dish)
+            if node is not None and node not in seen:
+                seen.add(node)
+                route.append(node)
+        routes.append(route)
+    routes.extend([] for _ in range(num_lines - len(routes)))
+    return routes
+
+# 2-4. 초기해(라인별 노드 순서)에서 출발해 탐색, 초기해가 제약을 어기면 처음부터 탐색
+def solve_with_initial_routes(manager: Any, routing: Any, search_parameters: Any,
+                              initial_routes: Optional[List[List[int]]] = None) -> Optional[Any]:
+    if initial_routes is None:
+        return routing.SolveWithParameters(search_parameters)
+
+    initial_solution = routes_to_assignment(manager, routing, initial_routes, search_parameters)
+    if initial_solution is None:
+        print("⚠️ 초기 스케줄이 시간 제약을 만족하지 않아 처음부터 탐색합니다")
+        return routing.SolveWithParameters(search_parameters)
+    return routing.SolveFromAssignmentWithParameters(initial_solution, search_parameters)
+
+# 2-5. 라인별 실제 종료시각 (가동 시작 + 조리시간 + 라인 내 전환시간, 솔버 단위)
+def evaluate_routes(routes: List[List[int]],
+                    distance_matrix: np.ndarray,
+                    cooking_vector: np.ndarray,
+                    line_starts: Optional[Sequence[int]] = None) -> List[int]:
+    cooking_vector = np.asarray(cooking_vector)
+    line_times = []
+    for line_id, route in enumerate(routes):
+        nodes = np.asarray(route, dtype=int)
+        cooking = cooking_vector[line_id] if cooking_vector.ndim == 2 else cooking_vector
+        total = cooking[nodes].sum()
+        if len(nodes) > 1:
+            total += distance_matrix[nodes[:-1], nodes[1:]].sum()
+        if line_starts is not None:
+            total += line_starts[line_id]
+        line_times.append(int(total))
+    return line_times
+
+# 2-6. 라인별 노드 순서를 같은 입력으로 새로 만든 모델에 복원 : (manager, routing, solution)
+def restore_routes(routes: List[List[int]],
+                   search_parameters: Any,
+                   distance_matrix: np.ndarray,
+                   cooking_vector: np.ndarray,
+                   num_lines: int,
+                   line_capacity: Sequence[int],
+                   line_starts: Optional[Sequence[int]] = None,
+                   node_lines: Optional[Dict[int, List[int]]] = None) -> Tuple[Any, Any, Optional[Any]]:
+    manager, routing = build_routing_model(distance_matrix, cooking_vector, num_lines, line_capacity,
+                                           line_starts, node_lines)
+    return manager, routing, routes_to_assignment(manager, routing, routes, search_parameters)
+
+
+## 3. 탐색 모니터 ##
+# =====================================================================
+class ImprovementMonitor:
+    """
+    탐색 중 해가 발견될 때마다 실제 Makespan(조리+전환, 솔버 단위)을 계산해
+    개선 곡선 [(경과 초, Makespan), ...] 을 기록하고, 조건을 만족하면 탐색을 조기 종료
+
+    - stall_seconds : 마지막 개선 이후 이 시간(초) 동안 개선이 없으면 종료
+    - target_makespan : 모든 반찬을 배정한 해의 Makespan이 이 값 이하가 되면 종료
+
+    routing.AddAtSolutionCallback 으로 등록되므로 해가 발견될 때만 호출됨
+    (개선 없는 구간의 길이도 다음 해가 발견되는 시점에 판단)
+
+    솔버 목적함수(전환시간 합 + 조리시간 기준 종료시각)와 실제 Makespan은 다르므로,
+    탐색 중 실제 Makespan이 가장 작았던 해를 best_routes로 보관한다.
+    탐색이 끝난 모델에는 해를 다시 넣을 수 없으므로, better_routes()가 돌려준 해는
+    restore_routes()로 새 모델에 복원해서 사용
+    """
+
+    def __init__(self, routing: Any, distance_matrix: np.ndarray, cooking_vector: np.ndarray,
+                 stall_seconds: Optional[float] = None,
+                 target_makespan: Optional[int] = None,
+                 line_starts: Optional[Sequence[int]] = None):
+        self.routing = routing
+        self.distance_matrix = np.asarray(distance_matrix)
+        self.cooking_vector = np.asarray(cooking_vector)
+        self.line_starts = line_starts
+        self.stall_seconds = stall_seconds
+        self.target_makespan = target_makespan
+        self.num_dishes = len(self.distance_matrix) - routing.vehicles()
+
+        self.trace: List[Tuple[float, int]] = []
+        self.best_routes: Optional[List[List[int]]] = None
+        self.stop_reason: Optional[str] = None
+        self._best_key = None
+        self._start = time.time()
+        self._last_improvement = self._start
+
+    def __call__(self) -> None:
+        routing = self.routing
+        routes = []
+        for line_id in range(routing.vehicles()):
+            route = []
+            index = routing.NextVar(routing.Start(line_id)).Value()
+            while not routing.IsEnd(index):
+                route.append(index)
+                index = routing.NextVar(index).Value()
+            routes.append(route)
+
+        # index -> node 변환은 attach 시점에 만들어둔 표 사용
+        nodes = [[self._index_to_node[i] for i in route] for route in routes]
+        dropped = self.num_dishes - sum(len(route) for route in nodes)
+        makespan = max(evaluate_routes(nodes, self.distance_matrix, self.cooking_vector, self.line_starts))
+
+        now = time.time()
+        key = (dropped, makespan)
+        if self._best_key is None or key < self._best_key:
+            self._best_key = key
+            self._last_improvement = now
+            self.best_routes = nodes
+            if dropped == 0:
+                self.trace.append((round(now - self._start, 3), makespan))
+
+        if self.target_makespan is not None and dropped == 0 and makespan <= self.target_makespan:
+            self.stop_reason = 'target'
+        elif self.stall_seconds is not None and now - self._last_improvement >= self.stall_seconds:
+            self.stop_reason = 'stall'
+        if self.stop_reason:
+            routing.solver().FinishCurrentSearch()
+
+    def attach(self, manager: Any) -> 'ImprovementMonitor':
+        """routing 모델에 콜백 등록 (Solve 호출 직전에 호출)"""
+        self._index_to_node = {index: manager.IndexToNode(index) for index in range(self.routing.Size())}
+        self._start = self._last_improvement = time.time()
+        self.routing.AddAtSolutionCallback(self)
+        return self
+
+    def better_routes(self, routes: Optional[List[List[int]]]) -> Optional[List[List[int]]]:
+        """
+        탐색이 반환한 해(라인별 노드 순서, 없으면 None)보다 (미배정 수, 실제 Makespan)이
+        작은 해를 탐색 중에 봤으면 그 해, 아니면 None
+        """
+        if self.best_routes is None:
+            return None
+        if routes is not None:
+            dropped = self.num_dishes - sum(len(route) for route in routes)
+            makespan = max(evaluate_routes(routes, self.distance_matrix, self.cooking_vector, self.line_starts))
+            if (dropped, makespan) <= self._best_key:
+                return None
+        return self.best_routes
+
+
+## 4. 병렬 멀티스타트 탐색 ##
+# =====================================================================
+# 4-1. 워커 : 자기 프로세스에서 모델을 새로 만들어 한 가지 전략으로 탐색
+def _solve_portfolio_worker(distance_matrix: np.ndarray,
+                            cooking_vector: np.ndarray,
+                            num_lines: int,
+                            line_capacity: Sequence[int],
+                            strategy: Tuple[str, str],
+                            seed: int,
+                            deadline: float,
+                            initial_routes: Optional[List[List[int]]] = None,
+                            track_improvement: bool = False,
+                            stall_seconds: Optional[float] = None,
+                            target_makespan: Optional[int] = None,
+                            line_starts: Optional[Sequence[int]] = None,
+                            node_lines: Optional[Dict[int, List[int]]] = None) -> Tuple[Optional[List[List[int]]], List[Tuple[float, int]]]:
+
+    # seed > 0 이면 반찬 노드 순서를 섞어 같은 전략이라도 다른 탐색 경로를 타게 함
+    perm = np.arange(len(distance_matrix))
+    if seed:
+        np.random.default_rng(seed).shuffle(perm[num_lines:])
+    shuffled_distance = distance_matrix[np.ix_(perm, perm)]
+    shuffled_cooking = cooking_vector[..., perm]  # 라인별 조리시간 행렬이면 열(노드)만 섞음
+
+    position = np.argsort(perm)  # 원래 노드 번호 -> 섞인 노드 번호
+    if initial_routes is not None:
+        initial_routes = [[int(position[node]) for node in route] for route in initial_routes]
+    if node_lines is not None:
+        node_lines = {int(position[node]): lines for node, lines in node_lines.items()}
+
+    manager, routing = build_routing_model(shuffled_distance, shuffled_cooking, num_lines, line_capacity,
+                                           line_starts, node_lines)
+    search_parameters = make_search_parameters(deadline - time.time(), *strategy)
+    monitor = None
+    if track_improvement:
+        monitor = ImprovementMonitor(routing, shuffled_distance, shuffled_cooking,
+                                     stall_seconds, target_makespan, line_starts).attach(manager)
+    solution = solve_with_initial_routes(manager, routing, search_parameters, initial_routes)
+    routes = extract_routes(manager, routing, solution) if solution else None
+    trace = []
+    if monitor is not None:
+        # 워커는 노드 순서만 돌려주므로 모델 복원 없이 더 나은 쪽을 고름
+        routes = monitor.better_routes(routes) or routes
+        trace = monitor.trace
+    if routes is None:
+        return None, trace
+
+    return [[int(perm[node]) for node in route] for route in routes], trace
+
+# 4-2. 드라이버 : 전략 포트폴리오를 프로세스 풀에서 동시에 돌리고 Makespan이 가장 작은 해 선택
+def solve_portfolio(distance_matrix: np.ndarray,
+                    cooking_vector: np.ndarray,
+                    num_lines: int,
+                    line_capacity: Sequence[int],
+                    time_limit: float,
+                    num_workers: Optional[int] = None,
+                    portfolio: Sequence[Tuple[str, str]] = DEFAULT_PORTFOLIO,
+                    initial_routes: Optional[List[List[int]]] = None,
+                    track_improvement: bool = False,
+                    stall_seconds: Optional[float] = None,
+                    target_makespan: Optional[int] = None,
+                    line_starts: Optional[Sequence[int]] = None,
+                    node_lines: Optional[Dict[int, List[int]]] = None) -> Tuple[Optional[List[List[int]]], List[Dict[str, Any]], List[Tuple[float, int]]]:
+    """
+    모든 워커가 time_limit 초의 같은 벽시계 예산을 공유 (동시에 시작해 같은 시각에 종료)
+    initial_routes가 주어지면 첫 번째 워커만 그 해에서 출발하고 나머지는 처음부터 탐색
+    track_improvement=True 이면 각 워커에 ImprovementMonitor를 붙여 개선 곡선을 기록하고
+    stall_seconds / target_makespan 조건으로 워커별 탐색을 조기 종료
+    line_starts / node_lines 는 build_routing_model 과 같음 (line_model_inputs 결과)
+
+    Returns:
+    --------
+    (best_routes, runs, best_trace) : 가장 좋은 해의 라인별 노드 순서 (없으면 None),
+                                      워커별 {'strategy', 'seed', 'dropped', 'makespan'} 기록,
+                                      가장 좋은 해를 낸 워커의 개선 곡선 (track_improvement=False면 빈 리스트)
+    """
+    distance_matrix = np.asarray(distance_matrix)
+    cooking_vector = np.asarray(cooking_vector)
+    num_workers = num_workers or os.cpu_count() or 1
+    num_dishes = len(distance_matrix) - num_lines
+    deadline = time.time() + time_limit
+
+    jobs = [(portfolio[i % len(portfolio)], i // len(portfolio)) for i in range(num_workers)]
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = [
+            executor.submit(_solve_portfolio_worker, distance_matrix, cooking_vector,
+                            num_lines, list(line_capacity), strategy, seed, deadline,
+                            initial_routes if i == 0 else None,
+                            track_improvement, stall_seconds, target_makespan,
+                            line_starts, node_lines)
+            for i, (strategy, seed) in enumerate(jobs)
+        ]
+        results = [future.result() for future in futures]
+
+    best_routes = None
+    best_trace = []
+    best_key = None
+    runs = []
+    for (strategy, seed), (routes, trace) in zip(jobs, results):
+        if routes is None:
+            runs.append({'strategy': strategy, 'seed': seed, 'dropped': None, 'makespan': None})
+            continue
+
+        # 미배정 반찬 수가 적은 해 우선, 같으면 Makespan이 작은 해
+        dropped = num_dishes - sum(len(route) for route in routes)
+        makespan = max(evaluate_routes(routes, distance_matrix, cooking_vector, line_starts))
+        runs.append({'strategy': strategy, 'seed': seed, 'dropped': dropped, 'makespan': makespan})
+
+        if best_key is None or (dropped, makespan) < best_key:
+            best_key = (dropped, makespan)
+            best_routes = routes
+            best_trace = trace
+
+    return best_routes, runs, best_trace
+
+
+## 5. 반찬 생산 VRP 실행 흐름 (Vrp.py / opti_vrp.py 공용) ##
+# =====================================================================
+# 5-1. 전환시간 DataFrame -> 솔버 단위 거리 행렬 (depot 행/열은 0 : 첫/마지막 반찬에는 전환시간 없음)
+def build_distance_matrix(changeover_matrix: pd.DataFrame,
+                          ordered_dishes: List[str],
+                          num_lines: int,
+                          time_resolution: int,
+                          unknown_changeover: float = 3) -> np.ndarray:
+    num_nodes = num_lines + len(ordered_dishes)
+    distance_matrix = np.zeros((num_nodes, num_nodes), dtype=int)
+
+    # 주문된 반찬 순서로 한 번에 재색인 (매트릭스에 없는 반찬은 unknown_changeover 분)
+    changeover_block = changeover_matrix.reindex(
+        index=ordered_dishes, columns=ordered_dishes, fill_value=unknown_changeover
+    )
+    # 솔버는 정수만 다루므로 분 단위 시간에 time_resolution을 곱해 반올림 (int()로 자르면 2.9분도 2분이 됨)
+    distance_matrix[num_lines:, num_lines:] = np.rint(
+        changeover_block.to_numpy(dtype=float) * time_resolution
+    ).astype(int)
+    return distance_matrix
+
+# 5-2. 모델 구성 -> 탐색 (병렬 포트폴리오 또는 단일 탐색 + 개선 모니터) -> 개선 곡선 변환
+def solve_production_vrp(changeover_matrix: pd.DataFrame,
+                         ordered_dishes: List[str],
+                         cooking_times: Dict[str, float],
+                         line_config: LineConfig,
+                         max_time: float,
+                         time_resolution: int,
+                         time_limit: float,
+                         num_workers: int = 1,
+                         initial_schedule: Optional[Dict[Any, List[str]]] = None,
+                         stall_seconds: Optional[float] = None,
+                         target_makespan: Optional[float] = None,
+                         track_improvement: bool = False,
+                         unknown_changeover: float = 3) -> Tuple[Optional[Any], Optional[Any], Optional[Any], List[Tuple[float, float]]]:
+    """
+    Vrp.solve_dish_production_vrp / opti_vrp.solve_dish_production_vrp 의 공통 탐색 흐름
+
+    - num_workers 가 2 이상이면 solve_portfolio 로 여러 전략을 동시에 탐색하고 가장 좋은 해를 모델로 복원
+    - initial_schedule : 초기해로 쓸 {라인: [반찬명, ...]} 스케줄 (없으면 처음부터 탐색)
+    - stall_seconds / target_makespan(분) / track_improvement 중 하나라도 주면 ImprovementMonitor 사용
+
+    Returns:
+    --------
+    (manager, routing, solution, trace) : 해를 못 찾으면 solution 은 None,
+                                          trace 는 개선 곡선 [(경과 초, Makespan 분), ...]
+    """
+    num_lines = line_config.num_lines
+    distance_matrix = build_distance_matrix(changeover_matrix, ordered_dishes, num_lines,
+                                            time_resolution, unknown_changeover)
+
+    # 노드별 시간 소모량 (라인 속도 반영), 라인별 시간 한계 / 가동 시작 / 반찬별 허용 라인
+    cooking_vector, line_capacity, line_starts, node_lines = line_model_inputs(
+        line_config, ordered_dishes, cooking_times, max_time, time_resolution
+    )
+    model_inputs = (distance_matrix, cooking_vector, num_lines, line_capacity, line_starts, node_lines)
+    search_parameters = make_search_parameters(time_limit)
+
+    initial_routes = None
+    if initial_schedule is not None:
+        initial_routes = schedule_to_routes(initial_schedule, ordered_dishes, num_lines)
+
+    track_improvement = track_improvement or stall_seconds is not None or target_makespan is not None
+    target_units = None if target_makespan is None else int(target_makespan * time_resolution)
+    trace = []
+
+    if num_workers > 1:
+        # 여러 전략을 프로세스별로 동시에 탐색하고 Makespan이 가장 작은 해를 새 모델로 복원
+        best_routes, runs, trace = solve_portfolio(
+            distance_matrix, cooking_vector, num_lines, line_capacity,
+            time_limit, num_workers, initial_routes=initial_routes,
+            track_improvement=track_improvement, stall_seconds=stall_seconds,
+            target_makespan=target_units, line_starts=line_starts, node_lines=node_lines
+        )
+        for run in runs:
+            makespan = '-' if run['makespan'] is None else f"{run['makespan'] / time_resolution:.1f}분"
+            print(f"  {run['strategy'][0]} + {run['strategy'][1]} (seed {run['seed']}): {makespan}")
+        manager = routing = solution = None
+        if best_routes is not None:
+            manager, routing, solution = restore_routes(best_routes, search_parameters, *model_inputs)
+    else:
+        manager, routing = build_routing_model(*model_inputs)
+        monitor = None
+        if track_improvement:
+            monitor = ImprovementMonitor(routing, distance_matrix, cooking_vector,
+                                         stall_seconds, target_units, line_starts).attach(manager)
+        solution = solve_with_initial_routes(manager, routing, search_parameters, initial_routes)
+        if monitor is not None:
+            # 탐색 중 본 해 중 실제 Makespan이 더 작은 해가 있으면 새 모델에 복원해 최종 해로 사용
+            better = monitor.better_routes(extract_routes(manager, routing, solution) if solution else None)
+            if better is not None:
+                restored = restore_routes(better, search_parameters, *model_inputs)
+                if restored[2]:
+                    manager, routing, solution = restored
+            trace = monitor.trace
+
+    # 개선 곡선 : 솔버 단위 -> 분
+    trace = [(elapsed, makespan / time_resolution) for elapsed, makespan in trace]
+    if trace:
+        print(f"개선 기록 {len(trace)}건 / 마지막 개선: {trace[-1][0]:.1f}초 ({trace[-1][1]:.1f}분)")
+    return manager, routing, solution, trace
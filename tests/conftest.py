@@ -0,0 +1,52 @@
+# 회귀 테스트 공용 설정 : 저장소 루트를 import 경로에 넣고, 알고리즘 스크립트를 모듈로 불러옴
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def load_script(pattern: str, name: str):
+    """알고리즘 폴더의 스크립트(파일명에 공백/따옴표가 있어도)를 모듈로 로딩"""
+    path = next(ROOT.glob(pattern))
+    sys.path.insert(0, os.fspath(path.parent))
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def network():
+    """지안 네트워크 모듈 (모듈 최상단에서 쓰는 시각화/임베딩 패키지가 없으면 건너뜀)"""
+    for package in ("matplotlib", "sentence_transformers", "sklearn"):
+        pytest.importorskip(package)
+    return load_script("*/0827*network*.py", "network_module")
+
+
+def random_instance(seed: int, n_products: int = 30, n_orders: int = 60, n_lines: int = 4):
+    """
+    무작위 (orders, solution, cooking_times, changeover_matrix)
+
+    - 전환시간 매트릭스에 없는 상품 2개 (기본 전환시간 경로)
+    - 조리시간이 없는 상품 3개 (기본 조리시간 경로)
+    """
+    rng = np.random.default_rng(seed)
+    products = [f"반찬{i:02d}" for i in range(n_products)]
+    in_matrix = products[:-2]
+    changeover_matrix = pd.DataFrame(rng.integers(1, 20, size=(len(in_matrix), len(in_matrix))).astype(float),
+                                     index=in_matrix, columns=in_matrix)
+    cooking_times = {p: float(rng.integers(1, 15)) for p in products[:-3]}
+    orders = {
+        f"주문{k}": {'products': [str(p) for p in rng.choice(products, size=rng.integers(1, 6), replace=False)]}
+        for k in range(n_orders)
+    }
+    shuffled = [products[i] for i in rng.permutation(n_products)]
+    solution = {f"line_{i + 1}": shuffled[i::n_lines] for i in range(n_lines)}
+    return orders, solution, cooking_times, changeover_matrix
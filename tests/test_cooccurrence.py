@@ -0,0 +1,134 @@
+# 동시주문 통계 : 희소 행렬 / 증분 인덱스 == 주문별 이중 루프로 세던 원래 방식
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from common.cooccurrence import CooccurrenceIndex, build_cooccurrence, build_incidence_matrix
+
+
+def _random_orders(seed, n_orders=300, n_dishes=25, duplicates=False):
+    rng = np.random.default_rng(seed)
+    dishes = [f"반찬{i:02d}" for i in range(n_dishes)]
+    rows = []
+    for order_id in range(n_orders):
+        size = int(rng.integers(1, 7))
+        for dish in rng.choice(dishes, size=size, replace=duplicates):
+            rows.append((f"주문{order_id}", str(dish)))
+    return pd.DataFrame(rows, columns=['주문번호', '상품명'])
+
+
+def _legacy_pair_counts(df):
+    """네트워크 모듈 build_product_connections 의 원래 이중 루프 ({'A|B': 횟수}, 최대 연결, 연결 합)"""
+    product_connections = defaultdict(int)
+    for _, group in df.groupby('주문번호'):
+        names = group['상품명'].tolist()
+        for i in range(len(names)):
+            for j in range(i + 1, len(names)):
+                product1, product2 = sorted([names[i], names[j]])
+                product_connections[f"{product1}|{product2}"] += 1
+    max_connections, total_connections = {}, {}
+    for product in df['상품명'].unique():
+        counts = [c for key, c in product_connections.items() if product in key.split('|')]
+        max_connections[product] = max(counts, default=0)
+        total_connections[product] = sum(counts)
+    return dict(product_connections), max_connections, total_connections
+
+
+def _legacy_matrix(df, dish_list):
+    """asso.make_cooccurrence_matrix 의 원래 이중 루프"""
+    idx = {dish: i for i, dish in enumerate(dish_list)}
+    mat = np.zeros((len(dish_list), len(dish_list)), dtype=int)
+    for _, group in df.groupby('주문번호'):
+        basket = group['상품명'].tolist()
+        for i in range(len(basket)):
+            for j in range(i + 1, len(basket)):
+                mat[idx[basket[i]], idx[basket[j]]] += 1
+                mat[idx[basket[j]], idx[basket[i]]] += 1
+    return mat
+
+
+def _stats(index):
+    return index.pair_counts, index.order_frequency, index.total_connection, index.max_connections()
+
+
+def test_add_orders_counts_added_and_updated_orders():
+    index = CooccurrenceIndex.from_orders(pd.DataFrame({'주문번호': [1, 1, 2], '상품명': ['A', 'B', 'A']}))
+    # 주문 1 갱신 + 주문 3 추가
+    assert index.add_orders(pd.DataFrame({'주문번호': [1, 3, 3], '상품명': ['C', 'A', 'C']})) == 2
+    # 갱신만 있는 배치
+    assert index.add_orders(pd.DataFrame({'주문번호': [2], '상품명': ['B']})) == 1
+    assert index.orders == {'1': ['A', 'B', 'C'], '2': ['A', 'B'], '3': ['A', 'C']}
+
+
+def test_add_update_remove_matches_rebuild():
+    first = pd.DataFrame({'주문번호': [1, 1, 2, 2, 2], '상품명': ['A', 'B', 'A', 'C', 'D']})
+    batch = pd.DataFrame({'주문번호': [2, 3, 3, 4], '상품명': ['B', 'B', 'C', 'D']})
+    index = CooccurrenceIndex.from_orders(first)
+    index.add_orders(batch)
+    assert _stats(index) == _stats(CooccurrenceIndex.from_orders(pd.concat([first, batch])))
+
+    assert index.remove_orders([2, 'missing']) == 1
+    remaining = pd.concat([first, batch])
+    expected = CooccurrenceIndex.from_orders(remaining[remaining['주문번호'] != 2])
+    assert index.orders == expected.orders
+    assert _stats(index) == _stats(expected)
+
+    index.remove_orders(['1', '3', '4'])
+    assert len(index) == 0
+    assert _stats(index) == ({}, {}, {}, {})
+
+
+def test_save_load_roundtrip(tmp_path):
+    index = CooccurrenceIndex.from_orders(pd.DataFrame({'주문번호': [1, 1, 2, 2], '상품명': ['A', 'B', 'A', 'B']}))
+    path = tmp_path / "index.json"
+    index.save(str(path))
+    loaded = CooccurrenceIndex.load(str(path))
+    assert loaded.orders == index.orders
+    assert _stats(loaded) == _stats(index)
+    assert loaded.pair_count('B', 'A') == 2
+
+
+def test_missing_order_or_dish_rows_are_ignored():
+    df = pd.DataFrame({'주문번호': ['o1', 'o1', None, 'o2', 'o2'], '상품명': ['A', 'B', 'A', 'B', None]})
+    X, order_ids, dish_list = build_incidence_matrix(df)
+    assert dish_list == ['A', 'B']
+    assert order_ids.tolist() == ['o1', 'o2']
+    assert X.toarray().tolist() == [[1, 1], [0, 1]]
+
+    index = CooccurrenceIndex.from_orders(df)
+    assert index.orders == {'o1': ['A', 'B'], 'o2': ['B']}
+    assert index.pair_counts == {('A', 'B'): 1}
+    assert index.order_frequency == {'A': 1, 'B': 2}
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_cooccurrence_matrix_matches_legacy_loop(seed):
+    df = _random_orders(seed, duplicates=True)
+    co, dish_list = build_cooccurrence(df)
+    expected = _legacy_matrix(df, dish_list)
+    np.fill_diagonal(expected, 0)                          # 같은 상품끼리의 쌍은 대각성분 (희소 행렬은 0)
+    assert (co.toarray() == expected).all()
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_index_matches_legacy_pair_counts(seed):
+    df = _random_orders(seed)
+    index = CooccurrenceIndex.from_orders(df)
+    products = df['상품명'].unique().tolist()
+    assert index.connection_stats(products) == _legacy_pair_counts(df)
+    assert index.order_frequency == df.groupby('상품명')['주문번호'].nunique().to_dict()
+
+
+def test_incremental_batches_match_legacy_pair_counts():
+    df = _random_orders(5)
+    index = CooccurrenceIndex()
+    for batch in np.array_split(np.arange(len(df)), 4):           # 배치 경계에서 주문이 나뉘어도 갱신으로 이어붙임
+        index.add_orders(df.iloc[batch])
+    assert index.connection_stats(df['상품명'].unique().tolist()) == _legacy_pair_counts(df)
+
+    removed = [f"주문{k}" for k in range(0, 300, 3)]
+    index.remove_orders(removed)
+    rest = df[~df['주문번호'].isin(removed)]
+    assert index.connection_stats(rest['상품명'].unique().tolist()) == _legacy_pair_counts(rest)
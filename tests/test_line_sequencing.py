@@ -0,0 +1,46 @@
+# 라인 내 생산순서 : Held-Karp 는 전수 탐색과 같은 최소 전환시간, 지역 개선은 입력보다 나빠지지 않음
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from common.line_sequencing import held_karp, improve, nearest_neighbor, optimize_sequence, path_cost, sequence_products
+
+
+def _brute_force_cost(matrix):
+    return min(path_cost(matrix, perm) for perm in itertools.permutations(range(len(matrix))))
+
+
+@pytest.mark.parametrize("n", range(1, 8))
+def test_held_karp_is_optimal(n):
+    rng = np.random.default_rng(n)
+    for _ in range(5):
+        matrix = rng.integers(0, 30, size=(n, n)).astype(float)   # 비대칭 전환시간
+        seq = held_karp(matrix)
+        assert sorted(seq) == list(range(n))
+        assert path_cost(matrix, seq) == pytest.approx(_brute_force_cost(matrix))
+
+
+def test_local_search_never_worse_than_input():
+    rng = np.random.default_rng(0)
+    for n in (12, 25, 40):
+        matrix = rng.uniform(0, 30, size=(n, n))
+        start = list(rng.permutation(n))
+        improved = improve(matrix, start)
+        assert sorted(improved) == list(range(n))
+        assert path_cost(matrix, improved) <= path_cost(matrix, start) + 1e-9
+
+        seq, cost = optimize_sequence(matrix, start)
+        assert sorted(seq) == list(range(n))
+        assert cost == pytest.approx(path_cost(matrix, seq))
+        assert cost <= min(path_cost(matrix, start), path_cost(matrix, nearest_neighbor(matrix))) + 1e-9
+
+
+def test_sequence_products_keeps_products():
+    rng = np.random.default_rng(1)
+    names = [f"반찬{i}" for i in range(8)]
+    changeover = pd.DataFrame(rng.integers(1, 20, size=(6, 6)).astype(float), index=names[:6], columns=names[:6])
+    products = names[::-1]                                        # 매트릭스에 없는 상품 2개 포함
+    ordered = sequence_products(changeover, products, default=4)
+    assert sorted(ordered) == sorted(products)
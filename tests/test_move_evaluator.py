@@ -0,0 +1,77 @@
+# MoveEvaluator 증분 평가 == 네트워크 모듈 calculate_objective_function (전체 재계산)
+import copy
+import random
+
+import pytest
+
+from common.line_config import LineConfig
+from common.move_evaluator import MoveEvaluator
+from common.order_completion import OrderIncidence
+from conftest import random_instance
+
+
+def _random_moves(network, evaluator, orders, cooking_times, changeover_matrix, line_config, seed, steps=200):
+    """무작위 이동/순서 변경마다 평가값과 전체 재계산 값 비교 (일부는 실제로 적용)"""
+    rnd = random.Random(seed)
+    current = evaluator.state.to_dict()
+    lines = list(current)
+
+    def reference(solution):
+        return network.calculate_objective_function(orders, solution, cooking_times, changeover_matrix,
+                                                    line_config=line_config)
+
+    for step in range(steps):
+        source, target = rnd.choice(lines), rnd.choice(lines)
+        if len(current[source]) <= 1:
+            continue
+        index = rnd.randrange(len(current[source]))
+        position = rnd.randrange(len(current[target]) + 1)
+        moved = copy.deepcopy(current)
+        moved[target].insert(position, moved[source].pop(index))
+
+        expected = reference(moved)
+        assert evaluator.evaluate_move(source, index, target, position) == pytest.approx(expected, rel=1e-12)
+        assert evaluator.state.to_dict() == current                  # 평가만 하면 해는 그대로
+        if step % 3 == 0:
+            assert evaluator.apply_move(source, index, target, position) == pytest.approx(expected, rel=1e-12)
+            assert evaluator.state.to_dict() == moved
+            current = moved
+
+        if step % 7 == 0:
+            line_id = rnd.choice(lines)
+            order = current[line_id][:]
+            rnd.shuffle(order)
+            reordered = dict(current, **{line_id: order})
+            expected = reference(reordered)
+            assert evaluator.evaluate_line(line_id, order) == pytest.approx(expected, rel=1e-12)
+            assert evaluator.set_line(line_id, order) == pytest.approx(expected, rel=1e-12)
+            current = reordered
+
+        assert evaluator.objective() == pytest.approx(reference(current), rel=1e-12)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_random_moves_match_full_objective(network, seed):
+    orders, solution, cooking_times, changeover_matrix = random_instance(seed)
+    evaluator = MoveEvaluator(orders, copy.deepcopy(solution), cooking_times, changeover_matrix)
+    assert evaluator.objective() == pytest.approx(
+        network.calculate_objective_function(orders, solution, cooking_times, changeover_matrix), rel=1e-12)
+    _random_moves(network, evaluator, orders, cooking_times, changeover_matrix, None, seed)
+
+
+def test_random_moves_match_full_objective_with_line_config(network):
+    orders, solution, cooking_times, changeover_matrix = random_instance(3)
+    line_config = LineConfig(4, speeds=[1, 2, 1, 0.5], windows=[(0, None), (30, None), (0, 200), (10, None)])
+    evaluator = MoveEvaluator(orders, copy.deepcopy(solution), cooking_times, changeover_matrix,
+                              line_config=line_config)
+    _random_moves(network, evaluator, orders, cooking_times, changeover_matrix, line_config, seed=3)
+
+
+def test_shared_incidence_matches_own(network):
+    orders, solution, cooking_times, changeover_matrix = random_instance(4)
+    incidence = OrderIncidence.from_baskets(orders)
+    shared = MoveEvaluator(orders, copy.deepcopy(solution), cooking_times, changeover_matrix, incidence=incidence)
+    own = MoveEvaluator(orders, copy.deepcopy(solution), cooking_times, changeover_matrix)
+    assert shared.incidence is incidence
+    assert shared.objective() == own.objective() == network.calculate_objective_function(
+        orders, solution, cooking_times, changeover_matrix, incidence=incidence)
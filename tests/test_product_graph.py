@@ -0,0 +1,54 @@
+# 상품 네트워크 : ProductGraph 최대 연결 / 연결 합 == 네트워크 모듈의 원래 'A|B' 딕셔너리 루프
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from common.product_graph import ProductGraph
+
+
+def _legacy_connection_stats(product_connections, all_products):
+    """build_product_connections 의 원래 상품별 루프 (연결 딕셔너리를 매번 전부 훑음)"""
+    product_max_connections, product_total_connections = {}, {}
+    for product in all_products:
+        max_count = 0
+        total_count = 0
+        for connection_key, count in product_connections.items():
+            product1, product2 = connection_key.split('|')
+            if product1 == product or product2 == product:
+                max_count = max(max_count, count)
+                total_count += count
+        product_max_connections[product] = max_count
+        product_total_connections[product] = total_count
+    return product_max_connections, product_total_connections
+
+
+def _connections(seed, n_orders=200, n_products=20):
+    """같은 상품이 한 주문에 두 번 들어가는 경우('A|A')를 포함한 {'A|B': 횟수}"""
+    rng = np.random.default_rng(seed)
+    products = [f"반찬{i:02d}" for i in range(n_products)]
+    product_connections = defaultdict(int)
+    for _ in range(n_orders):
+        names = [str(p) for p in rng.choice(products, size=int(rng.integers(1, 6)), replace=True)]
+        for i in range(len(names)):
+            for j in range(i + 1, len(names)):
+                product1, product2 = sorted([names[i], names[j]])
+                product_connections[f"{product1}|{product2}"] += 1
+    return dict(product_connections), products
+
+
+def test_self_pair_counted_once():
+    graph = ProductGraph(['A', 'B'], [('A', 'A', 3), ('A', 'B', 2)])
+    assert graph.total_connections() == {'A': 5, 'B': 2}
+    assert graph.max_connections() == {'A': 3, 'B': 2}
+    assert graph.neighbor_weights('A') == {'A': 3, 'B': 2}
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_stats_match_legacy_loop(seed):
+    product_connections, products = _connections(seed)
+    assert any(a == b for a, b in (key.split('|') for key in product_connections))
+    graph = ProductGraph.from_connections(product_connections, products)
+    max_connections, total_connections = _legacy_connection_stats(product_connections, products)
+    assert graph.max_connections() == max_connections
+    assert graph.total_connections() == total_connections
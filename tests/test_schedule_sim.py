@@ -0,0 +1,88 @@
+# 라인 스케줄 시뮬레이터 == 알고리즘들이 쓰던 라인별 파이썬 루프
+import random
+
+import numpy as np
+import pytest
+
+from common import schedule_sim
+from common.changeover_table import ChangeoverTable
+from common.schedule_sim import simulate_schedule
+from conftest import random_instance
+
+
+def _legacy_line_schedule(products, cooking_times, changeover_matrix):
+    """네트워크 모듈 calculate_line_schedule / main._build_start_end_minutes 의 원래 루프"""
+    starts, ends = [], []
+    current_time = 0
+    for i, product in enumerate(products):
+        start_time = current_time
+        if i > 0:
+            prev_product = products[i - 1]
+            if prev_product in changeover_matrix.index and product in changeover_matrix.columns:
+                start_time += changeover_matrix.loc[prev_product, product]
+            else:
+                start_time += 4
+        completion_time = start_time + cooking_times.get(product, 3)
+        starts.append(start_time)
+        ends.append(completion_time)
+        current_time = completion_time
+    return starts, ends
+
+
+def _legacy_track_completion(products, cooking_times, changeover_matrix):
+    """main.track_order_completion_30min 의 원래 루프 (조리 후 다음 상품으로의 전환까지 더한 시점)"""
+    completion_times = []
+    current_time = 0
+    for i, product in enumerate(products):
+        current_time += cooking_times.get(product, 3)
+        if i < len(products) - 1:
+            next_product = products[i + 1]
+            if product in changeover_matrix.index and next_product in changeover_matrix.columns:
+                current_time += changeover_matrix.loc[product, next_product]
+            else:
+                current_time += 4
+        completion_times.append(current_time)
+    return completion_times
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("as_table", [False, True])
+def test_simulate_schedule_matches_legacy_loop(seed, as_table):
+    _, solution, cooking_times, changeover_matrix = random_instance(seed)
+    solution["line_empty"] = []
+    changeover = ChangeoverTable.from_frame(changeover_matrix) if as_table else changeover_matrix
+    line_times = simulate_schedule(solution, cooking_times, changeover, default_changeover=4, default_cooking_time=3)
+    assert list(line_times) == list(solution)
+    for line_id, products in solution.items():
+        starts, ends = line_times[line_id]
+        legacy_starts, legacy_ends = _legacy_line_schedule(products, cooking_times, changeover_matrix)
+        assert starts.tolist() == legacy_starts                 # 순차 덧셈이라 값이 정확히 같음
+        assert ends.tolist() == legacy_ends
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_next_start_matches_legacy_completion_rule(seed):
+    """다음 상품 시작 (마지막은 조리 종료) == track_order_completion_30min 의 원래 완료시간"""
+    _, solution, cooking_times, changeover_matrix = random_instance(seed)
+    line_times = simulate_schedule(solution, cooking_times, changeover_matrix, default_changeover=4)
+    for line_id, products in solution.items():
+        starts, ends = line_times[line_id]
+        assert starts[1:].tolist() + ends[-1:].tolist() == _legacy_track_completion(
+            products, cooking_times, changeover_matrix)
+
+
+def test_numpy_path_matches_loop():
+    """numba 가 없을 때 쓰는 cumsum 경로 == 파이썬 루프 (라인 시작시각 포함)"""
+    rnd = random.Random(0)
+    lengths = [rnd.randrange(0, 15) for _ in range(7)]
+    indptr = np.concatenate(([0], np.cumsum(lengths))).astype(np.intp)
+    changes = np.array([rnd.uniform(0, 20) for _ in range(indptr[-1])])
+    cooks = np.array([rnd.uniform(1, 10) for _ in range(indptr[-1])])
+    offsets = np.array([rnd.uniform(0, 60) for _ in lengths])
+
+    expected = np.zeros(len(cooks)), np.zeros(len(cooks))
+    schedule_sim._accumulate_loop(changes, cooks, indptr, offsets, *expected)
+    result = np.zeros(len(cooks)), np.zeros(len(cooks))
+    schedule_sim._accumulate_numpy(changes, cooks, indptr, offsets, *result)
+    assert result[0].tolist() == expected[0].tolist()
+    assert result[1].tolist() == expected[1].tolist()
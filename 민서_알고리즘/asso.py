@@ -1,8 +1,16 @@
-import pandas as pd
+import os
+import sys
 import numpy as np
 import sklearn
 from sklearn.cluster import AgglomerativeClustering
-import opti_vrp
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.changeover_table import ChangeoverTable
+from common.cooccurrence import (baskets_to_incidence, build_cooccurrence,
+                                 cooccurrence_from_incidence, cooccurrence_to_frame)
+from common.cooking_times import COOKING_TIMES
+from common.line_config import as_line_config
+from common.line_sequencing import sequence_products
 
 
 # 1. 주문별 basket 생성 함수
@@ -14,21 +22,29 @@ def make_baskets_from_orders(df):
     return baskets
 
 # 2. 동시주문 행렬 생성 함수 = 동시주문 몇번 들어갔는지
-def make_cooccurrence_matrix(baskets, dish_list):
+def make_cooccurrence_matrix(baskets, dish_list, sparse=False):
     """
     상품별 동시주문(연관성) 행렬 생성
-    (dish_list 순서대로 square matrix)
-    """
-    idx = {dish: i for i, dish in enumerate(dish_list)}
-    mat = np.zeros((len(dish_list), len(dish_list)), dtype=int)
-    for basket in baskets:
-        for i in range(len(basket)):
-            for j in range(i+1, len(basket)):
-                a, b = basket[i], basket[j]
-                if a in idx and b in idx:
-                    mat[idx[a], idx[b]] += 1
-                    mat[idx[b], idx[a]] += 1
-    return pd.DataFrame(mat, index=dish_list, columns=dish_list)
+    (dish_list 순서대로 square matrix, 대각성분 0)
+
+    basket x 상품 희소 행렬 X 를 만들고 X.T @ X 로 계산
+    sparse=True 면 pandas sparse DataFrame 으로 반환 (메모리 ∝ 0이 아닌 원소 수)
+    """
+    co = cooccurrence_from_incidence(baskets_to_incidence(baskets, dish_list))
+    return cooccurrence_to_frame(co, dish_list, sparse)
+
+# 2-1. 주문 데이터에서 바로 동시주문 행렬 생성 (basket 리스트를 만들지 않음)
+def make_cooccurrence_matrix_from_orders(df, dish_list=None, sparse=False, index=None):
+    """
+    주문번호 x 상품명 희소 행렬로 동시주문 행렬 생성
+    dish_list 가 없으면 상품명 정렬 순서
+
+    index(CooccurrenceIndex)를 주면 주문 전체를 다시 세지 않고 인덱스에 누적된 값을 사용
+    """
+    if index is not None:
+        return index.to_frame(dish_list if dish_list is not None else sorted(df['상품명'].unique()), sparse)
+    co, dish_list = build_cooccurrence(df, dish_list)
+    return cooccurrence_to_frame(co, dish_list, sparse)
 
 # 3. 클러스터링 함수
 def cluster_dishes(co_mat, n_clusters=8):
@@ -59,9 +75,8 @@ def production_line_clustering(df, n_lines):
     """
     주문 데이터에서 8개 라인별 생산계획(상품 그룹) 도출
     """
-    baskets = make_baskets_from_orders(df)
     dish_list = sorted(df['상품명'].unique())
-    co_mat = make_cooccurrence_matrix(baskets, dish_list)
+    co_mat = make_cooccurrence_matrix_from_orders(df, dish_list)
     groups = cluster_dishes(co_mat, n_clusters=n_lines)
     #print_production_clusters(groups)
     return groups
@@ -72,12 +87,12 @@ def assign_parallel_slots_balanced(df, n_lines, return_makespan=False):
 
     # 상품 목록, 연관성 행렬 생성
     dish_list = sorted(df['상품명'].unique())
-    # 주문
-    baskets = make_baskets_from_orders(df)
     # 상품별 동시주문(연관성) 행ㅕㄹ 생성
-    co_mat = make_cooccurrence_matrix(baskets, dish_list)
+    co_mat = make_cooccurrence_matrix_from_orders(df, dish_list)
     # 각 상품별 총 수량
     dish_quantity = df.groupby('상품명')['수량'].sum().to_dict()
+    # 각 상품별 총 조리시간 (한 번에 계산)
+    cook_time = COOKING_TIMES.cooking_time_map(dish_quantity)
     assigned = set()
     slots = []
     # 라인당 들어갈 상품 수
@@ -96,8 +111,7 @@ def assign_parallel_slots_balanced(df, n_lines, return_makespan=False):
         # candidate에서 미배정 상품을 line 수(8) 만큼 병렬 추가
         for cand in candidates:
             if cand not in assigned:
-                q = dish_quantity.get(cand, 1)
-                time = opti_vrp.get_cooking_time(cand, q)
+                time = cook_time[cand]
                 slot.append(cand)
                 slot_times.append(time)
             if len(slot) >= n_lines:
@@ -115,10 +129,9 @@ def assign_parallel_slots_balanced(df, n_lines, return_makespan=False):
 
 
     # ⬇️ 라인별 총 작업시간(누적) 및 makespan 추가 계산
-    dish_quantity = df.groupby('상품명')['수량'].sum().to_dict()
     line_total_time = {}
     for i, seq in line_schedules.items():
-        total_time = sum(opti_vrp.get_cooking_time(d, dish_quantity.get(d,1)) for d in seq)
+        total_time = sum(cook_time[d] for d in seq)
         line_total_time[i] = total_time
     makespan = max(line_total_time.values())  # 가장 늦게 끝나는 라인의 시간
     if return_makespan:
@@ -128,17 +141,23 @@ def assign_parallel_slots_balanced(df, n_lines, return_makespan=False):
 
 
 
-def assign_parallel_by_workload(df, n_lines):
+def assign_parallel_by_workload(df, n_lines, line_config=None):
     """
     동시주문 연관성 기반 우선순위 → 작업량(조리시간) 균등하게 동적 배정
+
+    line_config 를 주면 (common/line_config.py) 라인 수는 설정을 따르고,
+    라인별 작업시간은 가동 시작 시각부터, 조리시간은 라인 속도로 나눠서 누적하며
+    반찬은 허용 카테고리 라인 중 아직 가동 시간대 안인 라인에 배정 (모두 끝났으면 허용 라인 중에서)
     """
-    import opti_vrp
+    line_config = as_line_config(line_config, n_lines)
+    n_lines = line_config.num_lines
 
     # (1) data load
     dish_list = sorted(df['상품명'].unique()) # 생산해야할 모든 반찬 리스트
-    baskets = make_baskets_from_orders(df)  # 각 주문별 반찬 정보 (장바구니 리스트)
-    co_mat = make_cooccurrence_matrix(baskets, dish_list) # 상품별 동시주문 행렬 (두 상품이 한 주문에 같이 들어온 횟수)
+    co_mat = make_cooccurrence_matrix_from_orders(df, dish_list) # 상품별 동시주문 행렬 (두 상품이 한 주문에 같이 들어온 횟수)
     dish_quantity = df.groupby('상품명')['수량'].sum().to_dict() # 각 반찬별 수량
+    cook_time = COOKING_TIMES.cooking_time_map(dish_quantity) # 각 반찬별 총 조리시간 (수량 반영)
+    line_config.check_dishes(dish_list) # 만들 수 있는 라인이 없는 반찬이 있으면 ValueError
 
     # (2) 연관성 seed부터 우선순위 리스트(order) 생성
     remain = set(dish_list) # 남은 반찬
@@ -157,18 +176,19 @@ def assign_parallel_by_workload(df, n_lines):
 
     # (3) 각 상품을 "가장 작업량이 적은 라인"에 동적으로 배정
     line_schedules = {i: [] for i in range(n_lines)} # 각 라인별 반찬 리스트
-    line_time = {i: 0 for i in range(n_lines)} # 각 라인별 배정된 작업의 총 시간
+    line_time = {i: line_config.start(i) for i in range(n_lines)} # 각 라인별 배정된 작업의 총 시간 (가동 시작부터)
     last_dish = {i: None for i in range(n_lines)}  # 각 라인에 마지막으로 넣은 반찬
 
 
     # order에서 반찬 하나씩 꺼내서
     for dish in order:
-        # 해당 dish의 수량 q 계산
-        q = dish_quantity.get(dish, 1)
-        # 해당 dish 완성하는데 걸리는 총 조리시간 t 계산
-        t = opti_vrp.get_cooking_time(dish, q)
+        # 해당 dish 를 만들 수 있는 라인 중 아직 가동 중인 라인 (없으면 만들 수 있는 라인 전체)
+        allowed = line_config.allowed_lines(dish)
+        candidates = [i for i in allowed if line_config.is_open(i, line_time[i])] or allowed
         # 지금까지 작업 시간이 가장 작은 라인 idx 구함
-        idx = min(line_time, key=line_time.get)
+        idx = min(candidates, key=line_time.get)
+        # 해당 dish 를 idx 라인에서 완성하는데 걸리는 총 조리시간 t (라인 속도 반영)
+        t = line_config.cooking_time(idx, cook_time[dish])
         # 해당 idx에 dish 배정
         line_schedules[idx].append(dish)
         # 해당 idx의 time, dish 정보 업데이트
@@ -179,24 +199,33 @@ def assign_parallel_by_workload(df, n_lines):
     return line_schedules, line_time, max(line_time.values())
 
 
-def calc_line_times_with_changeover(line_schedules, dish_quantity, changeover_df):
+def calc_line_times_with_changeover(line_schedules, dish_quantity, changeover_df, line_config=None):
     """
     라인별 생산순서, 수량, 전환시간 기준으로
     [조리시간 + 전환시간] 누적 작업량 계산 (각 라인별)
+
+    changeover_df 는 전환시간 DataFrame 또는 ChangeoverTable
+    line_config 를 주면 line_schedules 순서대로 라인 속도/가동 시작 반영 (라인 종료시각)
     """
-    import opti_vrp
+    changeover = ChangeoverTable.from_matrix(changeover_df)
     line_total_time = {}
-    for i, seq in line_schedules.items():
-        total = 0
-        prev = None
-        for dish in seq:
-            # 1) 조리시간(수량 반영)
-            total += opti_vrp.get_cooking_time(dish, dish_quantity.get(dish,1))
-            # 2) 전환시간 (이전 반찬→현재 반찬)
-            if prev is not None:
-                # changeover_df.loc[이전, 현재]
-                total += changeover_df.loc[prev, dish]
-            prev = dish
+    for k, (i, seq) in enumerate(line_schedules.items()):
+        # 1) 조리시간(수량 반영)
+        total = float(COOKING_TIMES.cooking_times_for(seq, [dish_quantity.get(d, 1) for d in seq]).sum())
+        if line_config is not None:
+            total = line_config.start(k) + line_config.cooking_time(k, total)
+        # 2) 전환시간 (이전 반찬→현재 반찬을 순서대로 합산)
+        total += changeover.cost(changeover.ids(seq))
         line_total_time[i] = total
     makespan = max(line_total_time.values())
     return line_total_time, makespan
+
+
+def sequence_line_schedules(line_schedules, changeover_df):
+    """
+    라인별 생산순서를 총 전환시간이 작아지도록 재배열 (라인 배정은 그대로)
+
+    changeover_df 는 전환시간 DataFrame 또는 ChangeoverTable
+    """
+    changeover = ChangeoverTable.from_matrix(changeover_df)
+    return {i: sequence_products(changeover, seq) for i, seq in line_schedules.items()}
@@ -5,6 +5,8 @@ visualization_mat.py
 전체 상품을 한꺼번에 처리하는 주문 완료량 추적 메인 코드
 """
 
+import os
+import sys
 import pandas as pd
 import asso 
 import opti_vrp
@@ -12,6 +14,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path 
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.changeover_table import ChangeoverTable
+from common.cooking_times import COOKING_TIMES
+from common.order_completion import OrderIncidence
+from common.order_loader import load_orders
+from common.schedule_sim import simulate_schedule
+
 def _build_start_end_minutes(line_schedules, dish_quantity, changeover_df): 
     """
     각 라인에 대해 (시작시간 종료시간)을 분 단위로 계산하는 함수
@@ -27,35 +36,28 @@ def _build_start_end_minutes(line_schedules, dish_quantity, changeover_df):
     - dish_quantity : dict[str, int]
       {제품명: 총 수량} 형태의 생산 수량 정보
         
-    - changeover_df : pd.DataFrame
+    - changeover_df : pd.DataFrame 또는 ChangeoverTable
       제품 간 전환 시간(분) 매트릭스. index=이전 제품, columns=다음 제품.
 
 
     반환: list[dict(line_id, sequence(작업순서), product(제품명)), start_min, end_min, cook_min))] 
     """
 
+    cooking_times = COOKING_TIMES.cooking_time_map(
+        {dish: dish_quantity.get(dish, 1) for seq in line_schedules.values() for dish in seq})
+    line_times = simulate_schedule(line_schedules, cooking_times, changeover_df)
     rows = []
     for line_id, seq in line_schedules.items():
-        prev = None
-        current_end = 0.0
-        for i, dish in enumerate(seq, start=1):
-            cook = float(opti_vrp.get_cooking_time(dish, dish_quantity.get(dish, 1)))
-            if prev is None:
-                start_min = 0.0
-            else:
-                change = float(changeover_df.loc[prev, dish])
-                start_min = current_end + change
-            end_min = start_min + cook
+        starts, ends = line_times[line_id]
+        for i, (dish, start_min, end_min) in enumerate(zip(seq, starts.tolist(), ends.tolist()), start=1):
             rows.append({
                 "line_id": int(line_id),
                 "sequence": i,
                 "product": dish,
-                "cook_min": round(cook, 4),
+                "cook_min": round(cooking_times[dish], 4),
                 "start_min": round(start_min, 4),
                 "end_min": round(end_min, 4),
             })
-            prev = dish
-            current_end = end_min
     return rows
 
 def make_timeline_df(line_schedules, dish_quantity, changeover_df,
@@ -114,26 +116,16 @@ def track_order_completion_30min(line_schedules, dish_quantity, changeover_df, d
     # 🍎 1. 각 라인별 상품 완료 시간 계산 
     # 🍎 상품1 조리시간 + 전환시간 + 상품2 조리시간 + ..... = 라인 총 시간
 
+    cooking_times = COOKING_TIMES.cooking_time_map(
+        {dish: dish_quantity.get(dish, 1) for seq in line_schedules.values() for dish in seq})
+    line_times = simulate_schedule(line_schedules, cooking_times, changeover_df)
     line_completion_times = {}
     
     for line_id, sequence in line_schedules.items():
-        completion_times = []
-        current_time = 0
-        
-        for i, dish in enumerate(sequence):
-            # 조리시간 추가
-            cooking_time = opti_vrp.get_cooking_time(dish, dish_quantity.get(dish, 1))
-            current_time += cooking_time
-            
-            # 전환시간 추가 (다음 상품이 있는 경우)
-            if i < len(sequence) - 1:
-                next_dish = sequence[i + 1]
-                changeover_time = changeover_df.loc[dish, next_dish]
-                current_time += changeover_time
-            
-            completion_times.append((dish, current_time))
-        
-        line_completion_times[line_id] = completion_times
+        # 상품 완료 = 조리 후 다음 상품으로의 전환까지 끝난 시점 (= 다음 상품 시작), 마지막 상품은 조리 종료
+        starts, ends = line_times[line_id]
+        completion_times = starts[1:].tolist() + ends[-1:].tolist()
+        line_completion_times[line_id] = list(zip(sequence, completion_times))
     
     # 🍎 2. 상품별 완료 시간 계산
     # 🍎 콩나물 (1분) + 전환(7분) + 시금치(3분) 일 때
@@ -149,13 +141,9 @@ def track_order_completion_30min(line_schedules, dish_quantity, changeover_df, d
     # 🍎 각 주문 내에 max 상품 완료 시간을 해당 주문의 완료 시간으로 
 
 
-    order_completion_times = []
-    
-    for order_id in df_original['주문번호'].unique():
-        order_items = df_original[df_original['주문번호'] == order_id]['상품명'].tolist()
-        # 해당 주문의 모든 상품이 완료되는 시간 = 가장 늦게 완료되는 상품의 시간
-        order_complete_time = max(dish_completion_map.get(item, 0) for item in order_items)
-        order_completion_times.append((order_id, order_complete_time))
+    # 🍎 주문 -> 상품 incidence 를 한 번 만들고 구간별 max 로 전체 주문을 한 번에 계산
+    incidence = OrderIncidence.from_frame(df_original)
+    order_completion_times = list(incidence.completion_map(dish_completion_map).items())
     
     # 4. 30분 단위 집계 및 출력
     max_time = max(time for _, time in order_completion_times) if order_completion_times else 0
@@ -241,8 +229,12 @@ def visualize_order_completion(completion_data, total_orders, title_prefix=""):
     plt.tight_layout()
     plt.show()
 
-def main():
-    """메인 실행 함수"""
+def main(resequence=False):
+    """
+    메인 실행 함수
+
+    resequence=True 면 라인 배정 뒤 라인별 생산순서를 총 전환시간 기준으로 재배열 (asso.sequence_line_schedules)
+    """
     try:
         print("="*60)
         print("🏭 전체 상품 통합 생산 스케줄링 및 주문 완료량 분석")
@@ -250,7 +242,7 @@ def main():
         
         # 🍎 1. 주문 데이터 불러옴
         print("📋 데이터 로딩 중...")
-        df = pd.read_excel("생산전략_비교_분석데이터_전처리.xlsx")
+        df = load_orders("생산전략_비교_분석데이터_전처리.xlsx")  # 두 번째 실행부터는 Parquet 캐시
         dish_quantity = df.groupby('상품명')['수량'].sum().to_dict()
 
         print(f"전체 주문 수: {len(df['주문번호'].unique())}개")
@@ -270,6 +262,11 @@ def main():
         print("🔧 임베딩 및 전환시간 매트릭스 생성 중...")
         embedding_result = opti_vrp.create_dish_embeddings(df)
         changeover_df = opti_vrp.calculate_changeover_matrix(embedding_result, base_time=5, max_additional_time=20)
+        changeover_df = ChangeoverTable.from_frame(changeover_df)  # 반찬명 -> 정수 id 테이블 (한 번만 변환)
+
+        # 🍎 3-1. (선택) 라인 내 생산순서를 전환시간 기준으로 재배열
+        if resequence:
+            line_schedules = asso.sequence_line_schedules(line_schedules, changeover_df)
 
         # 🍎 4. 조리시간 + 전환시간을 모두 합산해서 계산
         line_total_time, makespan = asso.calc_line_times_with_changeover(line_schedules, dish_quantity, changeover_df)
@@ -1,10 +1,24 @@
+import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from collections import defaultdict
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_distances
-import copy
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.changeover_store import load_changeover_matrix
+from common.changeover_table import ChangeoverTable
+from common.line_config import as_line_config
+from common.cooking_times import COOKING_TIMES
+from common.line_sequencing import sequence_products
+from common.move_evaluator import MoveEvaluator
+from common.order_completion import OrderIncidence
+from common.order_ingest import build_orders_and_products
+from common.order_loader import load_orders
+from common.product_graph import ProductGraph, as_product_graph
+from common.schedule_sim import simulate_schedule
 
 plt.rcParams['font.family'] = 'Malgun Gothic'    # Windows
 # plt.rcParams['font.family'] = 'AppleGothic'    # macOS
@@ -14,133 +28,8 @@ plt.rcParams['axes.unicode_minus'] = False
 
 ### 반찬별 조리시간 ########################################
 def get_dish_cooking_times():
-    cooking_times = {
-        # 무침류 (1-3분)
-        '콩나물무침': 1, '미나리무침': 2, '무생채': 2, '시금치나물 - 90g': 3,
-        '새콤달콤 유채나물무침': 3, '새콤달콤 방풍나물무침': 3, '닭가슴살 두부무침': 3,
-        '새콤달콤 돌나물무침': 2, '새콤달콤 오징어무침': 3, '새콤달콤 오이달래무침': 2,
-        '브로콜리 두부무침 - 100g': 3, '매콤 콩나물무침': 3, '오이부추무침': 2,
-        '참깨소스 시금치무침': 3, '(gs재등록) 닭가슴살 참깨무침': 3, '무말랭이무침': 3,
-        '오징어무말랭이무침 - 130g': 3, '참나물무침 - 80g': 2, '연근참깨무침': 3,
-        '참깨소스 버섯무침 - 100g': 3, '톳두부무침': 3, '가지무침': 3,
-        '숙주나물무침 - 90g': 3, '달래김무침': 2, '새콤 꼬시래기무침': 3,
-        '오이부추무침 - 100g': 2, '참깨두부무침 - 200g': 3, '새콤 오이무생채': 3,
-        '새콤달콤 오징어무침 - 110g': 3, '새콤달콤 도라지무침': 3, '콩나물무침 - 90g': 2,
-        '무생채 - 100g': 2, '파래김무침': 2, '무나물 - 100g': 2,
-        
-        # 김치/절임류 (1-3분)
-        '물김치 - 350g': 2, '백김치 - 350g': 2, '양파고추 장아찌 - 150g': 2,
-        '유자향 오이무피클 - 240g': 2, '깻잎 장아찌': 2, '셀러리 장아찌': 2,
-        '깍두기': 3, '나박김치': 3, '총각김치': 3, '곰취 장아찌': 2, '볶음김치': 3,
-        '볶음김치_대용량': 3,
-        
-        # 국물류 (3-5분)
-        '아이들 된장국': 4, '감자국': 5, '계란국(냉동)': 3, '순한 오징어무국': 5,
-        '시래기 된장국(냉동)': 5, '달래 된장찌개': 4, '근대 된장국(냉동)': 5,
-        '된장찌개': 5, '동태알탕': 5, '맑은 콩나물국(냉동)': 4, '오징어 무국(냉동)': 5,
-        '냉이 된장국(냉동)': 4, '한우 소고기 감자국': 5, '우리콩 강된장찌개': 5,
-        '맑은 순두부찌개': 4, '계란 황태국(냉동)': 4, '오징어찌개': 5,
-        '시금치 된장국(냉동)': 4, '김치콩나물국(냉동)': 5, '한우사골곰탕(냉동) - 600g': 5,
-        '한우 소고기 무국(냉동) - 650g': 5, '한우 소고기 미역국(냉동) - 650g': 5,
-        '맑은 동태국': 5, '콩나물 황태국(냉동)': 4, '배추 된장국(냉동)': 5,
-        
-        # 찌개류 (5-8분)
-        '한돈 돼지김치찌개': 7, '한돈 청국장찌개': 6, '동태찌개': 6,
-        '한돈 돼지돼지 김치찌개_쿠킹박스': 7, '한돈 돼지고추장찌개': 7, '알탕': 8,
-        
-        # 볶음류 (3-5분)
-        '한우 무볶음': 4, '고추장 멸치볶음': 3, '야채 어묵볶음': 4, '느타리버섯볶음 - 90g': 3,
-        '풋마늘 어묵볶음': 4, '애호박볶음': 3, '새우 애호박볶음 - 110g': 4,
-        '한돈 가지볶음': 4, '들깨머위나물볶음': 3, '도라지볶음 - 80g': 3,
-        '감자햄볶음': 4, '느타리버섯볶음': 3, '토마토 계란볶음': 3, '미역줄기볶음': 3,
-        '건곤드레볶음': 4, '건고사리볶음 - 80g': 3, '호두 멸치볶음_대용량': 4,
-        '미역줄기볶음_대용량': 4, '감자채볶음': 3, '건취나물볶음 - 80g': 3,
-        '호두 멸치볶음': 4, '꼴뚜기 간장볶음': 5, '새우오이볶음': 3,
-        '소고기 야채볶음_반조리': 5, '들깨시래기볶음 - 90g': 4, '보리새우 간장볶음': 4,
-        '소고기 우엉볶음': 5, '한우오이볶음': 4, '건가지볶음': 3,
-        '들깨고구마 줄기볶음 - 80g': 3, '한우오이볶음 - 100g': 4,
-        '야채 어묵볶음 - 80g': 4, '감자채볶음 - 80g': 3, '매콤 어묵볶음': 4,
-        '건피마자볶음': 3, '한우 무볶음 - 110g': 4, '감자햄볶음 - 80g': 4,
-        '소고기 우엉볶음 - 80g': 5, '꽈리멸치볶음 - 60g': 3, '호두 멸치볶음 - 60g': 4,
-        '미역줄기볶음 - 60g': 3, '꽈리멸치볶음_대용량': 4, '소고기 가지볶음': 5,
-        '간장소스 어묵볶음': 4, '건호박볶음': 3, '고추장 멸치볶음_대용량': 4,
-        '한돈 냉이 버섯볶음밥 재료': 5, '상하농원 케찹 소세지 야채볶음': 4,
-        '상하농원 햄 어묵볶음': 4,
-        
-        # 제육/고기볶음류 (3-5분)
-        '한돈 매콤 제육볶음_반조리 - 500g': 5, '주꾸미 한돈 제육볶음_반조리': 5,
-        '한돈 김치두루치기_반조리': 5, '한돈 미나리 고추장불고기_반조리': 5,
-        '한돈 대파 제육볶음_반조리': 5, '주꾸미 야채볶음_반조리': 5,
-        '오징어 야채볶음_반조리': 4, '간장 오리 주물럭_반조리': 5,
-        '한돈 콩나물불고기_반조리': 5, '한돈 간장 콩나물불고기_반조리': 5,
-        '한돈 간장불고기_반조리': 4, '오리 주물럭_반조리': 5, '한돈 된장불고기_반조리': 5,
-        '한돈 간장불고기_쿠킹박스': 4, '한돈 매콤 제육볶음_쿠킹박스': 5,
-        '한돈 풋마늘 두루치기_반조리': 5,
-        
-        # 조림류 (3-5분)
-        '메추리알 간장조림': 5, '소고기 장조림 - 180g': 5, '두부조림': 4,
-        '알감자조림': 4, '케찹두부조림': 4, '매콤 닭가슴살 장조림': 5,
-        '메추리알 간장조림_대용량': 5, '깻잎조림_대용량': 3, '소고기 장조림_대용량': 5,
-        '한입 두부간장조림': 4, '검은콩조림': 5, '한입 두부간장조림 - 110g': 4,
-        '표고버섯조림': 5, '케찹두부조림 - 120g': 4, '계란 간장조림': 4,
-        '명란 장조림': 3, '국내산 땅콩조림': 5, '깻잎조림': 3, '간장 감자조림': 5,
-        '마늘쫑 간장조림': 3, '메추리알 간장조림 - 110g': 5, '한우 장조림': 5,
-        '우엉조림 - 100g': 5, '유자견과류조림': 4, '한돈 매콤 안심장조림': 5,
-        '촉촉 간장무조림': 5, '미니새송이버섯조림': 4, '간장 코다리조림': 5,
-        '매콤 코다리조림': 5, '고등어무조림': 5,
-        
-        # 찜류 (5-8분)
-        '꽈리고추찜': 5, '야채 계란찜': 5, '계란찜': 5, '매운돼지갈비찜': 8,
-        '순두부 계란찜': 5, '안동찜닭_반조리': 8,
-        
-        # 전류 (3-5분)
-        '소고기육전과 파채': 5, '참치깻잎전': 5, '냉이전 - 140g': 4, '매생이전': 4,
-        '동태전': 5, '달콤 옥수수전 - 140g': 4, '반달 계란전': 4, '매콤김치전': 5,
-        
-        # 구이류 (3-5분)
-        '간편화덕 고등어 순살구이': 4, '간편화덕 삼치 순살구이': 4,
-        '간편화덕 연어 순살구이': 5, '한돈 너비아니(냉동)': 4, '오븐치킨_반조리(냉동)': 5,
-        '한돈등심 치즈가스_반조리(냉동)': 4, '통등심 수제돈가스_반조리(냉동)': 4,
-        
-        # 밥/주먹밥류 (1-3분)
-        '한돈 주먹밥': 3, '계란 두부소보로 주먹밥': 3, '멸치 주먹밥': 3,
-        '참치마요 주먹밥': 3, '한우 주먹밥': 3, '햇반 발아현미밥': 2, '햇반 백미': 2,
-        
-        # 덮밥류 (1-3분)
-        '한돈 토마토 덮밥': 3, '아이들 두부덮밥': 3, '사색 소보로 덮밥': 3,
-        
-        # 볶음밥 재료 (3-5분)
-        '새우 볶음밥 재료': 4, '닭갈비 볶음밥 재료': 4, '냉이 새우볶음밥 재료': 4,
-        '상하농원 소세지 볶음밥 재료': 4, '감자볶음밥 재료': 4, '한돈 불고기볶음밥 재료': 4,
-        
-        # 비빔밥류 (1-3분)
-        '꼬막비빔밥': 3,
-        
-        # 떡볶이류 (3-5분)
-        '궁중 떡볶이_반조리 - 520g': 5, '우리쌀로 만든 기름떡볶이_반조리': 4,
-        
-        # 불고기/전골류 (5-8분)
-        '뚝배기 불고기_반조리': 7, '서울식 불고기버섯전골_반조리': 8,
-        '한우 파육개장(냉동)': 8, '소불고기_반조리 - 400g': 7,
-        '한우 소불고기_반조리': 8, '모둠버섯 불고기_반조리': 6,
-        
-        # 계란말이 (3-5분)
-        '계란말이': 3, '야채계란말이': 3,
-        
-        # 장류/소스 (1분)
-        '달래장': 1, '맛쌈장': 1, '양배추와 맛쌈장': 1, '사랑담은 돈가스소스': 1,
-        
-        # 기타 특수 요리 (3분)
-        '옥수수 버무리': 3, '상하농원 햄 메추리알 케찹볶음': 3, '무나물': 3,
-        '수제비_요리놀이터': 3, '봄나물 샐러드': 3, '황태 보푸리': 3,
-        '가지강정_대용량': 3, '가지강정': 3, '낙지젓': 3, '영양과채사라다': 3,
-        '시래기 된장지짐': 3, '잡채 - 450g': 3, '해물잡채': 3,
-        '바른 간장참치 - 130g': 3, '골뱅이무침_반조리': 3, '참깨소스 버섯무침': 3,
-        '한우 계란소보로': 3, '꼬마김밥_요리놀이터': 3, '요리놀이터 꼬꼬마 김발': 3,
-        '오징어젓': 3, '황기 닭곰탕(냉동)': 3, '불고기 잡채': 3,
-        '우엉잡채 - 80g': 3, '만두속재료_요리놀이터': 3,
-    }
-    return cooking_times
+    # 반찬별 기본 조리시간은 common/cooking_times.json 에서 한 번만 읽어둔 레지스트리 사용
+    return dict(COOKING_TIMES)
 
 # 총 조리시간 계산
 def get_cooking_time(dish_name, quantity=1):
@@ -156,57 +45,16 @@ def get_cooking_time(dish_name, quantity=1):
     --------
     float : 총 조리시간 (분)
     """
-    cooking_times = get_dish_cooking_times()
-    
-    if dish_name in cooking_times:
-        base_time = cooking_times[dish_name]
-    else:
-        base_time = 3  # 기본값 : 조리시간을 못찾을 시 3분으로 지정
-        print(f"⚠️ '{dish_name}' 조리시간을 찾을 수 없어 기본값 {base_time}분 사용")
-    
-    # 수량 비례 시간 추가 (개당 0.01분)
-    unit_time = 0.01
-    total_time = base_time + (quantity * unit_time)
-    
-    return total_time
+    # 기본값 : 조리시간을 못찾을 시 3분, 수량 비례 시간은 개당 0.01분
+    return COOKING_TIMES.cooking_time(dish_name, quantity)
 
 
 ### 주문 & 상품: 각각 딕셔너리 생성 ######################################
 def process_orders_data(orders_df):
-    orders = {}    #{'주문번호': ~~}
-    products_info = {}  #{'상품명': {'code':상품코드, 'order_ids':[주문번호,..], 'quantity':하루 주문량}}
-    
-    # 주문별로 그룹핑
-    grouped = orders_df.groupby('주문번호')
-    
-    for order_id, group in grouped:
-        order_products = []
-        quantities = {}
-        product_codes = {}
-        
-        for _, row in group.iterrows():
-            product_code = row['상품코드']
-            product_name = row['상품명']
-            quantity = row['수량']
-            
-            order_products.append(product_name)
-            product_codes[product_name] = product_code
-            quantities[product_name] = quantity
-            
-            if product_name not in products_info:
-                products_info[product_name] = {'code': None,'order_ids': [], 'total_quantity': 0}
-            products_info[product_name]['code'] = product_code
-            products_info[product_name]['order_ids'].append(str(order_id))
-            products_info[product_name]['total_quantity'] += quantity
-        
-        orders[str(order_id)] = {
-            'products': order_products,
-            'quantities': quantities,
-            'order_date': group.iloc[0]['주문일자'],
-            'product_codes': product_codes
-        }
-    
-    return orders, products_info
+    #orders : {'주문번호': {'products': [...], 'quantities': {...}, 'order_date': ..., 'product_codes': {...}}}
+    #products_info : {'상품명': {'code':상품코드, 'order_ids':[주문번호,..], 'total_quantity':하루 주문량}}
+    # 주문번호 정렬 + 구간 분할로 한 번에 생성 (groupby + iterrows 대신)
+    return build_orders_and_products(orders_df)
 
 
 ### 상품 간 네트워크 >>> 상품 특성 파악 #####################################
@@ -225,20 +73,14 @@ def build_product_connections(orders, products_info):
                 key = f"{product1}|{product2}"
                 product_connections[key] += 1
     
-    # 각 상품의 최대 연결 횟수 및 총 연결 수 계산    
+    # 각 상품의 최대 연결 횟수 및 총 연결 수 계산 (인접 리스트 그래프로 간선을 한 번만 훑음)
     all_products = list(products_info.keys())
+    product_graph = ProductGraph.from_connections(product_connections, all_products)
+    max_by_product = product_graph.max_connections()
+    total_by_product = product_graph.total_connections()
     for product in all_products:
-        max_count = 0
-        total_count = 0
-        
-        for connection_key, count in product_connections.items():
-            product1, product2 = connection_key.split('|')
-            if product1 == product or product2 == product:
-                max_count = max(max_count, count)
-                total_count += count
-        
-        product_max_connections[product] = max_count
-        product_total_connections[product] = total_count
+        product_max_connections[product] = max_by_product[product]
+        product_total_connections[product] = total_by_product[product]
     
     return dict(product_connections), product_max_connections, dict(product_total_connections)
 
@@ -257,24 +99,38 @@ def classify_products_by_connection_strength(all_products, product_max_connectio
     return group_1, group_2, group_3_plus
 
 
-def preprocess_all_data(orders_df):
-    """모든 전처리 작업을 수행하는 통합 함수"""
+def preprocess_all_data(orders_df, cooccurrence_index=None, changeover_matrix=None):
+    """
+    모든 전처리 작업을 수행하는 통합 함수
+
+    cooccurrence_index : 주문을 미리 누적해둔 CooccurrenceIndex (common.cooccurrence)
+                         주면 상품 간 연결 관계를 주문 전체에서 다시 계산하지 않음
+    changeover_matrix  : 전환시간 DataFrame (주지 않으면 changeover_matrix.csv 를 읽음)
+    """
     
     # 1. 기본 데이터 처리
     orders, products_info = process_orders_data(orders_df)
     all_products = list(products_info.keys())
     
     # 2. 상품 간 연결 관계 구축
-    product_connections, product_max_connections, product_total_connections = build_product_connections(orders, products_info)
+    if cooccurrence_index is not None:
+        product_connections, product_max_connections, product_total_connections = cooccurrence_index.connection_stats(all_products)
+    else:
+        product_connections, product_max_connections, product_total_connections = build_product_connections(orders, products_info)
+    
+    # 3. 상품별 총 조리시간 계산 (전체 상품을 한 번에)
+    cooking_times = COOKING_TIMES.cooking_time_map(
+        {product_name: info['total_quantity'] for product_name, info in products_info.items()}
+    )
     
-    # 3. 상품별 총 조리시간 계산
-    cooking_times = {}
-    for product_name, info in products_info.items():
-        total_quantity = info['total_quantity']
-        cooking_times[product_name] = get_cooking_time(product_name, total_quantity)
+    # 상품 네트워크 (이웃 조회용 인접 리스트)
+    product_graph = ProductGraph.from_connections(product_connections, all_products)
     
-    # 4. 전환시간 매트릭스 읽어오기
-    changeover_matrix = pd.read_csv('changeover_matrix.csv', index_col=0)
+    # 4. 전환시간 매트릭스 읽어오기 (같은 CSV에서 만든 changeover_matrix.npy가 있으면 메모리 매핑, 없으면 CSV)
+    if changeover_matrix is None:
+        changeover_matrix = load_changeover_matrix('changeover_matrix.csv')
+    # 반찬명 -> 정수 id 테이블로 변환 (매트릭스에 없는 상품은 기본 전환시간 4분)
+    changeover_matrix = ChangeoverTable.from_frame(changeover_matrix, extra_names=all_products, default=4)
     
     # 5. 상품 분류
     group_1, group_2, group_3_plus = classify_products_by_connection_strength(all_products, product_max_connections)
@@ -284,6 +140,7 @@ def preprocess_all_data(orders_df):
         'orders': orders,
         'products_info': products_info,
         'product_connections': product_connections,
+        'product_graph': product_graph,
         'product_max_connections': product_max_connections,
         'product_total_connections': product_total_connections,
         'cooking_times': cooking_times,
@@ -300,6 +157,8 @@ DEFAULT_NUM_LINES = 8
 
 def get_changeover_time(product1, product2, changeover_matrix):
     """두 상품 간 전환시간 계산"""
+    if isinstance(changeover_matrix, ChangeoverTable):
+        return changeover_matrix.get(product1, product2, default=4)
     if (product1 in changeover_matrix.index and 
         product2 in changeover_matrix.columns):
         return changeover_matrix.loc[product1, product2]
@@ -325,7 +184,9 @@ def assign_low_connection_products(g_products, target_lines, product_total_conne
         line_assignments[current_line].append(product)
         
         # 다음 라인 인덱스 계산 (지그재그)
-        if line_index == (len(target_lines)-1):
+        if len(target_lines) == 1:  # 라인이 하나면 제자리
+            direction = 0
+        elif line_index == (len(target_lines)-1):
             direction = -1
         elif line_index == 0:
             direction = 1
@@ -342,22 +203,20 @@ def assign_high_connection_products(g_products, target_lines, product_connection
         return line_assignments
     
     remaining_products = g_products.copy()
+    remaining_set = set(remaining_products)
     
-    # 이웃 노드들(상품)
-    def get_product_neighbors(product, product_connections):
-        neighbors = []
-        for connection_key in product_connections.keys():
-            product1, product2 = connection_key.split('|')
-            if product1 == product:
-                neighbors.append(product2)
-            elif product2 == product:
-                neighbors.append(product1)
-        return neighbors
+    # 상품 네트워크 (연결 딕셔너리가 들어오면 한 번만 그래프로 변환)
+    product_graph = as_product_graph(product_connections)
+    
+    # 이웃 노드들(상품) : 인접 리스트에서 O(차수)로 조회
+    def get_product_neighbors(product, product_graph):
+        return product_graph.neighbors(product)
     
     # 상품 배치에 따른 업데이트
     def assign_product_to_line(product, line):
         line_assignments[line].append(product)
         remaining_products.remove(product)
+        remaining_set.discard(product)
     
     line_index = 0
     direction = 1
@@ -373,8 +232,8 @@ def assign_high_connection_products(g_products, target_lines, product_connection
         assign_product_to_line(current_product, current_line)
         
         # 다음 라인에 배치할 상품 찾기; 현재 상품의 이웃 중 가장 비율이 낮은 상품
-        neighbors = get_product_neighbors(current_product, product_connections)
-        neighbors_in_remaining = [p for p in neighbors if p in remaining_products]
+        neighbors = get_product_neighbors(current_product, product_graph)
+        neighbors_in_remaining = [p for p in neighbors if p in remaining_set]
         if neighbors_in_remaining:
             # 이웃 중 가장 비율이 낮은 상품
             current_product = min(neighbors_in_remaining, 
@@ -384,7 +243,9 @@ def assign_high_connection_products(g_products, target_lines, product_connection
             current_product = None
         
         # 다음 라인 인덱스 계산 (순환)
-        if line_index == (len(target_lines)-1):
+        if len(target_lines) == 1:  # 라인이 하나면 제자리
+            direction = 0
+        elif line_index == (len(target_lines)-1):
             direction = -1
         elif line_index == 0:
             direction = 1
@@ -392,11 +253,18 @@ def assign_high_connection_products(g_products, target_lines, product_connection
 
     return line_assignments
 
-def create_initial_solution(preprocessed_data, num_lines=DEFAULT_NUM_LINES):
-    """개선된 초기해 생성 (라인 수 파라미터 적용)"""
+def create_initial_solution(preprocessed_data, num_lines=DEFAULT_NUM_LINES, line_config=None):
+    """
+    개선된 초기해 생성 (라인 수 파라미터 적용)
+    
+    라인은 그룹 1 : 2 : 3+ 에 1/4 : 1/4 : 나머지 비율로 나눈다 (8개면 1~2, 3~4, 5~8)
+    line_config 가 있으면 허용되지 않은 카테고리 라인에 놓인 상품을 허용 라인으로 옮긴다
+    """
+    line_config = as_line_config(line_config, num_lines)
+    num_lines = line_config.num_lines
     
     # 전처리된 데이터 추출
-    product_connections = preprocessed_data['product_connections']
+    product_connections = preprocessed_data.get('product_graph', preprocessed_data['product_connections'])
     product_total_connections = preprocessed_data['product_total_connections']
     products_info = preprocessed_data['products_info']
     #cooking_times = preprocessed_data['cooking_times']
@@ -407,100 +275,99 @@ def create_initial_solution(preprocessed_data, num_lines=DEFAULT_NUM_LINES):
     group_3_plus = preprocessed_data['group_3_plus']
     
     # 모든 라인 초기화
-    solution = {f'line{i}': [] for i in range(1, num_lines + 1)}
+    line_ids = line_config.names()
+    solution = {line_id: [] for line_id in line_ids}
+    
+    # 그룹별 라인 (라인이 모자라 빈 그룹이 생기면 전체 라인 사용)
+    n_group_1 = max(1, round(num_lines / 4))
+    n_group_2 = max(1, round(num_lines / 4))
+    group1_lines = line_ids[:n_group_1]
+    group2_lines = line_ids[n_group_1:n_group_1 + n_group_2] or line_ids
+    group3_lines = line_ids[n_group_1 + n_group_2:] or line_ids
     
-    # 그룹 1을 라인 1, 2에 배치
-    #if sorted_group_1 and num_lines >= 2:
-    group1_assignment = assign_low_connection_products(group_1, ['line1','line2'], product_total_connections, products_info)
-    solution.update(group1_assignment)
+    # 그룹 1을 앞쪽 round(num_lines / 4)개 라인(최소 1개)에 배치 (8개면 라인 1, 2)
+    group1_assignment = assign_low_connection_products(group_1, group1_lines, product_total_connections, products_info)
     
-    # 그룹 2를 라인 3, 4에 배치
-    #if sorted_group_2 and num_lines >= 4:
-    group2_assignment = assign_low_connection_products(group_2, ['line3','line4'], product_total_connections, products_info)
-    solution.update(group2_assignment)
+    # 그룹 2를 그다음 round(num_lines / 4)개 라인에 배치 (8개면 라인 3, 4, 남은 라인이 없으면 전체 라인)
+    group2_assignment = assign_low_connection_products(group_2, group2_lines, product_total_connections, products_info)
     
-    # 그룹 3+를 라인 5 ~ 8에 배치
-    #if sorted_group_3_plus and num_lines >= 5:
+    # 그룹 3+를 나머지 라인에 배치 (8개면 라인 5 ~ 8, 남은 라인이 없으면 전체 라인)
     group3_assignment = assign_high_connection_products(
-        group_3_plus, ['line5','line6','line7','line8'], product_connections, 
+        group_3_plus, group3_lines, product_connections, 
         product_total_connections, products_info
     )
-    solution.update(group3_assignment)
+    
+    # 그룹별 배치를 합침 (같은 라인을 여러 그룹이 쓰면 이어 붙임)
+    for assignment in (group1_assignment, group2_assignment, group3_assignment):
+        for line_id, l_products in assignment.items():
+            solution[line_id].extend(l_products)
+    
+    # 카테고리 제한 : 허용되지 않은 라인의 상품은 허용 라인 중 상품이 가장 적은 라인 끝으로
+    for k, line_id in enumerate(line_ids):
+        for product in [p for p in solution[line_id] if not line_config.allows(k, p)]:
+            solution[line_id].remove(product)
+            target = min(line_config.allowed_lines(product), key=lambda i: len(solution[line_ids[i]]))
+            solution[line_ids[target]].append(product)
     
     #print(f"🔍 solution 내용: {solution}")
     return solution
 
 
 ### 시간 계산 ##################################################
-def calculate_line_schedule(l_products, cooking_times, changeover_matrix):
-    """라인의 상품별 시작시간과 완료시간 계산"""
+def calculate_line_schedule(l_products, cooking_times, changeover_matrix, line_config=None, line_index=0):
+    """라인의 상품별 시작시간과 완료시간 계산 (line_config 가 있으면 line_index 라인의 속도/가동 시작 반영)"""
     
     if not l_products:
         return {}
     
-    schedule = {}
-    current_time = 0
+    speed = 1.0 if line_config is None else line_config.speeds[line_index]
+    start = 0 if line_config is None else line_config.start(line_index)
     
-    for i, product in enumerate(l_products):
-        start_time = current_time
-        
-        # 전환시간 추가 (첫 번째 상품은 제외)
-        if i > 0:
-            prev_product = l_products[i-1]
-            changeover_time = get_changeover_time(prev_product, product, changeover_matrix)
-            start_time += changeover_time
-        
-        # 조리시간
-        cooking_time = cooking_times.get(product, 3)
-        completion_time = start_time + cooking_time
-        
+    # 시작/완료시간은 공용 시뮬레이터로 계산 (전환시간 기본 4분, 조리시간 기본 3분)
+    starts, ends = simulate_schedule({0: l_products}, cooking_times, changeover_matrix,
+                                     default_changeover=4, default_cooking_time=3,
+                                     speeds=[speed], offsets=[start])[0]
+    
+    schedule = {}
+    for product, start_time, completion_time in zip(l_products, starts.tolist(), ends.tolist()):
         schedule[product] = {
             'start_time': start_time,
             'completion_time': completion_time,
-            'cooking_time': cooking_time
+            'cooking_time': cooking_times.get(product, 3) / speed
         }
-        
-        current_time = completion_time
     
     return schedule
 
-def calculate_order_and_line_completion_times(orders, solution, cooking_times, changeover_matrix):
-    """각 주문의 완료시간과 각 라인의 최종 완료시간을 함께 계산"""
-    # 각 라인의 스케줄 계산
-    line_schedules = {}
+def calculate_order_and_line_completion_times(orders, solution, cooking_times, changeover_matrix, line_config=None,
+                                              incidence=None):
+    """
+    각 주문의 완료시간과 각 라인의 최종 완료시간을 함께 계산 (line_config : solution 라인 순서대로 속도/가동 시작)
+
+    incidence : orders 로 만든 OrderIncidence (같은 orders 로 반복 호출할 때 만들어 둔 것을 넘기면 재사용)
+    """
+    # 모든 라인의 스케줄을 한 번에 계산
+    speeds = None if line_config is None else line_config.speeds
+    offsets = None if line_config is None else line_config.starts
+    line_times = simulate_schedule(solution, cooking_times, changeover_matrix,
+                                   default_changeover=4, default_cooking_time=3,
+                                   speeds=speeds, offsets=offsets)
+    
+    # 라인 완료시간 = 해당 라인의 마지막 제품 완료시간 (빈 라인은 0)
     line_completion_times = {}
-    for line_id, l_products in solution.items():
-        line_schedules[line_id] = calculate_line_schedule(l_products, cooking_times, changeover_matrix)
-        
-        # 라인 완료시간 = 해당 라인의 마지막 제품 완료시간
-        last_product = l_products[-1]
-        line_completion_times[line_id] = line_schedules[line_id][last_product]['completion_time']
-        
+    for line_id, (_, ends) in line_times.items():
+        line_completion_times[line_id] = float(ends[-1]) if len(ends) else 0
         
-    # 각 주문의 완료시간 계산
-    order_completion_times = {}
+    # 상품별 완료시간 (라인 안에서는 마지막 위치, 여러 라인에 있으면 앞 라인 기준)
+    product_completion = {}
+    for line_id, (_, ends) in line_times.items():
+        line_completion = dict(zip(solution[line_id], ends.tolist()))
+        for product, completion_time in line_completion.items():
+            product_completion.setdefault(product, completion_time)
     
-    for order_id, order_data in orders.items():
-        order_products = order_data['products']
-        product_completion_times = []
-        
-        for product in order_products:
-            # 상품이 어느 라인에 배치되었는지 찾기
-            product_line = None
-            for line_id, products in solution.items():
-                if product in products:
-                    product_line = line_id
-                    break
-            
-            if product_line and product in line_schedules[product_line]:
-                completion_time = line_schedules[product_line][product]['completion_time']
-                product_completion_times.append(completion_time)
-        
-        # 주문 완료시간 = 해당 주문의 모든 상품 중 가장 늦게 완료되는 시간
-        if product_completion_times:
-            order_completion_times[order_id] = max(product_completion_times)
-        else:
-            order_completion_times[order_id] = 0
+    # 각 주문의 완료시간 = 해당 주문의 모든 상품 중 가장 늦게 완료되는 시간
+    if incidence is None:
+        incidence = OrderIncidence.from_baskets(orders)
+    order_completion_times = incidence.completion_map(product_completion)
     
     return order_completion_times, line_completion_times
 
@@ -542,11 +409,11 @@ def calculate_line_balance_variance(line_completion_times):
 
 
 def calculate_objective_function(orders, solution, cooking_times, changeover_matrix, 
-                               order_priorities=None):
-    """다중 목표 목적함수 계산"""
+                               order_priorities=None, line_config=None, incidence=None):
+    """다중 목표 목적함수 계산 (incidence : orders 로 만든 OrderIncidence, 없으면 새로 만듦)"""
     
     # 주문 완료시간들 계산
-    order_completion_times, line_completion_times = calculate_order_and_line_completion_times(orders, solution, cooking_times, changeover_matrix)
+    order_completion_times, line_completion_times = calculate_order_and_line_completion_times(orders, solution, cooking_times, changeover_matrix, line_config, incidence)
     completion_times_list = list(order_completion_times.values())
     
     if not completion_times_list:
@@ -595,101 +462,61 @@ def calculate_objective_function(orders, solution, cooking_times, changeover_mat
     
     return objective
 
-def local_optimization(preprocessed_data, solution, num_lines=DEFAULT_NUM_LINES):
-    """지역 최적화를 통한 해 개선 - 스마트 라인 밸런싱 중심"""
+def local_optimization(preprocessed_data, solution, num_lines=DEFAULT_NUM_LINES, line_config=None):
+    """
+    지역 최적화를 통한 해 개선 - 스마트 라인 밸런싱 중심
+    
+    line_config 가 있으면 solution 라인 순서대로 속도/가동 시작을 반영하고, 상품은 허용 카테고리 라인으로만 옮긴다
+    (가동 종료는 이동 대상 라인을 고를 때만 고려)
+    """
+    line_config = as_line_config(line_config, len(solution))
+    line_position = {line_id: k for k, line_id in enumerate(solution)}
     
     orders = preprocessed_data['orders']
     cooking_times = preprocessed_data['cooking_times']
     changeover_matrix = preprocessed_data['changeover_matrix']
     #order_priorities = preprocessed_data['order_priorities']
     
-    current_solution = copy.deepcopy(solution)
-    current_objective = calculate_objective_function(orders, current_solution, cooking_times, changeover_matrix)#, order_priorities)
+    # 상품 id 리스트 기반 가변 해 + 증분 평가기
+    # (후보 이동은 해에 적용 -> 평가 -> 되돌리기, 입력 solution 과 해 전체는 복사하지 않음)
+    evaluator = MoveEvaluator(orders, solution, cooking_times, changeover_matrix, line_config=line_config)
+    current_solution = evaluator.state
+    current_objective = evaluator.objective()
     
-    # 라인 내, 전환시간만 고려, 최대 5번 swap
-    def optimize_line_order_by_changeover(line_id, products, max_iterations=5):
+    # 라인 내, 전환시간만 고려 (common.line_sequencing : 짧은 라인은 Held-Karp 정확해,
+    # 긴 라인은 nearest-neighbor + 2-opt / or-opt / 3-opt, 결과는 현재 순서보다 나쁘지 않음)
+    def optimize_line_order_by_changeover(line_id, products):
         if len(products) <= 1:
             return products
-        current_order = products.copy()
-        best_order = current_order.copy()
-        
-        def calculate_total_changeover(order):
-            total_changeover_time = 0
-            for i in range(1, len(order)):
-                prev_product = order[i-1]
-                current_product = order[i]
-                total_changeover_time += get_changeover_time(prev_product, current_product, changeover_matrix)
-            return total_changeover_time
-        best_changeover_time = calculate_total_changeover(best_order)
-        
-        for iteration in range(max_iterations):
-            improved = False
-            for i in range(len(current_order)):
-                for j in range(i + 2, len(current_order)):
-                    # i와 j 위치의 상품들을 교환
-                    new_order = current_order.copy()
-                    new_order[i], new_order[j] = new_order[j], new_order[i]
-                    
-                    new_changeover_time = calculate_total_changeover(new_order)
-                    
-                    if new_changeover_time < best_changeover_time:
-                        best_order = new_order
-                        best_changeover_time = new_changeover_time
-                        improved = True
-            
-            current_order = best_order.copy()
-            if not improved:
-                break
-        
-        return best_order
+        return sequence_products(changeover_matrix, products, default=4)
     
-    # *** 상품 이동 함수 ***
+    # *** 상품 이동 평가 함수 ***
     def try_product_move(source_line, target_line, product_idx, target_position=None):
-        """상품을 다른 라인의 지정된 위치로 이동"""
-        temp_solution = copy.deepcopy(current_solution)
-        
-        source_products = temp_solution[source_line]
-        if product_idx >= len(source_products):
-            return None, float('inf')
-        
-        # 상품 제거
-        product = source_products.pop(product_idx)
-        
-        # 상품 삽입 (위치 지정되지 않으면 끝에 추가)
-        if target_position is None:
-            temp_solution[target_line].append(product)
-        else:
-            target_position = min(target_position, len(temp_solution[target_line]))
-            temp_solution[target_line].insert(target_position, product)
-        
-        # 목적함수 계산
-        temp_objective = calculate_objective_function(orders, temp_solution, cooking_times, changeover_matrix) #order_priorities
-        
-        return temp_solution, temp_objective
+        """상품을 다른 라인의 지정된 위치로 옮겼을 때의 목적함수 (해는 바꾸지 않음)"""
+        # 두 라인의 바뀐 위치 이후 구간과 그 상품이 든 주문만 다시 계산 (solution 복사 없음)
+        return evaluator.evaluate_move(source_line, product_idx, target_line, target_position)
     
     # *** 영향받은 라인들의 순서 재최적화 (전환시간 기준) ***
     def reoptimize_affected_lines(affected_lines):
         """상품 이동 후 영향받은 라인들의 순서를 전환시간 기준으로 재최적화"""
         for line_id in affected_lines:
-            if line_id in current_solution and len(current_solution[line_id]) > 1:
+            if line_id in current_solution and len(current_solution.line(line_id)) > 1:
                 # 해당 라인의 순서 최적화 (전환시간 기준)
-                optimized_order = optimize_line_order_by_changeover(line_id, current_solution[line_id])
+                products = current_solution.line_products(line_id)
+                optimized_order = optimize_line_order_by_changeover(line_id, products)
                 
                 # 순서가 실제로 바뀌었는지 확인
-                if optimized_order != current_solution[line_id]:
-                    current_solution[line_id] = optimized_order
+                if optimized_order != products:
+                    evaluator.set_line(line_id, optimized_order)
                     print(f"🔄 {line_id} 라인 순서 재최적화 완료 (전환시간 기준)")
     
     # *** 라인별 완료시간 계산 ***
-    def get_line_completion_times(solution):
-        """각 라인의 완료시간 계산"""
-        _, line_completion_times = calculate_order_and_line_completion_times(
-            orders, solution, cooking_times, changeover_matrix
-        )
-        return line_completion_times
+    def get_line_completion_times():
+        """각 라인의 완료시간 (평가기에 누적된 값)"""
+        return evaluator.line_completion_times()
     
     # *** 가장 부담되는 상품 선택 ***
-    def select_most_burden_product(line_products):
+    def select_most_burden_product(line_products, speed=1.0):
         """라인에서 전환시간+조리시간+전환시간이 가장 긴 상품의 인덱스 반환"""
         if not line_products:
             return None
@@ -697,7 +524,7 @@ def local_optimization(preprocessed_data, solution, num_lines=DEFAULT_NUM_LINES)
         burden_scores = {}
         
         for i, product in enumerate(line_products):
-            burden = cooking_times.get(product, 3)  # 조리시간
+            burden = cooking_times.get(product, 3) / speed  # 조리시간 (라인 속도 반영)
             
             # 이전 전환시간
             if i > 0:
@@ -715,64 +542,72 @@ def local_optimization(preprocessed_data, solution, num_lines=DEFAULT_NUM_LINES)
     # *** 스마트 라인 밸런싱 ***
     def balance_lines_smartly():
         """가장 긴 라인에서 가장 부담되는 상품을 가장 짧은 라인으로 이동"""
-        line_completion_times = get_line_completion_times(current_solution)
+        line_completion_times = get_line_completion_times()
         
         # 실제 사용된 라인들만 고려
         active_lines = {line_id: time for line_id, time in line_completion_times.items() 
-                       if time > 0 and current_solution[line_id]}
+                       if time > 0 and current_solution.line(line_id)}
         
         if len(active_lines) < 2:
-            return None, float('inf'), None, None
+            return None, float('inf')
         
-        # 가장 긴 라인과 가장 짧은 라인 찾기
+        # 가장 긴 라인에서 가장 부담되는 상품 선택
         longest_line = max(active_lines.keys(), key=lambda x: active_lines[x])
-        shortest_line = min(active_lines.keys(), key=lambda x: active_lines[x])
+        long_products = current_solution.line_products(longest_line)
+        burden_product_idx = select_most_burden_product(long_products, line_config.speeds[line_position[longest_line]])
         
-        if longest_line == shortest_line:
-            return None, float('inf'), None, None
+        if burden_product_idx is None:
+            return None, float('inf')
         
-        # 가장 긴 라인에서 가장 부담되는 상품 선택
-        long_products = current_solution[longest_line]
-        burden_product_idx = select_most_burden_product(long_products)
+        # 그 상품을 만들 수 있는 라인 중 가장 짧은 라인 (가동 시간대가 남은 라인 우선)
+        burden_product = long_products[burden_product_idx]
+        allowed_lines = {line_id: time for line_id, time in active_lines.items()
+                         if line_config.allows(line_position[line_id], burden_product)}
+        open_lines = {line_id: time for line_id, time in allowed_lines.items()
+                      if line_config.is_open(line_position[line_id], time)}
+        candidate_lines = open_lines or allowed_lines
+        if not candidate_lines:
+            return None, float('inf')
+        shortest_line = min(candidate_lines.keys(), key=lambda x: candidate_lines[x])
         
-        if burden_product_idx is None:
-            return None, float('inf'), None, None
+        if longest_line == shortest_line:
+            return None, float('inf')
         
         # 가장 짧은 라인의 (처음/중간/끝)에 삽입 시도
-        short_products = current_solution[shortest_line]
+        short_products = current_solution.line(shortest_line)
         insert_positions = [0, len(short_products)//2, len(short_products)]
         if len(short_products) > 3:
             insert_positions.extend([1, len(short_products)-1])
         
-        best_solution = None
+        best_move = None
         best_objective = float('inf')
         
         for insert_pos in insert_positions:
-            temp_solution, temp_objective = try_product_move(
+            temp_objective = try_product_move(
                 longest_line, shortest_line, burden_product_idx, insert_pos
             )
             
-            if temp_solution and temp_objective < best_objective:
-                best_solution = temp_solution
+            if temp_objective < best_objective:
+                best_move = (longest_line, burden_product_idx, shortest_line, insert_pos)
                 best_objective = temp_objective
         
-        return best_solution, best_objective, longest_line, shortest_line
+        return best_move, best_objective
     
     print(f"🚀 지역 최적화 시작 (초기 목적함수: {current_objective:.2f})")
     
     # 1. 초기 라인 내 순서 최적화 (전환시간 기준)
     print("📋 1단계: 초기 라인 내 순서 최적화 (전환시간 기준)")
-    for line_id, products in current_solution.items():
+    for line_id in current_solution.line_ids():
+        products = current_solution.line_products(line_id)
         if len(products) > 1:
-            original_order = products.copy()
             optimized_order = optimize_line_order_by_changeover(line_id, products)
             
-            if optimized_order != original_order:
-                current_solution[line_id] = optimized_order
+            if optimized_order != products:
+                evaluator.set_line(line_id, optimized_order)
                 print(f"    ✅ {line_id} 라인 순서 최적화 완료")
     
     # 목적함수 재계산
-    current_objective = calculate_objective_function(orders, current_solution, cooking_times, changeover_matrix)#, order_priorities)
+    current_objective = evaluator.objective()
     print(f"📊 1단계 완료 후 목적함수: {current_objective:.2f}")
     
     # 2. 스마트 라인 밸런싱과 라인 내 재최적화 반복
@@ -785,44 +620,35 @@ def local_optimization(preprocessed_data, solution, num_lines=DEFAULT_NUM_LINES)
         iteration += 1
         
         # 스마트 라인 밸런싱 시도
-        temp_solution, temp_objective, source_line, target_line = balance_lines_smartly()
+        best_move, temp_objective = balance_lines_smartly()
         
-        if temp_solution and temp_objective < current_objective:
-            # 이동된 상품 정보 찾기
-            moved_product = None
-            if source_line and target_line:
-                original_products = set(current_solution[source_line])
-                new_products = set(temp_solution[source_line])
-                moved_products = original_products - new_products
-                if moved_products:
-                    moved_product = list(moved_products)[0]
+        if best_move and temp_objective < current_objective:
+            source_line, product_idx, target_line, insert_pos = best_move
+            moved_product = current_solution.products[current_solution.line(source_line)[product_idx]]
             
-            # 솔루션 업데이트
-            current_solution = temp_solution
+            # 솔루션 업데이트 (두 라인만 갱신)
             old_objective = current_objective
-            current_objective = temp_objective
+            current_objective = evaluator.apply_move(source_line, product_idx, target_line, insert_pos)
             
             print(f"  🔄 반복 {iteration}: 라인 밸런싱 개선 {old_objective:.2f} → {current_objective:.2f}")
-            if moved_product and source_line and target_line:
-                print(f"    📦 '{moved_product}' {source_line} → {target_line}")
+            print(f"    📦 '{moved_product}' {source_line} → {target_line}")
             
             # 영향받은 라인들의 순서 재최적화 (전환시간 기준)
-            if source_line and target_line:
-                affected_lines = [source_line, target_line]
-                reoptimize_affected_lines(affected_lines)
-                
-                # 재최적화 후 목적함수 재계산
-                current_objective = calculate_objective_function(orders, current_solution, cooking_times, changeover_matrix)#, order_priorities)
-                print(f"    📊 재최적화 후 목적함수: {current_objective:.2f}")
+            affected_lines = [source_line, target_line]
+            reoptimize_affected_lines(affected_lines)
+            
+            # 재최적화 후 목적함수
+            current_objective = evaluator.objective()
+            print(f"    📊 재최적화 후 목적함수: {current_objective:.2f}")
         else:
             # 개선이 없으면 종료
             print(f"  ⭐ 반복 {iteration}에서 개선 없음 - 최적화 완료")
             break
     
     print(f"\n🎯 지역 최적화 완료: 최종 목적함수 {current_objective:.2f}")
-    return current_solution
+    return current_solution.to_dict()
 
-def analyze_solution(preprocessed_data, solution, num_lines=DEFAULT_NUM_LINES):
+def analyze_solution(preprocessed_data, solution, num_lines=DEFAULT_NUM_LINES, line_config=None):
     """최적화 결과 종합 분석"""
     
     orders = preprocessed_data['orders']
@@ -835,13 +661,14 @@ def analyze_solution(preprocessed_data, solution, num_lines=DEFAULT_NUM_LINES):
     
     # 라인별 분석
     line_schedules = {}
-    for line_id, products in solution.items():
+    for k, (line_id, products) in enumerate(solution.items()):
         if products:
-            line_schedule = calculate_line_schedule(products, cooking_times, changeover_matrix)
+            line_schedule = calculate_line_schedule(products, cooking_times, changeover_matrix, line_config, k)
             line_schedules[line_id] = line_schedule
     
-    # 주문 완료시간 분석
-    order_completion_times, _ = calculate_order_and_line_completion_times(orders, solution, cooking_times, changeover_matrix)
+    # 주문 완료시간 분석 (주문 -> 상품 incidence 는 목적함수 계산과 공유)
+    incidence = OrderIncidence.from_baskets(orders)
+    order_completion_times, _ = calculate_order_and_line_completion_times(orders, solution, cooking_times, changeover_matrix, line_config, incidence)
     completion_times_list = list(order_completion_times.values())
     
     interval_variance = 0
@@ -849,7 +676,7 @@ def analyze_solution(preprocessed_data, solution, num_lines=DEFAULT_NUM_LINES):
         interval_variance = calculate_completion_interval_variance(completion_times_list)
     
     # 목적함수 값
-    objective_value = calculate_objective_function(orders, solution, cooking_times, changeover_matrix)#, order_priorities)
+    objective_value = calculate_objective_function(orders, solution, cooking_times, changeover_matrix, line_config=line_config, incidence=incidence)#, order_priorities)
     
     
     return {
@@ -861,7 +688,7 @@ def analyze_solution(preprocessed_data, solution, num_lines=DEFAULT_NUM_LINES):
         'total_orders': total_orders
     }
 
-def optimize_production_schedule(preprocessed_data, num_lines=DEFAULT_NUM_LINES):
+def optimize_production_schedule(preprocessed_data, num_lines=DEFAULT_NUM_LINES, line_config=None):
     """
     통합 생산 스케줄링 최적화 실행
     
@@ -873,27 +700,35 @@ def optimize_production_schedule(preprocessed_data, num_lines=DEFAULT_NUM_LINES)
         제한 시간 (시간 단위)
     num_lines : int
         사용할 라인 수
+    line_config : LineConfig
+        라인별 속도/가동 시간대/허용 카테고리 (common/line_config.py, 주면 num_lines 대신 사용)
     
     Returns:
     --------
     dict : 최적화 결과
     """
     
+    # 라인 구성 (없으면 num_lines 개의 동일 라인) : 만들 수 있는 라인이 없는 상품이 있으면 ValueError
+    if line_config is not None:
+        line_config.check_dishes(preprocessed_data['products_info'])
+        num_lines = line_config.num_lines
+    
     # 1. 초기해 생성
-    initial_solution = create_initial_solution(preprocessed_data, num_lines)
+    initial_solution = create_initial_solution(preprocessed_data, num_lines, line_config)
     
     initial_objective = calculate_objective_function(
         preprocessed_data['orders'], 
         initial_solution, 
         preprocessed_data['cooking_times'], 
-        preprocessed_data['changeover_matrix'] 
+        preprocessed_data['changeover_matrix'],
+        line_config=line_config
     )
     
     # 2. 지역 최적화
-    optimized_solution = local_optimization(preprocessed_data, initial_solution, num_lines)
+    optimized_solution = local_optimization(preprocessed_data, initial_solution, num_lines, line_config)
     
     # 3. 결과 분석
-    analysis_result = analyze_solution(preprocessed_data, optimized_solution, num_lines)
+    analysis_result = analyze_solution(preprocessed_data, optimized_solution, num_lines, line_config)
     
     # 개선율 계산
     improvement = ((initial_objective - analysis_result['objective_value']) / initial_objective * 100)
@@ -909,28 +744,28 @@ def optimize_production_schedule(preprocessed_data, num_lines=DEFAULT_NUM_LINES)
     }
 
 
-def get_final_completion_time(solution, preprocessed_data):
+def get_final_completion_time(solution, preprocessed_data, line_config=None):
     """전체 주문 완료시점 계산"""
     orders = preprocessed_data['orders']
     cooking_times = preprocessed_data['cooking_times']
     changeover_matrix = preprocessed_data['changeover_matrix']
     
-    order_completion_times, _ = calculate_order_and_line_completion_times(orders, solution, cooking_times, changeover_matrix)
+    order_completion_times, _ = calculate_order_and_line_completion_times(orders, solution, cooking_times, changeover_matrix, line_config)
     return max(order_completion_times.values()) if order_completion_times else 0
 
 
-def export_solution_to_excel_by_lines(solution, preprocessed_data, filename="production_schedule_by_lines.xlsx"):
+def export_solution_to_excel_by_lines(solution, preprocessed_data, filename="production_schedule_by_lines.xlsx", line_config=None):
     """라인별로 별도 시트에 생산 스케줄 저장"""
     products_info = preprocessed_data['products_info']
     cooking_times = preprocessed_data['cooking_times']
     changeover_matrix = preprocessed_data['changeover_matrix']
     
     with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-        for line_id, products in solution.items():
+        for k, (line_id, products) in enumerate(solution.items()):
             if not products:
                 continue
                 
-            line_schedule = calculate_line_schedule(products, cooking_times, changeover_matrix)
+            line_schedule = calculate_line_schedule(products, cooking_times, changeover_matrix, line_config, k)
             
             # 라인별 스케줄 데이터 생성
             line_data = []
@@ -957,16 +792,16 @@ def export_solution_to_excel_by_lines(solution, preprocessed_data, filename="pro
             
         print(f"📁 라인별 스케줄이 {filename}에 저장되었습니다.")
         
-def print_final_results(solution, preprocessed_data):
+def print_final_results(solution, preprocessed_data, line_config=None):
     """최종 결과 출력 및 시각화"""
     
     # 1. 전체 주문 완료시점 
-    final_time = get_final_completion_time(solution, preprocessed_data)
+    final_time = get_final_completion_time(solution, preprocessed_data, line_config)
     print(f"\n🎯 전체 주문 완료시점: {final_time:.1f}분 ({final_time/60:.1f}시간)")
     
     # 2. 솔루션 분석 결과 출력 추가
     print("\n📊 솔루션 분석 결과:")
-    analysis = analyze_solution(preprocessed_data, solution)
+    analysis = analyze_solution(preprocessed_data, solution, line_config=line_config)
     
     print(f"   • 목적함수값: {analysis['objective_value']:.2f}")
     print(f"   • 총 상품 수: {analysis['total_products']}개")
@@ -996,7 +831,7 @@ def print_final_results(solution, preprocessed_data):
     
     # 3. 라인별 엑셀 파일 생성
     print("\n📄 라인별 스케줄 엑셀 파일 생성 중...")
-    export_solution_to_excel_by_lines(solution, preprocessed_data)
+    export_solution_to_excel_by_lines(solution, preprocessed_data, line_config=line_config)
     
     return {
         'final_completion_time': final_time,
@@ -1005,8 +840,8 @@ def print_final_results(solution, preprocessed_data):
 
 # ==================== 사용 예시 ====================
 if __name__ == "__main__":
-    # 1. 데이터 로드
-    orders_df = pd.read_excel('zipbanchan_220401.xlsx')
+    # 1. 데이터 로드 (두 번째 실행부터는 Parquet 캐시)
+    orders_df = load_orders('zipbanchan_220401.xlsx')
     
     # 2. 전처리
     preprocessed_data = preprocess_all_data(orders_df)
@@ -1047,8 +882,9 @@ def load_data(file_a_path, output_path):
 
     print(f"통합 데이터가 '{output_path}' 파일로 저장되었습니다.")
 
-# 사용 예시
-load_data(
-    file_a_path="production_schedule_by_lines.xlsx",  # 생산스케줄.xlsx 경로, 
-    output_path="production_schedule_combined.xlsx"
-)
\ No newline at end of file
+# 사용 예시 (import 할 때는 실행되지 않도록)
+if __name__ == "__main__":
+    load_data(
+        file_a_path="production_schedule_by_lines.xlsx",  # 생산스케줄.xlsx 경로, 
+        output_path="production_schedule_combined.xlsx"
+    )
\ No newline at end of file
@@ -1,29 +1,45 @@
-import pandas as pd
+import os
+import sys
 import math
+import heapq
+import numpy as np
 from collections import defaultdict
 
-# 데이터 로딩
-def load_data(order_file, cooking_times_file, changeover_matrix_file):
-    orders = pd.read_excel(order_file)
-    cooking_times = pd.read_csv(cooking_times_file)
-    changeover_matrix = pd.read_csv(changeover_matrix_file, index_col=0)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.changeover_store import load_changeover_matrix
+from common.changeover_table import ChangeoverTable
+from common.cooking_times import CookingTimeRegistry
+from common.line_config import as_line_config
+from common.line_sequencing import sequence_products
+from common.order_completion import OrderIncidence
+from common.order_ingest import build_order_requirements
+from common.order_loader import load_orders
+from common.schedule_sim import simulate_schedule
+
+# 데이터 로딩 (cooccurrence_index : 주문 빈도를 누적해둔 CooccurrenceIndex, 없으면 주문 파일에서 계산)
+def load_data(order_file, cooking_times_file, changeover_matrix_file, cooccurrence_index=None):
+    orders = load_orders(order_file)  # .xlsx 는 Parquet 캐시 사용 (.csv / .parquet 도 가능)
+    changeover_matrix = load_changeover_matrix(changeover_matrix_file)  # 같은 CSV에서 만든 .npy 바이너리가 있으면 우선 (없으면 CSV)
     
     # 상품별 총 수량 계산
     product_quantities = orders.groupby('상품명')['수량'].sum().to_dict()
     
-    # 조리시간 매핑
-    cooking_time_map = dict(zip(cooking_times['상품명'], cooking_times['조리시간(분)']))
+    # 전환시간 테이블 (반찬명 -> 정수 id, 매트릭스에 없는 상품은 전환시간 0)
+    changeover_matrix = ChangeoverTable.from_frame(changeover_matrix, extra_names=product_quantities, default=0)
+    
+    # 조리시간 매핑 (읽기 전용 레지스트리, 없는 상품은 3분)
+    cooking_time_map = CookingTimeRegistry.from_csv(cooking_times_file)
     
     # 주문별 필요 상품
-    order_requirements = defaultdict(list)
-    for _, row in orders.iterrows():
-        order_requirements[row['주문번호']].append(row['상품명'])
+    order_requirements = build_order_requirements(orders)
     
     # 상품별 주문 빈도 계산 (몇 개의 주문에 포함되는지)
-    product_order_frequency = defaultdict(int)
-    for order_products in order_requirements.values():
-        for product in set(order_products):  # 같은 주문에서 중복 제거
-            product_order_frequency[product] += 1
+    if cooccurrence_index is not None:
+        product_order_frequency = defaultdict(int, cooccurrence_index.order_frequency)
+    else:
+        # 같은 주문에서 중복 제거 후 상품별 주문 수
+        unique_pairs = orders.drop_duplicates(['주문번호', '상품명'])
+        product_order_frequency = defaultdict(int, unique_pairs['상품명'].value_counts().to_dict())
     
     return product_quantities, cooking_time_map, changeover_matrix, order_requirements, product_order_frequency
 
@@ -36,53 +52,90 @@ def get_cooking_time(product, quantity, cooking_time_map):
 def get_changeover_time(from_product, to_product, changeover_matrix):
     if from_product == to_product:
         return 0
+    if isinstance(changeover_matrix, ChangeoverTable):
+        return changeover_matrix.get(from_product, to_product, default=0)
     try:
         return changeover_matrix.loc[from_product, to_product]
     except:
         return 0
 
 # 병렬 생산 최적화
-def optimize_parallel_production(product_quantities, cooking_time_map, changeover_matrix, order_requirements, product_order_frequency):
+# resequence=True 면 배정이 끝난 뒤 라인별 순서를 총 전환시간 기준으로 재배열 (resequence_lines)
+# num_lines : 생산 라인 수 (기본 8개)
+# line_config : 라인별 속도/가동 시간대/허용 카테고리 (common/line_config.py, 주면 num_lines 대신 사용)
+def optimize_parallel_production(product_quantities, cooking_time_map, changeover_matrix, order_requirements, product_order_frequency,
+                                 resequence=False, num_lines=8, line_config=None):
+    line_config = as_line_config(line_config, num_lines)
+    line_config.check_dishes(product_quantities)
+    num_lines = line_config.num_lines
+    
     # 1. 주문 빈도 기준으로 상품 우선순위 설정
     products_by_frequency = sorted(product_quantities.keys(), 
                                  key=lambda x: product_order_frequency[x], 
                                  reverse=True)
     
-    # 8개 라인 초기화
-    lines = [[] for _ in range(8)]
-    line_times = [0] * 8
+    # 상품별 조리시간 미리 계산 (레지스트리면 전체 상품을 한 번의 배열 연산으로)
+    if isinstance(cooking_time_map, CookingTimeRegistry):
+        product_cooking_times = cooking_time_map.cooking_time_map(product_quantities, warn=False)
+    else:
+        product_cooking_times = {product: get_cooking_time(product, quantity, cooking_time_map)
+                                 for product, quantity in product_quantities.items()}
+    
+    # 라인 초기화 (라인별 가동 시작 시각부터)
+    lines = [[] for _ in range(num_lines)]
+    line_times = [line_config.start(i) for i in range(num_lines)]
     product_end_times = {}
     
-    # 각 상품이 어느 주문에 포함되는지 역매핑
+    # 각 상품이 어느 주문(주문 위치 번호)에 포함되는지 역매핑
     product_to_orders = defaultdict(list)
-    for order_num, products in order_requirements.items():
+    for order_idx, products in enumerate(order_requirements.values()):
         for product in products:
-            product_to_orders[product].append(order_num)
+            product_to_orders[product].append(order_idx)
+    product_to_orders = {product: np.array(order_idxs, dtype=np.intp)
+                         for product, order_idxs in product_to_orders.items()}
+    empty_orders = np.zeros(0, dtype=np.intp)
     
-    # 각 주문의 상품들이 어느 라인에 배치되었는지 추적
-    order_assigned_lines = defaultdict(set)
+    # 각 주문의 상품들이 배치된 라인 : 주문별 비트마스크 (라인 i -> 비트 i)
+    # 64개 라인까지는 uint64 배열, 그보다 많으면 파이썬 정수 배열
+    mask_dtype = np.uint64 if num_lines <= 64 else object
+    order_assigned_lines = np.zeros(len(order_requirements), dtype=mask_dtype)
+    line_bits = np.array([1 << i for i in range(num_lines)], dtype=mask_dtype)
+    all_lines = (1 << num_lines) - 1
+    # 가동 종료 시각을 넘긴 라인들의 비트마스크
+    closed_lines = 0
+    
+    # 라인 선택용 우선순위 큐 (라인 완료시간, 라인 번호) : 시간이 같으면 번호가 작은 라인 먼저
+    line_heap = [(line_times[i], i) for i in range(num_lines)]
+    heapq.heapify(line_heap)
     
     for product in products_by_frequency:
         quantity = product_quantities[product]
-        cooking_time = get_cooking_time(product, quantity, cooking_time_map)
+        
+        # 이 상품을 만들 수 없는 라인들 (카테고리 제한)
+        blocked_lines = line_config.blocked_mask(product)
         
         # 이 상품을 포함한 주문들
-        related_orders = product_to_orders[product]
+        related_orders = product_to_orders.get(product, empty_orders)
+        
+        # 같은 주문의 다른 상품들이 이미 배치된 라인들 (주문별 마스크를 한 번에 OR)
+        used_lines = int(np.bitwise_or.reduce(order_assigned_lines[related_orders])) if len(related_orders) else 0
         
-        # 같은 주문의 다른 상품들이 이미 배치된 라인들 찾기
-        used_lines = set()
-        for order_num in related_orders:
-            used_lines.update(order_assigned_lines[order_num])
+        # 피할 라인 : 사용 중 + 만들 수 없음 + 가동 종료 -> 모두 막히면 사용 중인 라인 허용
+        # -> 그래도 없으면 가동 종료된 라인 중에서 (만들 수 없는 라인은 끝까지 제외)
+        for avoid_lines in (used_lines | blocked_lines | closed_lines, blocked_lines | closed_lines, blocked_lines):
+            if avoid_lines & all_lines != all_lines:
+                break
         
-        # 사용되지 않은 라인 중에서 가장 빠른 라인 선택
-        available_lines = [i for i in range(8) if i not in used_lines]
+        # 피할 라인이 아닌 라인 중 가장 빠른 라인 : 큐에서 피할 라인은 건너뛰고 다시 넣음
+        skipped = []
+        while avoid_lines >> line_heap[0][1] & 1:
+            skipped.append(heapq.heappop(line_heap))
+        _, line_idx = heapq.heappop(line_heap)
+        for entry in skipped:
+            heapq.heappush(line_heap, entry)
         
-        if available_lines:
-            # 사용 가능한 라인 중 가장 빠른 라인
-            line_idx = min(available_lines, key=lambda x: line_times[x])
-        else:
-            # 모든 라인이 사용 중이면 가장 빠른 라인 선택
-            line_idx = line_times.index(min(line_times))
+        # 라인 속도를 반영한 조리시간
+        cooking_time = line_config.cooking_time(line_idx, product_cooking_times[product])
         
         # 전환시간 계산
         changeover_time = 0
@@ -97,28 +150,59 @@ def optimize_parallel_production(product_quantities, cooking_time_map, changeove
         # 라인에 추가
         lines[line_idx].append((product, quantity, cooking_time, changeover_time, start_time, end_time))
         line_times[line_idx] = end_time
+        heapq.heappush(line_heap, (end_time, line_idx))
         product_end_times[product] = end_time
+        if not line_config.is_open(line_idx, end_time):
+            closed_lines |= 1 << line_idx
         
         # 이 상품의 관련 주문들에 라인 정보 업데이트
-        for order_num in related_orders:
-            order_assigned_lines[order_num].add(line_idx)
+        order_assigned_lines[related_orders] |= line_bits[line_idx]
     
+    if resequence:
+        return resequence_lines(lines, changeover_matrix, line_config)
     return lines, product_end_times, max(line_times)
 
+# 라인별 상품 순서를 총 전환시간이 작아지도록 재배열하고 시작/종료시간 다시 계산
+# (조리시간은 배정 때 라인 속도를 반영한 값 그대로, line_config 가 있으면 라인별 가동 시작부터)
+def resequence_lines(lines, changeover_matrix, line_config=None):
+    items = {item[0]: item for line in lines for item in line}
+    orders = {i: sequence_products(changeover_matrix, [item[0] for item in line], default=0)
+              for i, line in enumerate(lines)}
+    
+    # 재배열한 순서의 시작/종료시간은 공용 시뮬레이터로 모든 라인을 한 번에 계산
+    cooking_times = {product: item[2] for product, item in items.items()}
+    offsets = None if line_config is None else line_config.starts
+    schedule = simulate_schedule(orders, cooking_times, changeover_matrix, default_changeover=0, offsets=offsets)
+    
+    new_lines = []
+    line_times = []
+    product_end_times = {}
+    
+    for i, order in orders.items():
+        starts, ends = schedule[i]
+        new_line = []
+        for k, (product, start_time, end_time) in enumerate(zip(order, starts.tolist(), ends.tolist())):
+            _, quantity, cooking_time, _, _, _ = items[product]
+            changeover_time = get_changeover_time(order[k - 1], product, changeover_matrix) if k > 0 else 0
+            new_line.append((product, quantity, cooking_time, changeover_time, start_time, end_time))
+            product_end_times[product] = end_time
+        
+        new_lines.append(new_line)
+        line_times.append(ends[-1] if len(ends) else 0)
+    
+    return new_lines, product_end_times, max(line_times)
+
 # 주문 완료시간 계산
 def calculate_order_completion(order_requirements, product_end_times):
-    order_completion_times = {}
-    for order_num, products in order_requirements.items():
-        completion_times = [product_end_times.get(product, 0) for product in products]
-        order_completion_times[order_num] = max(completion_times)
-    return order_completion_times
+    # 주문별 상품 중 가장 늦게 끝나는 시간 (주문 -> 상품 incidence 에서 구간별 max)
+    return OrderIncidence.from_baskets(order_requirements).completion_map(product_end_times)
 
 # 결과 출력
 def print_results(lines, order_completion_times, total_time):
-    print("=== 8개 생산라인 최적화 결과 ===\n")
+    print(f"=== {len(lines)}개 생산라인 최적화 결과 ===\n")
     
     # 라인별 생산순서
-    print("📋 8개 라인별 생산순서:")
+    print(f"📋 {len(lines)}개 라인별 생산순서:")
     for i, line in enumerate(lines):
         print(f"\n🏭 라인 {i+1} (총 {len(line)}개 작업)")
         for j, (product, quantity, cook_time, change_time, _, _) in enumerate(line[:5]):
@@ -147,7 +231,7 @@ def print_results(lines, order_completion_times, total_time):
         print(f"⏰ {time_point}분 시점: 주문 {completed_this_interval}개 완료 (누적: {cumulative_orders}개)")
 
 # 메인 실행 함수
-def run_parallel_optimization(order_file, cooking_times_file, changeover_matrix_file):
+def run_parallel_optimization(order_file, cooking_times_file, changeover_matrix_file, num_lines=8, line_config=None):
     # 데이터 로딩
     product_quantities, cooking_time_map, changeover_matrix, order_requirements, product_order_frequency = load_data(
         order_file, cooking_times_file, changeover_matrix_file
@@ -155,7 +239,8 @@ def run_parallel_optimization(order_file, cooking_times_file, changeover_matrix_
     
     # 병렬 생산 최적화 실행
     lines, product_end_times, total_time = optimize_parallel_production(
-        product_quantities, cooking_time_map, changeover_matrix, order_requirements, product_order_frequency
+        product_quantities, cooking_time_map, changeover_matrix, order_requirements, product_order_frequency,
+        num_lines=num_lines, line_config=line_config
     )
     
     # 주문 완료시간 계산